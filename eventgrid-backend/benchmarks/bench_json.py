@@ -0,0 +1,88 @@
+"""Response serialization: Flask's default provider vs FastJSONProvider.
+
+Times turning a page of already-fetched vendors and bookings into a JSON
+response body, comparing the original path (hand-built to_dict() with
+isoformat() plus Flask's DefaultJSONProvider) with the generated row
+serializers plus FastJSONProvider:
+
+    python benchmarks/bench_json.py --rows 1000
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.models.rows import booking_row_to_dict, vendor_row_to_dict
+from src.models.serializers import BOOKING_SPEC, VENDOR_SPEC, compile_serializer
+from src.utils import json_provider
+from src.utils.json_provider import FastJSONProvider
+
+# Stand-ins for the hand-written to_dict() methods the serializers replaced
+legacy_vendor_to_dict = compile_serializer('legacy_vendor', VENDOR_SPEC)
+legacy_booking_to_dict = compile_serializer(
+    'legacy_booking', BOOKING_SPEC,
+    overrides={'eventId': 'event_public_id', 'vendorId': 'vendor_public_id', 'venueId': 'venue_public_id'}
+)
+
+def vendor_rows(count):
+    return [SimpleNamespace(
+        vendor_id=f'vnd_{i:012d}', business_name=f'Vendor {i}', description='Award-winning catering service',
+        category='catering', service_areas=['San Francisco', 'Bay Area', 'Napa Valley'], average_rating=4.8,
+        total_reviews=127, starting_price=2500.0, currency='USD', response_time_hours=2.5,
+        is_verified=True, is_active=True
+    ) for i in range(count)]
+
+def booking_rows(count):
+    start = datetime(2025, 1, 1, 9, 30, 15, 250000)
+    return [SimpleNamespace(
+        booking_id=f'bkg_{i:012d}', event_public_id='evt_000000000001', vendor_public_id=f'vnd_{i:012d}',
+        venue_public_id=None, service_name='Photography', service_details={'hours': 6, 'photographers': 2},
+        service_date=start, start_time=start + timedelta(hours=1), end_time=start + timedelta(hours=7),
+        quoted_price=2500.0, final_price=None, currency='USD', status='quoted', message='Looking forward to it',
+        created_at=start, updated_at=start + timedelta(minutes=i)
+    ) for i in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    legacy_app = Flask('legacy')
+    legacy_app.json = DefaultJSONProvider(legacy_app)
+    fast_app = Flask('fast')
+    fast_app.json = FastJSONProvider(fast_app)
+
+    cases = {
+        'vendors': (vendor_rows(args.rows), legacy_vendor_to_dict, vendor_row_to_dict),
+        'bookings': (booking_rows(args.rows), legacy_booking_to_dict, booking_row_to_dict)
+    }
+    encoders = [('orjson' if json_provider.orjson else 'stdlib', json_provider.orjson)]
+    if json_provider.orjson:
+        encoders.append(('stdlib', None))
+
+    print(f"{'page':<10} {'encoder':<8} {'legacy ms':>10} {'fast ms':>9} {'speedup':>8}")
+    for name, (rows, legacy, fast) in cases.items():
+        with legacy_app.app_context():
+            legacy_ms = min(timeit.repeat(
+                lambda: legacy_app.json.response({'data': [legacy(r) for r in rows]}).get_data(),
+                number=args.number, repeat=3)) / args.number * 1000
+        for encoder_name, module in encoders:
+            saved, json_provider.orjson = json_provider.orjson, module
+            try:
+                with fast_app.app_context():
+                    fast_ms = min(timeit.repeat(
+                        lambda: fast_app.json.response({'data': [fast(r) for r in rows]}).get_data(),
+                        number=args.number, repeat=3)) / args.number * 1000
+            finally:
+                json_provider.orjson = saved
+            print(f'{name:<10} {encoder_name:<8} {legacy_ms:>10.2f} {fast_ms:>9.2f} {legacy_ms / fast_ms:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
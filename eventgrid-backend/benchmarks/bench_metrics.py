@@ -0,0 +1,65 @@
+"""Per-request cost of the metrics instrumentation.
+
+Times a cheap request (GET /api/health) and one that runs SQL
+(GET /api/marketplace/featured) through the test client with METRICS_ENABLED
+on and off. Rounds are interleaved and the best round is kept, since the
+difference is small next to test-client noise. The cost of recording one
+request is also timed on its own:
+
+    python benchmarks/bench_metrics.py --requests 2000 --rounds 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from src.cli import init_db, seed_sample_data
+from src.main import create_app
+from src.utils.metrics import RequestMetrics
+
+def time_requests(app, path, headers, count):
+    client = app.test_client()
+    client.get(path, headers=headers)
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get(path, headers=headers)
+    return (time.perf_counter() - start) / count * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'metrics.db')}"
+        apps = {
+            'off': create_app({'SQLALCHEMY_DATABASE_URI': uri, 'METRICS_ENABLED': False}),
+            'on': create_app({'SQLALCHEMY_DATABASE_URI': uri, 'METRICS_ENABLED': True})
+        }
+        with apps['off'].app_context():
+            init_db()
+            seed_sample_data()
+            from src.models.user import User
+            headers = {'Authorization': f'Bearer {create_access_token(identity=User.query.first().user_id)}'}
+
+        print(f"{'path':<28}{'metrics off':>14}{'metrics on':>14}{'overhead':>12}   (us/request)")
+        for path in ('/api/health', '/api/marketplace/featured'):
+            best = {'off': float('inf'), 'on': float('inf')}
+            for _ in range(args.rounds):
+                for mode, app in apps.items():
+                    best[mode] = min(best[mode], time_requests(app, path, headers, args.requests))
+            print(f"{path:<28}{best['off']:>14.1f}{best['on']:>14.1f}{best['on'] - best['off']:>12.1f}")
+
+    metrics = RequestMetrics()
+    number = 200000
+    seconds = timeit.timeit(lambda: metrics.observe('events.get_events', 'GET', 200, 0.0123, 3, 0.0008), number=number)
+    print(f'RequestMetrics.observe: {seconds / number * 1e6:.2f} us')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""Microbenchmarks for the CPU hot spots that need no database.
+
+Covers the model serializers (Event/Vendor/Booking.to_dict on transient
+instances), the AR layout generators, capacity optimization, the mock AI
+designer and the live dashboard generator. Each case is warmed up, then its
+iteration count is calibrated so one round takes --min-time seconds, and the
+per-call time of --rounds rounds is reported (best and median). Memory is
+measured separately under tracemalloc, since tracing slows the timed loop:
+peak is the most allocated during one call, retained what the result keeps.
+
+Save a run with --output and check a later one against it with --baseline;
+cases whose best time or peak memory grew by more than --threshold are
+listed and the exit status is 1. Best rather than median time is compared,
+since noise from the rest of the machine only ever adds time:
+
+    python benchmarks/bench_micro.py --output before.json
+    python benchmarks/bench_micro.py --baseline before.json --threshold 0.10
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from src.models.user import Booking, Event, User, Vendor, Venue
+from src.routes.ai import generate_mock_ai_response
+from src.routes.ar import generate_banquet_chair_positions, generate_capacity_optimization, generate_theater_positions
+from src.routes.live import generate_live_dashboard_data
+
+START = datetime(2025, 6, 14, 16, 0, 0, 500000)
+
+def sample_event():
+    organizer = User(user_id='usr_000000000001', email='organizer@example.com', first_name='Sarah',
+                     last_name='Chen', role='event_manager')
+    return Event(event_id='evt_000000000001', organizer=organizer, title='Annual Tech Summit',
+                 description='Two days of talks and workshops', event_type='conference', category='technology',
+                 status='planning', start_date=START, end_date=START + timedelta(days=1), timezone='UTC',
+                 expected_attendees=500, max_capacity=600, total_budget=85000.0, currency='USD',
+                 visibility='private', created_at=START, updated_at=START)
+
+def sample_vendor():
+    return Vendor(vendor_id='vnd_000000000001', business_name='Golden Oak Catering',
+                  description='Award-winning catering service', category='catering',
+                  service_areas=['San Francisco', 'Bay Area', 'Napa Valley'], average_rating=4.8, total_reviews=127,
+                  starting_price=2500.0, currency='USD', response_time_hours=2.5, is_verified=True, is_active=True,
+                  created_at=START)
+
+def sample_booking():
+    return Booking(booking_id='bkg_000000000001', event=sample_event(), vendor=sample_vendor(),
+                   service_name='Catering', service_details={'guests': 500, 'courses': 3}, service_date=START,
+                   start_time=START, end_time=START + timedelta(hours=6), quoted_price=18500.0, currency='USD',
+                   status='quoted', message='Looking forward to it', created_at=START, updated_at=START)
+
+def sample_venue():
+    return Venue(venue_id='ven_000000000001', name='Grand Harbor Ballroom', capacity_min=50, capacity_max=1500)
+
+def cases():
+    """name -> zero-argument callable"""
+    event, vendor, booking, venue = sample_event(), sample_vendor(), sample_booking(), sample_venue()
+    ai_request = {'eventType': 'Wedding', 'vibe': 'Elegant', 'budget': 45000, 'attendeeCount': 150,
+                  'currency': 'USD'}
+    requirements = {'targetCapacity': 1400, 'eventType': 'gala', 'accessibilityNeeds': True}
+    return {
+        'Event.to_dict': event.to_dict,
+        'Vendor.to_dict': vendor.to_dict,
+        'Booking.to_dict': booking.to_dict,
+        'generate_theater_positions(1500)': lambda: generate_theater_positions(1500),
+        'generate_banquet_chair_positions(125)': lambda: generate_banquet_chair_positions(125),
+        'generate_capacity_optimization': lambda: generate_capacity_optimization(venue, requirements),
+        'generate_mock_ai_response': lambda: generate_mock_ai_response(ai_request),
+        'generate_live_dashboard_data': lambda: generate_live_dashboard_data(event)
+    }
+
+def calibrate(func, min_time):
+    """Smallest power-of-ten multiple (1, 2, 5, 10, ...) of calls that takes at least min_time"""
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            count = number * factor
+            if time_loop(func, count) >= min_time:
+                return count
+        number *= 10
+
+def time_loop(func, number):
+    loop = range(number)
+    start = time.perf_counter()
+    for _ in loop:
+        func()
+    return time.perf_counter() - start
+
+def measure_time(func, warmup, min_time, rounds):
+    deadline = time.perf_counter() + warmup
+    while time.perf_counter() < deadline:
+        func()
+    number = calibrate(func, min_time)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        per_call = [time_loop(func, number) / number * 1e6 for _ in range(rounds)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        'number': number,
+        'bestUs': round(min(per_call), 3),
+        'medianUs': round(statistics.median(per_call), 3),
+        'stdevUs': round(statistics.stdev(per_call), 3) if len(per_call) > 1 else 0.0
+    }
+
+def measure_memory(func):
+    func()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {'peakBytes': peak - baseline, 'retainedBytes': retained - baseline}
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def regressions(results, baseline, threshold):
+    found = []
+    for name, current in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        for key in ('bestUs', 'peakBytes'):
+            if previous[key] and current[key] > previous[key] * (1 + threshold):
+                found.append(f'{name}: {key} {previous[key]} -> {current[key]} '
+                             f'({(current[key] / previous[key] - 1) * 100:+.1f}%)')
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--warmup', type=float, default=0.2, help='Seconds of untimed calls per case')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Target seconds per timed round')
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--filter', help='Only run cases whose name contains this text')
+    parser.add_argument('--output', help='Write results as JSON')
+    parser.add_argument('--baseline', help='JSON from an earlier run to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed relative growth before failing')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<40}{'best':>10}{'median':>10}{'stdev':>9}{'calls':>9}{'peak KiB':>10}{'kept KiB':>10}")
+    for name, func in cases().items():
+        if args.filter and args.filter not in name:
+            continue
+        # The live dashboard draws random numbers; keep its output the same run to run
+        random.seed(0)
+        timing = measure_time(func, args.warmup, args.min_time, args.rounds)
+        memory = measure_memory(func)
+        results[name] = {**timing, **memory}
+        print(f"{name:<40}{timing['bestUs']:>10.2f}{timing['medianUs']:>10.2f}{timing['stdevUs']:>9.2f}"
+              f"{timing['number']:>9}{memory['peakBytes'] / 1024:>10.1f}{memory['retainedBytes'] / 1024:>10.1f}")
+    print('(times in us per call)')
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'time': datetime.utcnow().isoformat(timespec='seconds'),
+            'rounds': args.rounds,
+            'minTime': args.min_time
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        found = regressions(results, baseline, args.threshold)
+        if found:
+            print(f"\nRegressions against {args.baseline} ({baseline['meta'].get('commit')}):")
+            for line in found:
+                print('  ' + line)
+            return 1
+        print(f"\nNo regressions above {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""OFFSET vs keyset pagination latency as pages get deeper.
+
+Loads one organizer with many bookings into a temporary database and times a
+20-row page at increasing depths in both modes:
+
+    python benchmarks/bench_pagination.py --bookings 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.models.user import db, Booking, Event
+from src.utils.database import configure_database
+from src.utils.pagination import encode_cursor, keyset_paginate
+
+ORDER = [(Booking.created_at, 'desc'), (Booking.id, 'desc')]
+
+def load(bookings, events=50):
+    connection = db.engine.raw_connection()
+    cursor = connection.cursor()
+    cursor.execute("INSERT INTO users (id, user_id, email, password_hash, first_name, last_name, role) "
+                   "VALUES (1, 'usr_bench', 'bench@example.com', 'x', 'B', 'B', 'event_manager')")
+    start = datetime(2025, 1, 1)
+    cursor.executemany(
+        'INSERT INTO events (id, event_id, organizer_id, title, event_type, start_date, end_date, timezone) '
+        'VALUES (?, ?, 1, ?, ?, ?, ?, ?)',
+        [(i, f'evt_{i}', 'Bench', 'conference', start, start, 'UTC') for i in range(1, events + 1)]
+    )
+    cursor.executemany(
+        'INSERT INTO bookings (booking_id, event_id, service_name, service_date, created_at) VALUES (?, ?, ?, ?, ?)',
+        [(f'bkg_{i}', 1 + i % events, 'bench', start, start + timedelta(seconds=i)) for i in range(bookings)]
+    )
+    connection.commit()
+    cursor.execute('ANALYZE')
+    connection.close()
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bookings', type=int, default=100000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app.config['DB_PROFILE'] = 'production'
+        configure_database(app)
+
+        with app.app_context():
+            db.create_all()
+            load(args.bookings)
+            query = Booking.query.join(Event).filter(Event.organizer_id == 1)
+            ordered = query.order_by(Booking.created_at.desc(), Booking.id.desc())
+
+            print(f"{'page':>8} {'offset ms':>10} {'cursor ms':>10}")
+            depth = 1
+            while depth * args.limit < args.bookings:
+                offset = (depth - 1) * args.limit
+                boundary = ordered.offset(max(offset - 1, 0)).first()
+                cursor = encode_cursor('created_at_desc', [boundary.created_at, boundary.id]) if offset else None
+
+                offset_ms = timed(lambda: ordered.limit(args.limit).offset(offset).all(), args.repeat)
+                cursor_ms = timed(lambda: keyset_paginate(query, ORDER, args.limit, cursor, 'created_at_desc'), args.repeat)
+                print(f'{depth:>8} {offset_ms:>10.2f} {cursor_ms:>10.2f}')
+                depth *= 10
+
+if __name__ == '__main__':
+    main()
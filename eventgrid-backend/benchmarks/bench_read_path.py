@@ -0,0 +1,96 @@
+"""ORM to_dict() vs the column-only row path used by list endpoints.
+
+Reports per-row CPU time and peak traced memory for building the response
+dicts of N vendors, events and bookings, and checks both paths serialize to
+identical JSON:
+
+    python benchmarks/bench_read_path.py --rows 5000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.models.user import db, Booking, Event, User, Vendor
+from src.models.rows import (booking_row_to_dict, booking_rows, event_row_to_dict, event_rows,
+                             vendor_row_to_dict, vendor_rows)
+from src.utils.database import configure_database
+from src.utils.json_provider import FastJSONProvider
+
+def load(rows):
+    user = User(user_id='usr_bench', email='bench@example.com', first_name='B', last_name='B', role='vendor')
+    user.set_password('bench')
+    db.session.add(user)
+    db.session.flush()
+    start = datetime(2025, 1, 1)
+    db.session.bulk_insert_mappings(Vendor, [{
+        'vendor_id': f'vnd_{i}', 'user_id': user.id, 'business_name': f'Vendor {i}', 'category': 'catering',
+        'description': 'Bench vendor', 'service_areas': ['San Francisco', 'Bay Area'], 'starting_price': 100.0 + i,
+        'average_rating': 4.5, 'total_reviews': i, 'created_at': start
+    } for i in range(rows)])
+    db.session.bulk_insert_mappings(Event, [{
+        'event_id': f'evt_{i}', 'organizer_id': user.id, 'title': f'Event {i}', 'event_type': 'conference',
+        'start_date': start + timedelta(hours=i), 'end_date': start + timedelta(hours=i + 2), 'timezone': 'UTC',
+        'created_at': start, 'updated_at': start
+    } for i in range(rows)])
+    db.session.bulk_insert_mappings(Booking, [{
+        'booking_id': f'bkg_{i}', 'event_id': 1 + i % rows, 'vendor_id': 1 + i % rows, 'service_name': 'Bench',
+        'service_details': {'hours': 4}, 'service_date': start, 'created_at': start, 'updated_at': start
+    } for i in range(rows)])
+    db.session.commit()
+
+def measure(build, repeat=3):
+    """Best wall time of several untraced runs, then one traced run for peak memory"""
+    elapsed = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        result = build()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    db.session.expunge_all()
+    tracemalloc.start()
+    build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return result, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    configure_database(app)
+    # The row serializers leave datetimes to the provider, so compare what the app would send
+    app.json = FastJSONProvider(app)
+    app.config['JSON_COMPACT'] = False
+
+    with app.app_context():
+        db.create_all()
+        load(args.rows)
+        cases = {
+            'vendors': (lambda: [v.to_dict() for v in Vendor.query.order_by(Vendor.id).all()],
+                        lambda: [vendor_row_to_dict(r) for r in vendor_rows(Vendor.query).order_by(Vendor.id).all()]),
+            'events': (lambda: [e.to_dict() for e in Event.query.order_by(Event.id).all()],
+                       lambda: [event_row_to_dict(r) for r in event_rows(Event.query).order_by(Event.id).all()]),
+            'bookings': (lambda: [b.to_dict() for b in Booking.query.join(Event).order_by(Booking.id).all()],
+                         lambda: [booking_row_to_dict(r) for r in booking_rows(Booking.query.join(Event)).order_by(Booking.id).all()])
+        }
+
+        print(f"{'model':<10} {'orm us/row':>11} {'rows us/row':>12} {'speedup':>8} {'orm KiB':>9} {'rows KiB':>9} identical")
+        for name, (orm_build, row_build) in cases.items():
+            orm_result, orm_time, orm_peak = measure(orm_build)
+            row_result, row_time, row_peak = measure(row_build)
+            identical = app.json.dumps(orm_result) == app.json.dumps(row_result)
+            print(f'{name:<10} {orm_time / args.rows * 1e6:>11.1f} {row_time / args.rows * 1e6:>12.1f} '
+                  f'{orm_time / row_time:>7.1f}x {orm_peak / 1024:>9.0f} {row_peak / 1024:>9.0f} {identical}')
+
+if __name__ == '__main__':
+    main()
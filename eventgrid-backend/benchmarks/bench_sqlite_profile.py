@@ -0,0 +1,101 @@
+"""Concurrent read/write throughput of the SQLite engine profiles.
+
+Spawns several worker processes (like gunicorn workers) against one database
+file and reports reads/s, writes/s and lock errors for each profile:
+
+    python benchmarks/bench_sqlite_profile.py --workers 4 --seconds 5
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+from src.models.user import db, User, Event, Booking
+from src.utils.database import configure_database, commit_with_retry, is_lock_error
+
+def make_app(path, profile):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config['DB_PROFILE'] = profile
+    configure_database(app)
+    return app
+
+def setup(path, profile):
+    app = make_app(path, profile)
+    with app.app_context():
+        db.create_all()
+        user = User(user_id='usr_bench', email='bench@example.com', first_name='B',
+                    last_name='B', role='event_manager')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Event(event_id='evt_bench', organizer_id=user.id, title='Bench',
+                             event_type='conference', start_date=datetime.utcnow(),
+                             end_date=datetime.utcnow(), timezone='UTC'))
+        db.session.commit()
+
+def worker(path, profile, seconds, write_ratio, results):
+    app = make_app(path, profile)
+    reads = writes = errors = 0
+    with app.app_context():
+        event = Event.query.filter_by(event_id='evt_bench').first()
+        event_pk = event.id
+        deadline = time.perf_counter() + seconds
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            try:
+                if (i % 100) < write_ratio * 100:
+                    db.session.add(Booking(booking_id=f'bkg_{uuid.uuid4().hex[:12]}', event_id=event_pk,
+                                           service_name='bench', service_date=datetime.utcnow()))
+                    commit_with_retry()
+                    writes += 1
+                else:
+                    Booking.query.filter_by(event_id=event_pk).order_by(Booking.id.desc()).limit(20).all()
+                    db.session.rollback()
+                    reads += 1
+            except OperationalError as e:
+                db.session.rollback()
+                if not is_lock_error(e):
+                    raise
+                errors += 1
+    results.put((reads, writes, errors))
+
+def run(profile, workers, seconds, write_ratio):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        setup(path, profile)
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=worker, args=(path, profile, seconds, write_ratio, results))
+                 for _ in range(workers)]
+        for proc in procs:
+            proc.start()
+        totals = [0, 0, 0]
+        for _ in procs:
+            for idx, value in enumerate(results.get()):
+                totals[idx] += value
+        for proc in procs:
+            proc.join()
+    reads, writes, errors = totals
+    print(f'{profile:<12} reads/s={reads / seconds:>9.0f}  writes/s={writes / seconds:>8.0f}  lock_errors={errors}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--profiles', nargs='+', default=['development', 'production'])
+    args = parser.parse_args()
+    for profile in args.profiles:
+        run(profile, args.workers, args.seconds, args.write_ratio)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Worker cold start: import, create_app() and the first request.
+
+Each sample runs in a fresh interpreter so module imports are really cold.
+Three startup modes are compared against a throwaway SQLite file:
+
+    legacy  eager blueprints, plus create_all/ensure_indexes/seed check at boot
+            (what importing src.main used to do)
+    eager   create_app() with LAZY_ROUTE_MODULES = False
+    lazy    create_app() as deployed
+
+    python benchmarks/bench_startup.py --runs 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {backend_dir!r})
+from src.main import create_app
+imported = time.perf_counter()
+app = create_app({{'SQLALCHEMY_DATABASE_URI': {uri!r}, 'LAZY_ROUTE_MODULES': {lazy!r}}})
+if {legacy!r}:
+    from src.cli import init_db, seed_sample_data
+    with app.app_context():
+        init_db()
+        seed_sample_data()
+created = time.perf_counter()
+client = app.test_client()
+assert client.get('/api/health').status_code == 200
+first = time.perf_counter()
+client.get('/api/ar/venues/none/ar-data')
+lazy_route = time.perf_counter()
+print(json.dumps({{
+    'import': imported - start,
+    'create_app': created - imported,
+    'first_request': first - created,
+    'ready': first - start,
+    'first_lazy_route': lazy_route - first
+}}))
+'''
+
+MODES = {
+    'legacy': {'lazy': False, 'legacy': True},
+    'eager': {'lazy': False, 'legacy': False},
+    'lazy': {'lazy': True, 'legacy': False}
+}
+
+def sample(mode, uri):
+    code = CHILD.format(backend_dir=BACKEND_DIR, uri=uri, **MODES[mode])
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        # Populate the file once so every mode boots against the same schema
+        sample('legacy', uri)
+
+        fields = ['import', 'create_app', 'first_request', 'ready', 'first_lazy_route']
+        print(f"{'mode':<8}" + ''.join(f'{name:>18}' for name in fields) + '   (median ms)')
+        for mode in MODES:
+            runs = [sample(mode, uri) for _ in range(args.runs)]
+            medians = [statistics.median(run[name] for run in runs) * 1000 for name in fields]
+            print(f'{mode:<8}' + ''.join(f'{value:>18.1f}' for value in medians))
+
+if __name__ == '__main__':
+    main()
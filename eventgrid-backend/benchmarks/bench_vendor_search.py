@@ -0,0 +1,106 @@
+"""Vendor search latency: FTS5 index vs ILIKE scans.
+
+Builds a vendors table of --vendors rows with the load-test generator (the
+first run is slow; the file is reused when --database is given), then times
+GET /api/marketplace/vendors through the test client for a set of text
+queries. Each query runs alone, with relevance sort, and combined with the
+category, location and rating filters, in both pagination modes. Runs with
+VENDOR_SEARCH_FTS on and off are compared:
+
+    python benchmarks/bench_vendor_search.py --vendors 500000 --database /tmp/vendors.db
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine, text
+from benchmarks.loadtest.datagen import BASE_COUNTS, _Generator, generate_table
+from src.main import create_app
+from src.models.user import Vendor, db
+from src.utils.migrations import ensure_indexes
+
+QUERIES = ['photo', 'golden', 'harbor catering', 'wedding', 'studio music', 'flor']
+
+VARIANTS = {
+    'plain': {},
+    'relevance': {'sort': 'relevance'},
+    'category': {'category': 'catering'},
+    'location+rating': {'location': 'Austin', 'rating': 4.5},
+}
+
+def build(database_url, vendors):
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        exists = connection.execute(text("SELECT name FROM sqlite_master WHERE name = 'vendors'")).first()
+        if exists and connection.execute(text('SELECT COUNT(*) FROM vendors')).scalar() == vendors:
+            engine.dispose()
+            return
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    generator = _Generator(vendors / BASE_COUNTS['vendors'], 42, datetime.utcnow().replace(microsecond=0))
+    started = time.perf_counter()
+    generate_table(engine, Vendor, generator.vendors())
+    print(f'Inserted {vendors:,} vendors in {time.perf_counter() - started:.1f}s')
+    started = time.perf_counter()
+    created = ensure_indexes(engine)
+    print(f'Built {", ".join(created) or "no indexes"} in {time.perf_counter() - started:.1f}s')
+    engine.dispose()
+
+def measure(client, headers, params, repeat):
+    path = '/api/marketplace/vendors?' + urlencode(params)
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(path, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), response.get_json()['data']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--vendors', type=int, default=500000)
+    parser.add_argument('--database', help='SQLite file to build or reuse')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.abspath(args.database) if args.database else os.path.join(tmp, 'vendors.db')
+        database_url = f'sqlite:///{path}'
+        build(database_url, args.vendors)
+
+        apps = {
+            'fts': create_app({'SQLALCHEMY_DATABASE_URI': database_url, 'VENDOR_SEARCH_FTS': True}),
+            'ilike': create_app({'SQLALCHEMY_DATABASE_URI': database_url, 'VENDOR_SEARCH_FTS': False})
+        }
+        # search_vendors only checks the token, so no user rows are needed
+        with apps['fts'].app_context():
+            headers = {'Authorization': f"Bearer {create_access_token(identity='usr_bench')}"}
+
+        print(f"{'query':<18}{'variant':<17}{'mode':<8}{'matches':>9}{'ilike ms':>10}{'fts ms':>9}")
+        totals = {'ilike': [], 'fts': []}
+        for query_text in QUERIES:
+            for variant, extra in VARIANTS.items():
+                for mode in ('page', 'cursor'):
+                    params = {'query': query_text, 'limit': 20, **extra}
+                    if mode == 'cursor':
+                        params['cursor'] = ''
+                    timings = {}
+                    for name, app in apps.items():
+                        timings[name], data = measure(app.test_client(), headers, params, args.repeat)
+                        totals[name].append(timings[name])
+                    matches = data['pagination'].get('total', '')
+                    print(f"{query_text:<18}{variant:<17}{mode:<8}{matches:>9}"
+                          f"{timings['ilike']:>10.1f}{timings['fts']:>9.1f}")
+        print(f"{'median':<52}{statistics.median(totals['ilike']):>10.1f}{statistics.median(totals['fts']):>9.1f}")
+
+if __name__ == '__main__':
+    main()
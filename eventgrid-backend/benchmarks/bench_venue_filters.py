@@ -0,0 +1,126 @@
+"""Venue filter latency: capacity / price ranges and amenity bitmask checks.
+
+Builds a venues table of --venues rows with the load-test generator (reused
+when --database is given), then times GET /api/venues through the test client
+for a set of filters: the first page, a page --depth cursors in, the first
+page with includeTotal, and includeFacets with a cold and a warm facet cache.
+The index each filter's query plan uses is printed next to its timings:
+
+    python benchmarks/bench_venue_filters.py --venues 1000000 --database /tmp/venues.db
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine, text
+from benchmarks.loadtest.datagen import BASE_COUNTS, _Generator, generate_table
+from src.main import create_app
+from src.models.user import Venue, db
+from src.utils.amenities import parse_amenities
+from src.utils.facets import facet_cache
+from src.utils.geo import VenueFilters
+from src.utils.migrations import ensure_indexes, explain_query_plan
+
+FILTERS = {
+    '250 guests, <5k, av+parking': {'capacity': 250, 'maxPrice': 5000, 'amenities': 'av,parking'},
+    '250 guests': {'capacity': 250},
+    'under 2k/day': {'maxPrice': 2000},
+    '1000 guests, 10k-15k': {'capacity': 1000, 'minPrice': 10000, 'maxPrice': 15000},
+    'stage+bar+dance floor': {'amenities': 'stage,bar,dance_floor'},
+    'largest first, wifi': {'amenities': 'wifi', 'sort': 'capacity_desc'}
+}
+
+def build(database_url, venues):
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        exists = connection.execute(text("SELECT name FROM sqlite_master WHERE name = 'venues'")).first()
+        reuse = exists and connection.execute(text('SELECT COUNT(*) FROM venues')).scalar() == venues
+    if reuse:
+        # a file from before the venue filters: adds and backfills amenity_mask, plus their indexes
+        ensure_indexes(engine)
+        engine.dispose()
+        return
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    generator = _Generator(venues / BASE_COUNTS['venues'], 42, datetime.utcnow().replace(microsecond=0))
+    started = time.perf_counter()
+    generate_table(engine, Venue, generator.venues())
+    print(f'Inserted {venues:,} venues in {time.perf_counter() - started:.1f}s')
+    started = time.perf_counter()
+    created = ensure_indexes(engine)
+    print(f'Built {", ".join(created) or "no indexes"} in {time.perf_counter() - started:.1f}s')
+    engine.dispose()
+
+def timed(client, headers, params, repeat=1):
+    path = '/api/venues?' + urlencode(params)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+    assert response.status_code == 200, response.get_json()
+    return statistics.median(samples), response.get_json()['data']
+
+def plan_index(params):
+    filters = VenueFilters(
+        capacity=params.get('capacity'), min_price=params.get('minPrice'), max_price=params.get('maxPrice'),
+        amenities=parse_amenities([params.get('amenities', '')])[0]
+    )
+    plan = ' '.join(explain_query_plan(Venue.query.filter(*filters.clauses())))
+    for name in ('ix_venues_active_capacity', 'ix_venues_active_daily_rate'):
+        if name in plan:
+            return name.replace('ix_venues_active_', '')
+    return 'scan'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--venues', type=int, default=1000000)
+    parser.add_argument('--database', help='SQLite file to build or reuse')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--depth', type=int, default=50, help='cursor pages to walk for the deep-page timing')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.abspath(args.database) if args.database else os.path.join(tmp, 'venues.db')
+        database_url = f'sqlite:///{path}'
+        build(database_url, args.venues)
+
+        app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+        client = app.test_client()
+        # filter_venues only checks the token, so no user rows are needed
+        with app.app_context():
+            headers = {'Authorization': f"Bearer {create_access_token(identity='usr_bench')}"}
+
+        print(f"{'filter':<30}{'index':<12}{'total':>9}{'page ms':>9}{'deep ms':>9}"
+              f"{'total ms':>10}{'facets cold':>13}{'warm':>7}")
+        for name, params in FILTERS.items():
+            params = {**params, 'limit': 20}
+            with app.app_context():
+                index = plan_index(params)
+            first, _ = timed(client, headers, params, args.repeat)
+
+            cursor = None
+            for _ in range(args.depth):
+                _, data = timed(client, headers, {**params, **({'cursor': cursor} if cursor else {})})
+                cursor = data['pagination']['nextCursor']
+                if not cursor:
+                    break
+            deep = timed(client, headers, {**params, 'cursor': cursor}, args.repeat)[0] if cursor else float('nan')
+
+            with_total, data = timed(client, headers, {**params, 'includeTotal': 'true'})
+            facet_cache.clear()
+            cold, _ = timed(client, headers, {**params, 'includeFacets': 'true'})
+            warm, _ = timed(client, headers, {**params, 'includeFacets': 'true'}, args.repeat)
+            print(f"{name:<30}{index:<12}{data['pagination']['total']:>9}{first:>9.1f}{deep:>9.1f}"
+                  f"{with_total:>10.1f}{cold:>13.1f}{warm:>7.1f}")
+
+if __name__ == '__main__':
+    main()
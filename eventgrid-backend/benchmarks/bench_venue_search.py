@@ -0,0 +1,115 @@
+"""Venue geo search latency: SQLite R*Tree vs the in-process grid.
+
+Builds a venues table of --venues rows with the load-test generator (venues
+cluster around the generator's cities; the first run is slow, the file is
+reused when --database is given), then times GET /api/venues/search through
+the test client for radius and bounding-box queries, alone and combined with
+the capacity and daily rate filters. Runs with VENUE_SEARCH_RTREE on and off
+are compared; the grid is built by the warm-up request, outside the timings:
+
+    python benchmarks/bench_venue_search.py --venues 1000000 --database /tmp/venues.db
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine, text
+from benchmarks.loadtest.datagen import BASE_COUNTS, _Generator, generate_table
+from src.main import create_app
+from src.models.user import Venue, db
+from src.utils import geo
+from src.utils.migrations import ensure_indexes
+
+SEARCHES = {
+    'radius 2km': {'lat': 37.7749, 'lng': -122.4194, 'radius': 2},
+    'radius 10km': {'lat': 37.7749, 'lng': -122.4194, 'radius': 10},
+    'radius 25km': {'lat': 40.7128, 'lng': -74.0060, 'radius': 25},
+    'radius 100km': {'lat': 37.7749, 'lng': -122.4194, 'radius': 100},
+    'viewport': {'minLat': 30.1, 'maxLat': 30.4, 'minLng': -97.9, 'maxLng': -97.6},
+    'outside cities': {'lat': 44.0, 'lng': -100.0, 'radius': 100}
+}
+
+VARIANTS = {
+    'plain': {},
+    'capacity+price': {'capacity': 250, 'maxPrice': 5000}
+}
+
+def build(database_url, venues):
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        exists = connection.execute(text("SELECT name FROM sqlite_master WHERE name = 'venues'")).first()
+        if exists and connection.execute(text('SELECT COUNT(*) FROM venues')).scalar() == venues:
+            engine.dispose()
+            return
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    generator = _Generator(venues / BASE_COUNTS['venues'], 42, datetime.utcnow().replace(microsecond=0))
+    started = time.perf_counter()
+    generate_table(engine, Venue, generator.venues())
+    print(f'Inserted {venues:,} venues in {time.perf_counter() - started:.1f}s')
+    started = time.perf_counter()
+    created = ensure_indexes(engine)
+    print(f'Built {", ".join(created) or "no indexes"} in {time.perf_counter() - started:.1f}s')
+    engine.dispose()
+
+def measure(client, headers, params, repeat):
+    path = '/api/venues/search?' + urlencode(params)
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(path, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), response.get_json()['data']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--venues', type=int, default=1000000)
+    parser.add_argument('--database', help='SQLite file to build or reuse')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.abspath(args.database) if args.database else os.path.join(tmp, 'venues.db')
+        database_url = f'sqlite:///{path}'
+        build(database_url, args.venues)
+
+        apps = {
+            'rtree': create_app({'SQLALCHEMY_DATABASE_URI': database_url, 'VENUE_SEARCH_RTREE': True}),
+            'grid': create_app({'SQLALCHEMY_DATABASE_URI': database_url, 'VENUE_SEARCH_RTREE': False})
+        }
+        # search_venues only checks the token, so no user rows are needed
+        with apps['rtree'].app_context():
+            headers = {'Authorization': f"Bearer {create_access_token(identity='usr_bench')}"}
+
+        started = time.perf_counter()
+        apps['grid'].test_client().get('/api/venues/search?' + urlencode(SEARCHES['radius 2km']), headers=headers)
+        print(f'Built the venue grid in {time.perf_counter() - started:.1f}s; '
+              f"distances with {'numpy' if geo.numpy is not None else 'the Python loop'}")
+
+        print(f"{'search':<16}{'variant':<16}{'matches':>9}{'grid ms':>9}{'rtree ms':>10}")
+        totals = {'grid': [], 'rtree': []}
+        for search, params in SEARCHES.items():
+            for variant, extra in VARIANTS.items():
+                timings = {}
+                matches = {}
+                for name, app in apps.items():
+                    timings[name], data = measure(app.test_client(), headers, {**params, **extra, 'limit': 20}, args.repeat)
+                    matches[name] = data['pagination']['total']
+                    assert data['search']['index'] == name, data['search']
+                    totals[name].append(timings[name])
+                assert matches['grid'] == matches['rtree'], matches
+                print(f"{search:<16}{variant:<16}{matches['rtree']:>9}{timings['grid']:>9.1f}{timings['rtree']:>10.1f}")
+        print(f"{'median':<41}{statistics.median(totals['grid']):>9.1f}{statistics.median(totals['rtree']):>10.1f}")
+
+if __name__ == '__main__':
+    main()
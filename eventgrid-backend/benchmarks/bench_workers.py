@@ -0,0 +1,111 @@
+"""Server configurations compared on the load-test route mix.
+
+Starts the app under each configuration in turn, against one synthetic
+database, and replays a scenario mix over HTTP with the load-test runner.
+A configuration is WORKERSxTHREADS for gunicorn (gunicorn.conf.py with
+WEB_CONCURRENCY and GUNICORN_THREADS), or 'dev' for Flask's threaded
+development server as a baseline. The load generator runs in its own
+processes (--client-processes) so it is not the bottleneck:
+
+    python benchmarks/bench_workers.py --configs dev,1x1,1x4,2x4,4x4 --scale 1 --duration 20
+"""
+import argparse
+import importlib.util
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.loadtest.datagen import generate
+from benchmarks.loadtest.runner import run
+
+DEV_SERVER = "import os; from src.main import app; app.run(port=int(os.environ['PORT']), threaded=True)"
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(config, database_url, port):
+    env = dict(os.environ, DATABASE_URL=database_url, DB_PROFILE='production', PORT=str(port),
+               METRICS_SERVER_TIMING='false', QUERY_PROFILER_ENABLED='false')
+    if config == 'dev':
+        command = [sys.executable, '-c', DEV_SERVER]
+    else:
+        workers, threads = config.split('x')
+        env.update(WEB_CONCURRENCY=workers, GUNICORN_THREADS=threads, GUNICORN_BIND=f'127.0.0.1:{port}')
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'src.main:app']
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def wait_ready(url, server, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'Server exited with status {server.returncode}')
+        try:
+            with urllib.request.urlopen(url + '/api/health', timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server at {url} did not become ready in {timeout}s')
+
+def stop_server(server):
+    """SIGTERM lets gunicorn drain in-flight requests before the workers exit"""
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--configs', default='dev,1x1,1x4,2x4,4x4')
+    parser.add_argument('--database', help='Existing load-test database (default: generate one)')
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--mix', default='default')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads per client process')
+    parser.add_argument('--client-processes', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    args = parser.parse_args()
+
+    configs = args.configs.split(',')
+    if any(config != 'dev' for config in configs) and importlib.util.find_spec('gunicorn') is None:
+        print('gunicorn is not installed; only the dev configuration will run')
+        configs = [config for config in configs if config == 'dev']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.database:
+            database_url = f'sqlite:///{os.path.abspath(args.database)}'
+        else:
+            database_url = f"sqlite:///{os.path.join(tmp, 'loadtest.db')}"
+            generate(database_url, scale=args.scale)
+
+        print(f'mix={args.mix}  clients={args.concurrency}x{args.client_processes}  {args.duration:.0f}s per config')
+        print(f"{'config':<10}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'errors':>8}   (ms)")
+        for config in configs:
+            port = free_port()
+            url = f'http://127.0.0.1:{port}'
+            server = start_server(config, database_url, port)
+            try:
+                wait_ready(url, server)
+                report = run(database_url, url=url, mix=args.mix, concurrency=args.concurrency,
+                             processes=args.client_processes, duration=args.duration, warmup=args.warmup)
+            finally:
+                stop_server(server)
+            total = report['total']
+            latency = total['latencyMs']
+            print(f"{config:<10}{total['rps']:>10.1f}{latency['p50']:>9.2f}{latency['p95']:>9.2f}"
+                  f"{latency['p99']:>9.2f}{latency['max']:>9.2f}{total['errors']:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+"""End-to-end load testing against a synthetic dataset.
+
+Run from eventgrid-backend/:
+
+    python -m benchmarks.loadtest generate --database /tmp/loadtest.db --scale 10
+    python -m benchmarks.loadtest run --database /tmp/loadtest.db --mix default --concurrency 16 --output before.json
+    python -m benchmarks.loadtest compare before.json after.json
+"""
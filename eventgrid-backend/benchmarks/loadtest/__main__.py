@@ -0,0 +1,84 @@
+"""Command line for the load-testing harness (see benchmarks/loadtest/__init__.py)"""
+import argparse
+import json
+import os
+import sys
+from . import __doc__ as usage
+from .datagen import generate, scaled_counts
+from .runner import compare, format_report, run, save_report
+from .scenarios import MIXES
+
+def database_url(path):
+    return path if '://' in path else f'sqlite:///{os.path.abspath(path)}'
+
+def cmd_generate(args):
+    print(f'Generating scale {args.scale} into {args.database}: '
+          + ', '.join(f'{name}={count:,}' for name, count in scaled_counts(args.scale).items()))
+    inserted = generate(database_url(args.database), scale=args.scale, seed=args.seed, reset=args.reset,
+                        progress=print)
+    print(f'Inserted {sum(inserted.values()):,} rows')
+
+def cmd_run(args):
+    report = run(
+        database_url(args.database),
+        url=args.url,
+        mix=args.mix,
+        concurrency=args.concurrency,
+        processes=args.processes,
+        duration=args.duration,
+        requests=args.requests,
+        warmup=args.warmup,
+        organizers=args.organizers,
+        seed=args.seed
+    )
+    print(format_report(report))
+    if args.output:
+        save_report(report, args.output)
+        print(f'Report written to {args.output}')
+    if report['total']['errors']:
+        return 1
+
+def cmd_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    print(compare(baseline, candidate))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadtest', description=usage,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = commands.add_parser('generate', help='Populate a database with synthetic data')
+    generate_parser.add_argument('--database', required=True, help='SQLite path or database URL')
+    generate_parser.add_argument('--scale', type=float, default=1.0)
+    generate_parser.add_argument('--seed', type=int, default=42)
+    generate_parser.add_argument('--reset', action='store_true', help='Drop and recreate the tables first')
+    generate_parser.set_defaults(handler=cmd_generate)
+
+    run_parser = commands.add_parser('run', help='Replay a scenario mix and report latencies')
+    run_parser.add_argument('--database', required=True,
+                            help='Database with the generated data; also where ids are sampled from with --url')
+    run_parser.add_argument('--url', help='Base URL of a running server instead of the in-process test client')
+    run_parser.add_argument('--mix', choices=sorted(MIXES), default='default')
+    run_parser.add_argument('--concurrency', type=int, default=8, help='Worker threads per process')
+    run_parser.add_argument('--processes', type=int, default=1)
+    run_parser.add_argument('--duration', type=float, default=30.0, help='Measured seconds, after the warmup')
+    run_parser.add_argument('--requests', type=int, help='Stop after this many requests per worker instead')
+    run_parser.add_argument('--warmup', type=float, default=2.0)
+    run_parser.add_argument('--organizers', type=int, default=50, help='Distinct organizer accounts to log in')
+    run_parser.add_argument('--seed', type=int, default=1)
+    run_parser.add_argument('--output', help='Write the JSON report here')
+    run_parser.set_defaults(handler=cmd_run)
+
+    compare_parser = commands.add_parser('compare', help='Compare two JSON reports')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.set_defaults(handler=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
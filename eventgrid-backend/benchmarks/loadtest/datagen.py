@@ -0,0 +1,319 @@
+"""Synthetic EventGrid dataset at a configurable scale factor.
+
+Scale 1 is roughly a small city's marketplace. Every count grows linearly,
+so scale 100 gives 100k vendors and 1M bookings:
+
+    organizers   200 x scale      venues     500 x scale
+    vendors    1,000 x scale      events   2,000 x scale
+    owners       100 x scale      bookings 10,000 x scale
+
+Rows are generated deterministically from a seed and written with Core
+executemany batches. Primary keys are assigned here, so foreign keys never
+need a read-back. database_url may be SQLite or PostgreSQL. The target tables must be empty; pass reset=True to drop
+and recreate them.
+"""
+import hashlib
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, text
+from src.models.user import Booking, BusinessProfile, Event, User, UserPreferences, Vendor, Venue, db
+from src.utils.amenities import amenity_mask
+from src.utils.migrations import ensure_indexes
+
+BASE_COUNTS = {
+    'organizers': 200,
+    'vendors': 1000,
+    'venue_owners': 100,
+    'venues': 500,
+    'events': 2000,
+    'bookings': 10000
+}
+
+BATCH_SIZE = 5000
+
+# Every generated user can log in with this password
+PASSWORD = 'password123'
+
+CATEGORIES = [
+    ('photography', 18), ('catering', 20), ('music', 12), ('florist', 9), ('videography', 8),
+    ('lighting', 6), ('decor', 9), ('transportation', 5), ('planning', 7), ('entertainment', 6)
+]
+
+CITIES = [
+    ('San Francisco', 37.7749, -122.4194), ('Los Angeles', 34.0522, -118.2437), ('New York', 40.7128, -74.0060),
+    ('Chicago', 41.8781, -87.6298), ('Austin', 30.2672, -97.7431), ('Seattle', 47.6062, -122.3321),
+    ('Boston', 42.3601, -71.0589), ('Denver', 39.7392, -104.9903), ('Miami', 25.7617, -80.1918),
+    ('Napa Valley', 38.2975, -122.2869), ('San Diego', 32.7157, -117.1611), ('Portland', 45.5152, -122.6784),
+    ('Atlanta', 33.7490, -84.3880), ('Nashville', 36.1627, -86.7816), ('Las Vegas', 36.1699, -115.1398)
+]
+
+EVENT_TYPES = ['conference', 'wedding', 'corporate', 'birthday', 'festival', 'gala', 'workshop', 'product_launch']
+EVENT_STATUSES = [('draft', 10), ('planning', 35), ('confirmed', 30), ('in_progress', 5), ('completed', 15), ('cancelled', 5)]
+BOOKING_STATUSES = [('inquiry', 25), ('quoted', 20), ('negotiating', 10), ('confirmed', 25), ('completed', 15), ('cancelled', 5)]
+VENUE_TYPES = ['hotel', 'conference_center', 'outdoor', 'restaurant', 'ballroom', 'rooftop', 'warehouse', 'winery']
+AMENITIES = ['wifi', 'parking', 'av_equipment', 'catering_kitchen', 'wheelchair_access', 'stage', 'dance_floor',
+             'outdoor_space', 'bar', 'bridal_suite', 'projector', 'climate_control']
+ADJECTIVES = ['Golden', 'Silver', 'Urban', 'Coastal', 'Elegant', 'Modern', 'Classic', 'Bright', 'Grand', 'Little']
+NOUNS = ['Oak', 'Harbor', 'Lantern', 'Meadow', 'Summit', 'River', 'Cedar', 'Bloom', 'Studio', 'Vine']
+FIRST_NAMES = ['Sarah', 'Mike', 'Maria', 'James', 'Priya', 'Chen', 'Olivia', 'Diego', 'Aisha', 'Tom', 'Yuki', 'Lena']
+LAST_NAMES = ['Chen', 'Johnson', 'Rodriguez', 'Smith', 'Patel', 'Kim', 'Garcia', 'Nguyen', 'Brown', 'Okafor']
+
+def scaled_counts(scale):
+    return {name: max(1, int(count * scale)) for name, count in BASE_COUNTS.items()}
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+def _name(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+class _Generator:
+    def __init__(self, scale, seed, now):
+        self.counts = scaled_counts(scale)
+        self.rng = random.Random(seed)
+        self.now = now
+        self.password_hash = hashlib.sha256(PASSWORD.encode('utf-8')).hexdigest()
+        n = self.counts
+        # users.id ranges: organizers, then vendor users, then venue owners
+        self.first_vendor_user = n['organizers'] + 1
+        self.first_owner = self.first_vendor_user + n['vendors']
+        self.total_users = self.first_owner + n['venue_owners'] - 1
+
+    def users(self):
+        n = self.counts
+        for user_pk in range(1, self.total_users + 1):
+            if user_pk < self.first_vendor_user:
+                role = 'event_manager'
+            elif user_pk < self.first_owner:
+                role = 'vendor'
+            else:
+                role = 'venue_owner'
+            first, last = _name(self.rng)
+            created = self.now - timedelta(days=self.rng.randint(1, 1000))
+            yield {
+                'id': user_pk,
+                'user_id': f'usr_{user_pk:012d}',
+                'email': f'user{user_pk}@loadtest.eventgrid.dev',
+                'password_hash': self.password_hash,
+                'first_name': first,
+                'last_name': last,
+                'role': role,
+                'avatar': None,
+                'is_verified': self.rng.random() < 0.6,
+                'is_active': True,
+                'created_at': created,
+                'updated_at': created
+            }
+
+    def user_preferences(self):
+        for user_pk in range(1, self.total_users + 1):
+            yield {
+                'id': user_pk,
+                'user_id': user_pk,
+                'language': 'en',
+                'currency': 'USD',
+                'timezone': 'America/Los_Angeles',
+                'notifications_email': True,
+                'notifications_sms': self.rng.random() < 0.2,
+                'created_at': self.now
+            }
+
+    def business_profiles(self):
+        for offset in range(self.counts['vendors'] + self.counts['venue_owners']):
+            user_pk = self.first_vendor_user + offset
+            city = self.rng.choice(CITIES)[0]
+            yield {
+                'id': offset + 1,
+                'user_id': user_pk,
+                'business_name': f'{self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)} {offset + 1}',
+                'business_type': 'venue' if user_pk >= self.first_owner else 'vendor',
+                'description': 'Locally owned and fully insured.',
+                'website': f'https://biz{offset + 1}.example.com',
+                'phone': f'+1-555-{offset % 10000:04d}',
+                'address': f'{self.rng.randint(1, 9999)} Market St',
+                'city': city,
+                'country': 'USA',
+                'created_at': self.now
+            }
+
+    def vendors(self):
+        for vendor_pk in range(1, self.counts['vendors'] + 1):
+            category = _weighted(self.rng, CATEGORIES)
+            areas = [city for city, _, _ in self.rng.sample(CITIES, self.rng.randint(1, 3))]
+            rating = round(min(5.0, max(1.0, self.rng.gauss(4.2, 0.55))), 1)
+            yield {
+                'id': vendor_pk,
+                'vendor_id': f'vnd_{vendor_pk:012d}',
+                'user_id': self.first_vendor_user + vendor_pk - 1,
+                'business_name': f'{self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)} {category.title()} {vendor_pk}',
+                'category': category,
+                'description': f'Professional {category} for weddings, conferences and corporate events in {areas[0]}.',
+                'service_areas': areas,
+                'starting_price': round(self.rng.lognormvariate(7.3, 0.7), 2),
+                'currency': 'USD',
+                'average_rating': rating,
+                'total_reviews': int(self.rng.expovariate(1 / 40)),
+                'response_time_hours': round(self.rng.uniform(0.5, 48), 1),
+                'is_verified': self.rng.random() < 0.5,
+                'is_active': self.rng.random() < 0.95,
+                'created_at': self.now - timedelta(days=self.rng.randint(1, 1500))
+            }
+
+    def venues(self):
+        for venue_pk in range(1, self.counts['venues'] + 1):
+            city, lat, lng = self.rng.choice(CITIES)
+            capacity_max = self.rng.choice([50, 80, 120, 200, 300, 500, 800, 1200, 2000])
+            row = {
+                'id': venue_pk,
+                'venue_id': f'ven_{venue_pk:012d}',
+                'owner_id': self.first_owner + (venue_pk - 1) % self.counts['venue_owners'],
+                'name': f'The {self.rng.choice(NOUNS)} {self.rng.choice(["Hall", "Loft", "Gardens", "Center", "House"])} {venue_pk}',
+                'description': 'Flexible event space with on-site coordination.',
+                'venue_type': self.rng.choice(VENUE_TYPES),
+                'address': f'{self.rng.randint(1, 9999)} Main St',
+                'city': city,
+                'country': 'USA',
+                'latitude': round(lat + self.rng.uniform(-0.3, 0.3), 6),
+                'longitude': round(lng + self.rng.uniform(-0.3, 0.3), 6),
+                'capacity_min': max(10, capacity_max // 10),
+                'capacity_max': capacity_max,
+                'hourly_rate': round(self.rng.uniform(100, 2000), 2),
+                'daily_rate': round(self.rng.uniform(1000, 20000), 2),
+                'currency': 'USD',
+                'amenities': self.rng.sample(AMENITIES, self.rng.randint(2, 7)),
+                'average_rating': round(min(5.0, max(1.0, self.rng.gauss(4.3, 0.4))), 1),
+                'total_reviews': int(self.rng.expovariate(1 / 30)),
+                'is_active': self.rng.random() < 0.97,
+                'created_at': self.now - timedelta(days=self.rng.randint(1, 1500))
+            }
+            # Core inserts bypass the ORM listener that derives it
+            row['amenity_mask'] = amenity_mask(row['amenities'])
+            yield row
+
+    def events(self):
+        self.event_starts = []
+        for event_pk in range(1, self.counts['events'] + 1):
+            start = self.now + timedelta(days=self.rng.randint(-365, 365), hours=self.rng.randint(8, 20))
+            self.event_starts.append(start)
+            created = min(start, self.now) - timedelta(days=self.rng.randint(1, 180))
+            attendees = self.rng.choice([20, 50, 100, 150, 250, 500, 1000, 2500])
+            yield {
+                'id': event_pk,
+                'event_id': f'evt_{event_pk:012d}',
+                # Round-robin so every organizer has events
+                'organizer_id': (event_pk - 1) % self.counts['organizers'] + 1,
+                'title': f'{self.rng.choice(ADJECTIVES)} {self.rng.choice(EVENT_TYPES).replace("_", " ").title()} {event_pk}',
+                'description': 'Generated for load testing.',
+                'event_type': self.rng.choice(EVENT_TYPES),
+                'category': self.rng.choice(['business', 'personal', 'community']),
+                'status': _weighted(self.rng, EVENT_STATUSES),
+                'start_date': start,
+                'end_date': start + timedelta(hours=self.rng.randint(2, 72)),
+                'timezone': 'America/Los_Angeles',
+                'expected_attendees': attendees,
+                'max_capacity': int(attendees * 1.2),
+                'total_budget': round(attendees * self.rng.uniform(50, 400), 2),
+                'currency': 'USD',
+                'visibility': self.rng.choice(['public', 'private', 'unlisted']),
+                'created_at': created,
+                'updated_at': created
+            }
+
+    def bookings(self):
+        n = self.counts
+        for booking_pk in range(1, n['bookings'] + 1):
+            event_pk = self.rng.randint(1, n['events'])
+            start = self.event_starts[event_pk - 1]
+            use_venue = self.rng.random() < 0.2
+            status = _weighted(self.rng, BOOKING_STATUSES)
+            quoted = round(self.rng.lognormvariate(7.5, 0.8), 2) if status != 'inquiry' else None
+            final = round(quoted * self.rng.uniform(0.9, 1.05), 2) if quoted and status in ('confirmed', 'completed') else None
+            created = start - timedelta(days=self.rng.randint(1, 200), minutes=self.rng.randint(0, 1440))
+            yield {
+                'id': booking_pk,
+                'booking_id': f'bkg_{booking_pk:012d}',
+                'event_id': event_pk,
+                'vendor_id': None if use_venue else self.rng.randint(1, n['vendors']),
+                'venue_id': self.rng.randint(1, n['venues']) if use_venue else None,
+                'service_name': 'Venue rental' if use_venue else 'Service package',
+                'service_details': {'hours': self.rng.randint(2, 12), 'notes': 'generated'},
+                'status': status,
+                'service_date': start,
+                'start_time': start,
+                'end_time': start + timedelta(hours=self.rng.randint(2, 10)),
+                'quoted_price': quoted,
+                'final_price': final,
+                'currency': 'USD',
+                'message': 'Looking forward to working with you.',
+                'created_at': created,
+                'updated_at': created + timedelta(days=self.rng.randint(0, 30))
+            }
+
+# Insert order respects foreign keys
+TABLES = [
+    (User, 'users'),
+    (UserPreferences, 'user_preferences'),
+    (BusinessProfile, 'business_profiles'),
+    (Vendor, 'vendors'),
+    (Venue, 'venues'),
+    (Event, 'events'),
+    (Booking, 'bookings')
+]
+
+def _bulk_pragmas(engine):
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=OFF')
+        cursor.execute('PRAGMA cache_size=-262144')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.close()
+
+def generate_table(engine, model, rows):
+    """Insert rows into model's table in BATCH_SIZE executemany batches; returns the row count"""
+    table = model.__table__
+    total = 0
+    with engine.begin() as connection:
+        while True:
+            batch = [row for _, row in zip(range(BATCH_SIZE), rows)]
+            if not batch:
+                break
+            connection.execute(table.insert(), batch)
+            total += len(batch)
+    return total
+
+def generate(database_url, scale=1.0, seed=42, reset=False, progress=None):
+    """Populate database_url; returns {table: rows inserted}"""
+    engine = create_engine(database_url)
+    _bulk_pragmas(engine)
+    if reset:
+        db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+
+    generator = _Generator(scale, seed, datetime.utcnow().replace(microsecond=0))
+    inserted = {}
+    for model, method in TABLES:
+        started = time.perf_counter()
+        total = generate_table(engine, model, getattr(generator, method)())
+        inserted[model.__tablename__] = total
+        if progress:
+            progress(f'{model.__tablename__:<20} {total:>10,} rows  {time.perf_counter() - started:6.1f}s')
+
+    ensure_indexes(engine)
+    with engine.begin() as connection:
+        if engine.dialect.name == 'postgresql':
+            # Explicit ids leave the serial sequences behind; move them past the data
+            for model, _ in TABLES:
+                table = model.__table__.name
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+                ))
+        connection.execute(text('ANALYZE'))
+    engine.dispose()
+    return inserted
@@ -0,0 +1,249 @@
+"""Closed-loop load runner and its JSON report.
+
+Each worker thread logs in as one organizer, then repeatedly picks a
+scenario from the mix and runs it, with no think time. Requests go either
+through the Flask test client in this process, or over keep-alive HTTP to a
+running server (--url). The in-process mode shares one GIL, so it measures
+per-request cost rather than throughput; use --url against a multi-worker
+server, or --processes, for concurrency numbers.
+
+Samples taken during the warmup are dropped. The report holds per-route
+counts, error counts, throughput and latency percentiles, together with the
+git commit and settings, so two runs can be compared.
+"""
+import json
+import math
+import multiprocessing
+import os
+import platform
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, text
+from .scenarios import MIXES, Context, HttpClient, InProcessClient, login, new_rng, picker
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Ids sampled from the database for scenarios to pick from
+ID_SAMPLE = 2000
+
+def load_dataset(database_url, organizers):
+    """Organizers with their event ids, plus vendor and venue ids, read straight from the database"""
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(text(
+                'SELECT u.id, u.email FROM users u '
+                "WHERE u.role = 'event_manager' AND u.is_active "
+                'AND EXISTS (SELECT 1 FROM events e WHERE e.organizer_id = u.id) '
+                'ORDER BY u.id LIMIT :limit'
+            ), {'limit': organizers}).all()
+            accounts = []
+            for user_pk, email in rows:
+                event_ids = connection.execute(
+                    text('SELECT event_id FROM events WHERE organizer_id = :pk'), {'pk': user_pk}
+                ).scalars().all()
+                accounts.append({'email': email, 'event_ids': event_ids})
+            vendor_ids = connection.execute(
+                text('SELECT vendor_id FROM vendors WHERE is_active ORDER BY random() LIMIT :limit'),
+                {'limit': ID_SAMPLE}
+            ).scalars().all()
+            venue_ids = connection.execute(
+                text('SELECT venue_id FROM venues WHERE is_active ORDER BY random() LIMIT :limit'),
+                {'limit': ID_SAMPLE}
+            ).scalars().all()
+    finally:
+        engine.dispose()
+    if not accounts or not vendor_ids or not venue_ids:
+        raise RuntimeError(f'{database_url} has no load-test data; run the generate command first')
+    return accounts, vendor_ids, venue_ids
+
+def _client_factory(options):
+    if options['url']:
+        return lambda: HttpClient(options['url'])
+    from src.main import create_app
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': options['database_url'],
+        'QUERY_PROFILER_ENABLED': False
+    })
+    return lambda: InProcessClient(app)
+
+def _worker(worker, options, client, ctx, started, results):
+    """Run scenarios until the deadline or request limit; samples go to results[worker]"""
+    samples = results[worker] = []
+    measure_from = started + options['warmup']
+    deadline = measure_from + options['duration'] if options['duration'] else None
+    limit = options['requests']
+    next_scenario = picker(MIXES[options['mix']], ctx.rng)
+
+    def call(label, method, path, body=None):
+        start = time.perf_counter()
+        try:
+            status, _ = client.request(method, path, body, ctx.headers)
+        except Exception:
+            status = 599
+        if start >= measure_from:
+            samples.append((label, status, time.perf_counter() - start))
+
+    while True:
+        now = time.perf_counter()
+        if deadline is not None and now >= deadline:
+            break
+        if limit is not None and len(samples) >= limit:
+            break
+        next_scenario()(call, ctx)
+
+def run_process(options, process_index=0):
+    """Run options['concurrency'] worker threads; returns (samples, measured seconds)"""
+    accounts, vendor_ids, venue_ids = load_dataset(options['database_url'], options['organizers'])
+    new_client = _client_factory(options)
+    login_client = new_client()
+    threads, results = [], {}
+    contexts = []
+    for idx in range(options['concurrency']):
+        worker = process_index * options['concurrency'] + idx
+        account = accounts[worker % len(accounts)]
+        if 'token' not in account:
+            account['token'] = login(login_client, account['email'])
+        rng = new_rng(options['seed'], worker)
+        contexts.append((worker, Context(rng, account, vendor_ids, venue_ids)))
+
+    started = time.perf_counter()
+    for worker, ctx in contexts:
+        thread = threading.Thread(target=_worker, args=(worker, options, new_client(), ctx, started, results),
+                                  daemon=True)
+        threads.append(thread)
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started - options['warmup']
+    return [sample for worker in sorted(results) for sample in results[worker]], max(elapsed, 1e-9)
+
+def _run_child(args):
+    return run_process(*args)
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def _summarize(samples, seconds):
+    latencies = sorted(sample[2] * 1000 for sample in samples)
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(1 for _, status, _ in samples if status >= 500)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'statuses': dict(sorted(statuses.items())),
+        'rps': round(len(samples) / seconds, 2),
+        'latencyMs': {
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+            'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'max': round(latencies[-1], 3) if latencies else 0.0
+        }
+    }
+
+def _git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BACKEND_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(database_url, url=None, mix='default', concurrency=8, processes=1, duration=30.0, requests=None,
+        warmup=2.0, organizers=50, seed=1):
+    """Run a load test and return the report dict"""
+    if mix not in MIXES:
+        raise ValueError(f'Unknown mix {mix!r}; choose from {", ".join(MIXES)}')
+    options = {
+        'database_url': database_url,
+        'url': url,
+        'mix': mix,
+        'concurrency': concurrency,
+        'duration': duration if requests is None else None,
+        'requests': requests,
+        'warmup': warmup,
+        'organizers': organizers,
+        'seed': seed
+    }
+    if processes > 1:
+        with multiprocessing.get_context('spawn').Pool(processes) as pool:
+            outcomes = pool.map(_run_child, [(options, idx) for idx in range(processes)])
+    else:
+        outcomes = [run_process(options)]
+    samples = [sample for process_samples, _ in outcomes for sample in process_samples]
+    seconds = max(elapsed for _, elapsed in outcomes)
+
+    by_route = {}
+    for sample in samples:
+        by_route.setdefault(sample[0], []).append(sample)
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'startedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'mode': 'http' if url else 'in-process',
+            'target': url or database_url,
+            'mix': mix,
+            'concurrency': concurrency,
+            'processes': processes,
+            'duration': round(seconds, 3),
+            'warmup': warmup,
+            'seed': seed
+        },
+        'total': _summarize(samples, seconds),
+        'routes': {route: _summarize(route_samples, seconds) for route, route_samples in sorted(by_route.items())}
+    }
+
+def format_report(report):
+    meta = report['meta']
+    lines = [
+        f"{meta['mode']} {meta['target']}  mix={meta['mix']}  workers={meta['concurrency']}x{meta['processes']}  "
+        f"{meta['duration']:.1f}s  commit={meta['commit']}",
+        f"{'route':<42}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}   (ms)"
+    ]
+    rows = list(report['routes'].items()) + [('TOTAL', report['total'])]
+    for route, stats in rows:
+        latency = stats['latencyMs']
+        lines.append(f"{route:<42}{stats['requests']:>8}{stats['errors']:>6}{stats['rps']:>9.1f}"
+                     f"{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}{latency['max']:>9.2f}")
+    return '\n'.join(lines)
+
+def compare(baseline, candidate):
+    """Table of rps and latency percentiles for two reports, with the relative change"""
+    def change(old, new):
+        return f'{(new - old) / old * 100:+.1f}%' if old else 'n/a'
+
+    lines = [
+        f"baseline  {baseline['meta']['commit']}  {baseline['meta']['startedAt']}",
+        f"candidate {candidate['meta']['commit']}  {candidate['meta']['startedAt']}",
+        f"{'route':<42}{'metric':>8}{'baseline':>12}{'candidate':>12}{'change':>10}"
+    ]
+    routes = sorted(set(baseline['routes']) | set(candidate['routes'])) + ['TOTAL']
+    for route in routes:
+        old = baseline['total'] if route == 'TOTAL' else baseline['routes'].get(route)
+        new = candidate['total'] if route == 'TOTAL' else candidate['routes'].get(route)
+        if old is None or new is None:
+            lines.append(f"{route:<42}{'only in ' + ('candidate' if old is None else 'baseline'):>42}")
+            continue
+        metrics = [('rps', old['rps'], new['rps'])] + [
+            (name, old['latencyMs'][name], new['latencyMs'][name]) for name in ('p50', 'p95', 'p99')
+        ] + [('errors', old['errors'], new['errors'])]
+        for idx, (name, old_value, new_value) in enumerate(metrics):
+            label = route if idx == 0 else ''
+            lines.append(f'{label:<42}{name:>8}{old_value:>12.2f}{new_value:>12.2f}{change(old_value, new_value):>10}')
+    return '\n'.join(lines)
+
+def save_report(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
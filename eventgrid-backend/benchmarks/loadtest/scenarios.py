@@ -0,0 +1,164 @@
+"""API scenarios and the weighted mixes that replay them.
+
+A scenario receives call(label, method, path, body=None), which times one
+request as the worker's organizer, and the worker's Context. Requests are
+labelled with the URL rule rather than the concrete URL, so results
+aggregate per route.
+"""
+import http.client
+import json
+import random
+import uuid
+from urllib.parse import urlencode, urlsplit
+from .datagen import CATEGORIES, CITIES, PASSWORD
+
+class InProcessClient:
+    """Flask test client with the interface of HttpClient"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        status = response.status_code
+        data = response.get_data()
+        response.close()
+        return status, data
+
+class HttpClient:
+    """Keep-alive HTTP/1.1 connection to a running server"""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.connection = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection; reconnect once
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+class Context:
+    """What a worker knows about the dataset: a logged-in organizer and ids to use"""
+
+    def __init__(self, rng, organizer, vendor_ids, venue_ids):
+        self.rng = rng
+        self.headers = {'Authorization': f"Bearer {organizer['token']}"}
+        self.event_ids = organizer['event_ids']
+        self.vendor_ids = vendor_ids
+        self.venue_ids = venue_ids
+
+    def event_id(self):
+        return self.rng.choice(self.event_ids)
+
+def login(client, email):
+    status, body = client.request('POST', '/api/auth/login', {'email': email, 'password': PASSWORD})
+    if status != 200:
+        raise RuntimeError(f'Login failed for {email}: {status} {body[:200]!r}')
+    return json.loads(body)['data']['tokens']['accessToken']
+
+def vendor_search(call, ctx):
+    params = {'limit': 20}
+    roll = ctx.rng.random()
+    if roll < 0.5:
+        params['category'] = ctx.rng.choice(CATEGORIES)[0]
+    elif roll < 0.7:
+        params['query'] = ctx.rng.choice(['photo', 'catering', 'wedding', 'music'])
+    if ctx.rng.random() < 0.3:
+        params['location'] = ctx.rng.choice(CITIES)[0]
+    if ctx.rng.random() < 0.3:
+        params['sort'] = ctx.rng.choice(['price_asc', 'newest', 'name_asc'])
+    call('GET /api/marketplace/vendors', 'GET', '/api/marketplace/vendors?' + urlencode(params))
+
+def vendor_detail(call, ctx):
+    vendor_id = ctx.rng.choice(ctx.vendor_ids)
+    call('GET /api/marketplace/vendors/<id>', 'GET', f'/api/marketplace/vendors/{vendor_id}')
+
+def featured(call, ctx):
+    call('GET /api/marketplace/featured', 'GET', '/api/marketplace/featured')
+
+def categories(call, ctx):
+    call('GET /api/marketplace/categories', 'GET', '/api/marketplace/categories')
+
+def organizer_dashboard(call, ctx):
+    """What the organizer home page loads: upcoming events and recent bookings"""
+    call('GET /api/events', 'GET', '/api/events?limit=20')
+    call('GET /api/bookings', 'GET', '/api/bookings?limit=20')
+
+def event_detail(call, ctx):
+    call('GET /api/events/<id>', 'GET', f'/api/events/{ctx.event_id()}')
+
+def live_dashboard(call, ctx):
+    call('GET /api/live/events/<id>/dashboard', 'GET', f'/api/live/events/{ctx.event_id()}/dashboard')
+
+def booking_create(call, ctx):
+    body = {
+        'eventId': ctx.event_id(),
+        'serviceDetails': {'serviceName': 'Load test package', 'specifications': {'hours': 4}},
+        'message': 'Generated by the load test'
+    }
+    if ctx.rng.random() < 0.2:
+        body['venueId'] = ctx.rng.choice(ctx.venue_ids)
+    else:
+        body['vendorId'] = ctx.rng.choice(ctx.vendor_ids)
+    call('POST /api/bookings', 'POST', '/api/bookings', body)
+
+def checkin(call, ctx):
+    body = {'guestId': f'gst_{uuid.uuid4().hex[:12]}', 'checkinMethod': 'qr_code'}
+    call('POST /api/live/events/<id>/checkin', 'POST', f'/api/live/events/{ctx.event_id()}/checkin', body)
+
+def payment_history(call, ctx):
+    call('GET /api/payments/history', 'GET', '/api/payments/history')
+
+SCENARIOS = {
+    'vendor_search': vendor_search,
+    'vendor_detail': vendor_detail,
+    'featured': featured,
+    'categories': categories,
+    'dashboard': organizer_dashboard,
+    'event_detail': event_detail,
+    'live_dashboard': live_dashboard,
+    'booking_create': booking_create,
+    'checkin': checkin,
+    'payment_history': payment_history
+}
+
+# Relative weights per scenario
+MIXES = {
+    'default': {
+        'vendor_search': 30, 'vendor_detail': 15, 'featured': 5, 'categories': 5, 'dashboard': 15,
+        'event_detail': 10, 'payment_history': 5, 'booking_create': 5, 'checkin': 10
+    },
+    'read_only': {
+        'vendor_search': 40, 'vendor_detail': 20, 'featured': 10, 'categories': 5, 'dashboard': 15, 'event_detail': 10
+    },
+    'checkin_storm': {'checkin': 90, 'live_dashboard': 10},
+    'booking_rush': {'booking_create': 60, 'dashboard': 25, 'event_detail': 15}
+}
+
+def picker(mix, rng):
+    """Callable returning the next scenario function for a weighted mix"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    functions = [SCENARIOS[name] for name in names]
+    return lambda: rng.choices(functions, weights=weights)[0]
+
+def new_rng(seed, worker):
+    return random.Random(f'{seed}:{worker}')
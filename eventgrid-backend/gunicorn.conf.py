@@ -0,0 +1,56 @@
+"""Production server settings, run from eventgrid-backend/:
+
+    gunicorn -c gunicorn.conf.py src.main:app
+
+Every setting can be overridden from the environment:
+
+    WEB_CONCURRENCY       worker processes (default: CPU count)
+    GUNICORN_THREADS      threads per worker (default 4)
+    GUNICORN_KEEPALIVE    seconds an idle keep-alive connection is held (default 5)
+    GUNICORN_MAX_REQUESTS requests before a worker is recycled, 0 = never (default 2000)
+    GUNICORN_TIMEOUT      seconds a silent worker gets before it is killed (default 30)
+    GUNICORN_GRACEFUL_TIMEOUT  seconds to drain in-flight requests on SIGTERM / HUP (default 30)
+    PORT / GUNICORN_BIND  listen address (default 0.0.0.0:5000)
+
+The app is imported once in the master (preload_app) and the workers are
+forked from it, so route modules, the static manifest and the serializers are
+built once and shared copy-on-write. src.utils.workers resets the database
+pool, locks and caches in each child after the fork.
+
+Requests are mostly waiting on SQLite and JSON encoding, so the gthread worker
+is used, and threads > 1 lets one worker overlap them. Several processes are
+needed to use several cores. benchmarks/bench_workers.py compares settings on
+the load-test route mix.
+"""
+import multiprocessing
+import os
+
+# Production engine profile (WAL, busy timeout, pool sizes) unless overridden.
+# With preload_app the import cost is paid once in the master, so route
+# modules are imported up front instead of on first request.
+os.environ.setdefault('DB_PROFILE', 'production')
+os.environ.setdefault('LAZY_ROUTE_MODULES', 'false')
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+# Spread recycling out so the workers do not all restart at once
+max_requests_jitter = max_requests // 10
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+preload_app = True
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+def post_fork(server, worker):
+    # The fork hooks registered by create_app() have already run; this only logs
+    server.log.info('Worker %s forked (threads=%s, max_requests=%s)', worker.pid, threads, max_requests)
+
+def worker_exit(server, worker):
+    """Runs after the worker has finished its in-flight requests"""
+    from src.main import app
+    from src.utils.workers import shutdown
+    shutdown(app)
@@ -0,0 +1,236 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+import click
+from src.models.user import User, Vendor, Event, BusinessProfile, UserPreferences, db
+from src.utils.compression import precompress_static
+from src.utils.leaderboard import rebuild_leaderboard
+from src.utils.migrations import backfill_amenity_masks, backfill_service_areas, ensure_indexes
+
+def init_db():
+    """Create missing tables and indexes"""
+    db.create_all()
+    return ensure_indexes()
+
+def seed_sample_data():
+    """Seed some sample data for testing; returns False if users already exist"""
+    # Check if we already have data
+    if User.query.count() > 0:
+        return False
+
+    # Create sample users
+    # Event Manager
+    user1_id = f"usr_{uuid.uuid4().hex[:12]}"
+    user1 = User(
+        user_id=user1_id,
+        email="sarah.chen@example.com",
+        first_name="Sarah",
+        last_name="Chen",
+        role="event_manager"
+    )
+    user1.set_password("password123")
+    db.session.add(user1)
+    db.session.flush()
+    
+    # User preferences
+    prefs1 = UserPreferences(
+        user_id=user1.id,
+        language="en",
+        currency="USD",
+        timezone="America/Los_Angeles"
+    )
+    db.session.add(prefs1)
+    
+    # Vendor User
+    user2_id = f"usr_{uuid.uuid4().hex[:12]}"
+    user2 = User(
+        user_id=user2_id,
+        email="mike.photo@example.com",
+        first_name="Mike",
+        last_name="Johnson",
+        role="vendor"
+    )
+    user2.set_password("password123")
+    db.session.add(user2)
+    db.session.flush()
+    
+    # Business profile for vendor
+    business2 = BusinessProfile(
+        user_id=user2.id,
+        business_name="Capture Moments Photography",
+        business_type="photography",
+        description="Professional wedding and event photography",
+        website="https://capturemoments.com",
+        phone="+1-555-0123",
+        city="San Francisco",
+        country="USA"
+    )
+    db.session.add(business2)
+    
+    # Vendor profile
+    vendor1_id = f"vnd_{uuid.uuid4().hex[:12]}"
+    vendor1 = Vendor(
+        vendor_id=vendor1_id,
+        user_id=user2.id,
+        business_name="Capture Moments Photography",
+        category="photography",
+        description="Professional wedding and event photography with 10+ years experience",
+        service_areas=["San Francisco", "Bay Area", "Napa Valley"],
+        starting_price=2500.0,
+        currency="USD",
+        average_rating=4.8,
+        total_reviews=127,
+        response_time_hours=2.5,
+        is_verified=True
+    )
+    db.session.add(vendor1)
+    
+    # Another vendor
+    user3_id = f"usr_{uuid.uuid4().hex[:12]}"
+    user3 = User(
+        user_id=user3_id,
+        email="chef.maria@example.com",
+        first_name="Maria",
+        last_name="Rodriguez",
+        role="vendor"
+    )
+    user3.set_password("password123")
+    db.session.add(user3)
+    db.session.flush()
+    
+    business3 = BusinessProfile(
+        user_id=user3.id,
+        business_name="Gourmet Catering Co",
+        business_type="catering",
+        description="Fine dining catering for special events",
+        city="San Francisco",
+        country="USA"
+    )
+    db.session.add(business3)
+    
+    vendor2_id = f"vnd_{uuid.uuid4().hex[:12]}"
+    vendor2 = Vendor(
+        vendor_id=vendor2_id,
+        user_id=user3.id,
+        business_name="Gourmet Catering Co",
+        category="catering",
+        description="Award-winning catering service specializing in contemporary cuisine",
+        service_areas=["San Francisco", "Peninsula", "East Bay"],
+        starting_price=75.0,
+        currency="USD",
+        average_rating=4.9,
+        total_reviews=89,
+        response_time_hours=4.0,
+        is_verified=True
+    )
+    db.session.add(vendor2)
+    
+    # Sample events
+    event1_id = f"evt_{uuid.uuid4().hex[:12]}"
+    event1 = Event(
+        event_id=event1_id,
+        organizer_id=user1.id,
+        title="Tech Summit 2025",
+        description="Annual technology conference featuring industry leaders",
+        event_type="conference",
+        category="technology",
+        status="planning",
+        start_date=datetime.now() + timedelta(days=90),
+        end_date=datetime.now() + timedelta(days=90, hours=8),
+        timezone="America/Los_Angeles",
+        expected_attendees=500,
+        max_capacity=600,
+        total_budget=150000.0,
+        currency="USD",
+        visibility="public"
+    )
+    db.session.add(event1)
+    
+    event2_id = f"evt_{uuid.uuid4().hex[:12]}"
+    event2 = Event(
+        event_id=event2_id,
+        organizer_id=user1.id,
+        title="Wedding - Sarah & Mike",
+        description="Beautiful outdoor wedding ceremony and reception",
+        event_type="wedding",
+        category="personal",
+        status="confirmed",
+        start_date=datetime.now() + timedelta(days=45),
+        end_date=datetime.now() + timedelta(days=45, hours=6),
+        timezone="America/Los_Angeles",
+        expected_attendees=120,
+        max_capacity=150,
+        total_budget=45000.0,
+        currency="USD",
+        visibility="private"
+    )
+    db.session.add(event2)
+    
+    db.session.commit()
+    return True
+
+def register_commands(app):
+    """Attach the database commands to the app's `flask` CLI"""
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create tables and add missing indexes."""
+        created = init_db()
+        click.echo(f"Database initialised ({len(created)} new index(es))")
+
+    @app.cli.command('seed')
+    def seed_command():
+        """Insert the sample users, vendors and events."""
+        init_db()
+        if seed_sample_data():
+            click.echo("Sample data seeded successfully!")
+        else:
+            click.echo("Database already has users; skipping seed")
+
+    @app.cli.command('backfill-service-areas')
+    def backfill_service_areas_command():
+        """Rebuild vendor_service_areas from the vendors' service_areas."""
+        init_db()
+        with db.engine.begin() as connection:
+            written = backfill_service_areas(connection)
+        click.echo(f"Wrote {written} vendor service area row(s)")
+
+    @app.cli.command('backfill-amenity-masks')
+    def backfill_amenity_masks_command():
+        """Recompute the venues' amenity bitmasks from their amenities."""
+        init_db()
+        with db.engine.begin() as connection:
+            changed = backfill_amenity_masks(connection)
+        click.echo(f"Updated {changed} venue amenity mask(s)")
+
+    @app.cli.command('rebuild-leaderboard')
+    def rebuild_leaderboard_command():
+        """Recompute the featured-vendor leaderboards from vendors."""
+        init_db()
+        with db.engine.begin() as connection:
+            written = rebuild_leaderboard(connection)
+        click.echo(f"Wrote {written} leaderboard entries")
+
+    @app.cli.command('compress-static')
+    @click.option('--min-size', default=1024, show_default=True, help='Skip files smaller than this many bytes.')
+    def compress_static_command(min_size):
+        """Build .gz (and .br) siblings for the files in the static folder."""
+        written = precompress_static(app.static_folder, min_size=min_size)
+        for path in written:
+            click.echo(os.path.relpath(path, app.static_folder))
+        click.echo(f"Wrote {len(written)} precompressed file(s)")
+
+    @app.cli.command('static-manifest')
+    def static_manifest_command():
+        """Rebuild and list the static file manifest, and signal running workers to rebuild theirs."""
+        manifest = app.extensions['static_manifest']
+        stamped = manifest.touch_stamp()
+        for name, entry in sorted(manifest.reload().items()):
+            cache = 'immutable' if entry.immutable else 'revalidate'
+            memory = 'memory' if entry.file.data is not None else 'disk'
+            encodings = ','.join(sorted(entry.variants)) or '-'
+            click.echo(f"{name:<40} {entry.file.size:>10} {cache:<10} {memory:<6} {encodings}")
+        if stamped:
+            click.echo(f"Touched {manifest.stamp_path}; running workers reload within {manifest.stamp_interval:g}s")
+        else:
+            click.echo('STATIC_RELOAD_STAMP is not set: restart the server for running workers to pick up the changes')
@@ -3,232 +3,176 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from datetime import datetime
+from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from src.models.user import db
 from src.routes.auth import auth_bp
 from src.routes.events import events_bp
 from src.routes.marketplace import marketplace_bp
 from src.routes.bookings import bookings_bp
 from src.routes.payments import payments_bp
-from src.routes.ai import ai_bp
-from src.routes.ar import ar_bp
-from src.routes.live import live_bp
-
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-
-# Configuration
-app.config['SECRET_KEY'] = 'eventgrid_secret_key_2025'
-app.config['JWT_SECRET_KEY'] = 'eventgrid_jwt_secret_key_2025'
-
-# Enable CORS for all routes
-CORS(app, origins="*")
-
-# Initialize JWT
-jwt = JWTManager(app)
-
-# Register blueprints
-app.register_blueprint(auth_bp, url_prefix='/api')
-app.register_blueprint(events_bp, url_prefix='/api')
-app.register_blueprint(marketplace_bp, url_prefix='/api')
-app.register_blueprint(bookings_bp, url_prefix='/api')
-app.register_blueprint(payments_bp, url_prefix='/api')
-app.register_blueprint(ai_bp, url_prefix='/api')
-app.register_blueprint(ar_bp, url_prefix='/api')
-app.register_blueprint(live_bp, url_prefix='/api')
-
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-
-# Create tables and seed data
-with app.app_context():
-    db.create_all()
-    
-    # Seed some sample data for testing
-    from src.models.user import User, Vendor, Event, BusinessProfile, UserPreferences
-    import uuid
-    from datetime import datetime, timedelta
-    
-    # Check if we already have data
-    if User.query.count() == 0:
-        # Create sample users
-        # Event Manager
-        user1_id = f"usr_{uuid.uuid4().hex[:12]}"
-        user1 = User(
-            user_id=user1_id,
-            email="sarah.chen@example.com",
-            first_name="Sarah",
-            last_name="Chen",
-            role="event_manager"
-        )
-        user1.set_password("password123")
-        db.session.add(user1)
-        db.session.flush()
-        
-        # User preferences
-        prefs1 = UserPreferences(
-            user_id=user1.id,
-            language="en",
-            currency="USD",
-            timezone="America/Los_Angeles"
-        )
-        db.session.add(prefs1)
-        
-        # Vendor User
-        user2_id = f"usr_{uuid.uuid4().hex[:12]}"
-        user2 = User(
-            user_id=user2_id,
-            email="mike.photo@example.com",
-            first_name="Mike",
-            last_name="Johnson",
-            role="vendor"
-        )
-        user2.set_password("password123")
-        db.session.add(user2)
-        db.session.flush()
-        
-        # Business profile for vendor
-        business2 = BusinessProfile(
-            user_id=user2.id,
-            business_name="Capture Moments Photography",
-            business_type="photography",
-            description="Professional wedding and event photography",
-            website="https://capturemoments.com",
-            phone="+1-555-0123",
-            city="San Francisco",
-            country="USA"
-        )
-        db.session.add(business2)
-        
-        # Vendor profile
-        vendor1_id = f"vnd_{uuid.uuid4().hex[:12]}"
-        vendor1 = Vendor(
-            vendor_id=vendor1_id,
-            user_id=user2.id,
-            business_name="Capture Moments Photography",
-            category="photography",
-            description="Professional wedding and event photography with 10+ years experience",
-            service_areas=["San Francisco", "Bay Area", "Napa Valley"],
-            starting_price=2500.0,
-            currency="USD",
-            average_rating=4.8,
-            total_reviews=127,
-            response_time_hours=2.5,
-            is_verified=True
-        )
-        db.session.add(vendor1)
-        
-        # Another vendor
-        user3_id = f"usr_{uuid.uuid4().hex[:12]}"
-        user3 = User(
-            user_id=user3_id,
-            email="chef.maria@example.com",
-            first_name="Maria",
-            last_name="Rodriguez",
-            role="vendor"
-        )
-        user3.set_password("password123")
-        db.session.add(user3)
-        db.session.flush()
-        
-        business3 = BusinessProfile(
-            user_id=user3.id,
-            business_name="Gourmet Catering Co",
-            business_type="catering",
-            description="Fine dining catering for special events",
-            city="San Francisco",
-            country="USA"
-        )
-        db.session.add(business3)
-        
-        vendor2_id = f"vnd_{uuid.uuid4().hex[:12]}"
-        vendor2 = Vendor(
-            vendor_id=vendor2_id,
-            user_id=user3.id,
-            business_name="Gourmet Catering Co",
-            category="catering",
-            description="Award-winning catering service specializing in contemporary cuisine",
-            service_areas=["San Francisco", "Peninsula", "East Bay"],
-            starting_price=75.0,
-            currency="USD",
-            average_rating=4.9,
-            total_reviews=89,
-            response_time_hours=4.0,
-            is_verified=True
-        )
-        db.session.add(vendor2)
-        
-        # Sample events
-        event1_id = f"evt_{uuid.uuid4().hex[:12]}"
-        event1 = Event(
-            event_id=event1_id,
-            organizer_id=user1.id,
-            title="Tech Summit 2025",
-            description="Annual technology conference featuring industry leaders",
-            event_type="conference",
-            category="technology",
-            status="planning",
-            start_date=datetime.now() + timedelta(days=90),
-            end_date=datetime.now() + timedelta(days=90, hours=8),
-            timezone="America/Los_Angeles",
-            expected_attendees=500,
-            max_capacity=600,
-            total_budget=150000.0,
-            currency="USD",
-            visibility="public"
-        )
-        db.session.add(event1)
-        
-        event2_id = f"evt_{uuid.uuid4().hex[:12]}"
-        event2 = Event(
-            event_id=event2_id,
-            organizer_id=user1.id,
-            title="Wedding - Sarah & Mike",
-            description="Beautiful outdoor wedding ceremony and reception",
-            event_type="wedding",
-            category="personal",
-            status="confirmed",
-            start_date=datetime.now() + timedelta(days=45),
-            end_date=datetime.now() + timedelta(days=45, hours=6),
-            timezone="America/Los_Angeles",
-            expected_attendees=120,
-            max_capacity=150,
-            total_budget=45000.0,
-            currency="USD",
-            visibility="private"
-        )
-        db.session.add(event2)
-        
-        db.session.commit()
-        print("Sample data seeded successfully!")
-
-# Health check endpoint
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    return {
-        'status': 'healthy',
-        'service': 'EventGrid API',
-        'version': '1.0.0',
-        'timestamp': datetime.utcnow().isoformat()
-    }
-
-# Serve static files (for frontend)
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-        return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
+from src.routes.venues import venues_bp
+from src.cli import init_db, register_commands, seed_sample_data
+from src.utils.compression import init_compression
+from src.utils.current_user import init_user_cache, user_cache
+from src.utils.database import configure_database
+from src.utils.facets import facet_cache, init_facet_cache
+from src.utils.geo import init_venue_search
+from src.utils.json_provider import FastJSONProvider
+from src.utils.lazy_views import register_lazy_routes
+from src.utils.metrics import init_metrics
+from src.utils.read_replica import STICKY_HEADER, init_read_replica
+from src.utils.query_profiler import init_query_profiler
+from src.utils.static_files import init_static_manifest
+from src.utils.vendor_details import init_vendor_detail_cache, vendor_detail_cache
+from src.utils.workers import init_worker_hooks
+
+# The AI, AR and live routes see little traffic, so their modules are only
+# imported when one of them is first requested. Endpoint names match the
+# blueprints, so url_for('ai.ai_event_designer') works either way.
+LAZY_ROUTES = [
+    ('/ai/event-designer', 'src.routes.ai:ai_event_designer', 'ai.ai_event_designer', ['POST']),
+    ('/ai/vendor-recommendations', 'src.routes.ai:ai_vendor_recommendations', 'ai.ai_vendor_recommendations', ['POST']),
+    ('/ai/schedule-optimizer', 'src.routes.ai:ai_schedule_optimizer', 'ai.ai_schedule_optimizer', ['POST']),
+    ('/ar/venues/<venue_id>/ar-data', 'src.routes.ar:get_venue_ar_data', 'ar.get_venue_ar_data', ['GET']),
+    ('/ar/venues/<venue_id>/layout-preview', 'src.routes.ar:generate_layout_preview', 'ar.generate_layout_preview', ['POST']),
+    ('/ar/venues/<venue_id>/virtual-tour', 'src.routes.ar:get_virtual_tour_data', 'ar.get_virtual_tour_data', ['GET']),
+    ('/ar/capacity-optimizer', 'src.routes.ar:optimize_capacity', 'ar.optimize_capacity', ['POST']),
+    ('/live/events/<event_id>/dashboard', 'src.routes.live:get_live_dashboard', 'live.get_live_dashboard', ['GET']),
+    ('/live/events/<event_id>/checkin', 'src.routes.live:process_checkin', 'live.process_checkin', ['POST']),
+    ('/live/events/<event_id>/vendors/status', 'src.routes.live:get_vendor_status', 'live.get_vendor_status', ['GET']),
+    ('/live/events/<event_id>/alerts', 'src.routes.live:create_alert', 'live.create_alert', ['POST']),
+    ('/live/events/<event_id>/controls', 'src.routes.live:control_smart_devices', 'live.control_smart_devices', ['POST'])
+]
+
+def create_app(config=None):
+    """Build the Flask app; does no database I/O (see `flask init-db` / `flask seed`)"""
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.json = FastJSONProvider(app)
+
+    # Configuration
+    app.config['SECRET_KEY'] = 'eventgrid_secret_key_2025'
+    app.config['JWT_SECRET_KEY'] = 'eventgrid_jwt_secret_key_2025'
+    app.config['JSON_COMPACT'] = os.getenv('JSON_COMPACT', 'true').lower() == 'true'
+    app.config['LAZY_ROUTE_MODULES'] = os.getenv('LAZY_ROUTE_MODULES', 'true').lower() == 'true'
+
+    # Database configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
+        'DATABASE_URL', f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+    )
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['DB_PROFILE'] = os.getenv('DB_PROFILE', 'development')
+
+    # Optional read replica for GET requests (see src.utils.read_replica)
+    if os.getenv('DATABASE_REPLICA_URL'):
+        app.config['SQLALCHEMY_BINDS'] = {'replica': os.getenv('DATABASE_REPLICA_URL')}
+    app.config['DB_REPLICA_BLUEPRINTS'] = tuple(
+        os.getenv('DB_REPLICA_BLUEPRINTS', 'marketplace,events,bookings,venues').split(',')
+    )
+    app.config['DB_READ_YOUR_WRITES_SECONDS'] = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 5))
+
+    # Authenticated user cache
+    app.config['USER_CACHE_SIZE'] = int(os.getenv('USER_CACHE_SIZE', 2048))
+    app.config['USER_CACHE_TTL'] = float(os.getenv('USER_CACHE_TTL', 60))
+
+    # Response compression (per-route levels via src.utils.compression.compression)
+    app.config['COMPRESS_ENABLED'] = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    app.config['COMPRESS_GZIP_LEVEL'] = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    app.config['COMPRESS_BROTLI_QUALITY'] = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+
+    # Static files: small files are held in memory, assets/ is immutable
+    app.config['STATIC_MEMORY_LIMIT'] = int(os.getenv('STATIC_MEMORY_LIMIT', 256 * 1024))
+    app.config['STATIC_RELOAD_INTERVAL'] = float(os.getenv('STATIC_RELOAD_INTERVAL', 0))
+    # Touched by `flask static-manifest`; running workers rebuild their manifest when it changes
+    if os.getenv('STATIC_RELOAD_STAMP'):
+        app.config['STATIC_RELOAD_STAMP'] = os.getenv('STATIC_RELOAD_STAMP')
+    app.config['STATIC_STAMP_INTERVAL'] = float(os.getenv('STATIC_STAMP_INTERVAL', 2))
+
+    # Request/SQL metrics at /api/metrics and in the Server-Timing header
+    app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    app.config['METRICS_SERVER_TIMING'] = os.getenv('METRICS_SERVER_TIMING', 'true').lower() == 'true'
+    # /api/metrics is only served with a scrape token, sent as "Authorization: Bearer <token>"
+    app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')
+
+    # Vendor search through the SQLite FTS5 index when it exists (src.utils.fulltext)
+    app.config['VENDOR_SEARCH_FTS'] = os.getenv('VENDOR_SEARCH_FTS', 'true').lower() == 'true'
+
+    # Venue geo search through the SQLite R*Tree, else an in-process grid rebuilt every VENUE_GRID_TTL seconds
+    app.config['VENUE_SEARCH_RTREE'] = os.getenv('VENUE_SEARCH_RTREE', 'true').lower() == 'true'
+    app.config['VENUE_GRID_TTL'] = float(os.getenv('VENUE_GRID_TTL', 300))
+
+    # Opt-in SQL profiler (N+1 groups, slow query plans, per-request report)
+    app.config['QUERY_PROFILER_ENABLED'] = os.getenv('QUERY_PROFILER_ENABLED', 'false').lower() == 'true'
+    app.config['QUERY_PROFILER_SLOW_MS'] = float(os.getenv('QUERY_PROFILER_SLOW_MS', 100))
+    if os.getenv('QUERY_PROFILER_LOG'):
+        app.config['QUERY_PROFILER_LOG'] = os.getenv('QUERY_PROFILER_LOG')
+
+    if config:
+        app.config.from_mapping(config)
+
+    # Enable CORS for all routes; cross-origin clients read the read-your-writes deadline to echo it back
+    CORS(app, origins="*", expose_headers=[STICKY_HEADER])
+
+    # Initialize JWT
+    JWTManager(app)
+
+    # Register blueprints
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(events_bp, url_prefix='/api')
+    app.register_blueprint(marketplace_bp, url_prefix='/api')
+    app.register_blueprint(bookings_bp, url_prefix='/api')
+    app.register_blueprint(payments_bp, url_prefix='/api')
+    app.register_blueprint(venues_bp, url_prefix='/api')
+    if app.config['LAZY_ROUTE_MODULES']:
+        register_lazy_routes(app, LAZY_ROUTES, url_prefix='/api')
     else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
+        from src.routes.ai import ai_bp
+        from src.routes.ar import ar_bp
+        from src.routes.live import live_bp
+        app.register_blueprint(ai_bp, url_prefix='/api')
+        app.register_blueprint(ar_bp, url_prefix='/api')
+        app.register_blueprint(live_bp, url_prefix='/api')
+
+    configure_database(app)
+    init_read_replica(app)
+    init_user_cache(app)
+    init_facet_cache(app)
+    init_vendor_detail_cache(app)
+    init_venue_search(app)
+    init_compression(app)
+    init_metrics(app)
+    init_query_profiler(app)
+    static_manifest = init_static_manifest(app)
+    init_worker_hooks(app)
+    register_commands(app)
+
+    # Health check endpoint
+    @app.route('/api/health', methods=['GET'])
+    def health_check():
+        return {
+            'status': 'healthy',
+            'service': 'EventGrid API',
+            'version': '1.0.0',
+            'timestamp': datetime.utcnow().isoformat(),
+            'caches': {
+                'users': user_cache.stats(),
+                'facets': facet_cache.stats(),
+                'vendorDetails': vendor_detail_cache.stats()
+            }
+        }
+
+    # Serve static files (for frontend) from the manifest built at startup
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        if app.static_folder is None:
+            return "Static folder not configured", 404
+
+        entry = static_manifest.lookup(path)
+        if entry is not None:
+            return static_manifest.send(entry)
         else:
             return {
                 'message': 'EventGrid API is running',
@@ -238,6 +182,8 @@ def serve(path):
                     '/api/auth/login',
                     '/api/events',
                     '/api/marketplace/vendors',
+                    '/api/venues',
+                    '/api/venues/search',
                     '/api/bookings',
                     '/api/payments/create-payment-intent',
                     '/api/ai/event-designer',
@@ -245,6 +191,15 @@ def serve(path):
                 ]
             }
 
+    return app
+
+# Used by WSGI servers and `flask --app src.main`
+app = create_app()
+
 if __name__ == '__main__':
+    with app.app_context():
+        init_db()
+        if seed_sample_data():
+            print("Sample data seeded successfully!")
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
     app.run(host='0.0.0.0', port=5000, debug=True)
-
@@ -0,0 +1,154 @@
+"""Read-only fast path for list endpoints.
+
+Building ORM instances (identity map, attribute instrumentation) costs more
+than the SQL for list pages. These helpers narrow a model query to plain
+column tuples and turn each row straight into the same dict shape the model's
+to_dict() returns, generated from the same spec, so responses stay
+byte-for-byte identical.
+"""
+from sqlalchemy.orm import aliased
+from src.models.serializers import BOOKING_SPEC, EVENT_SPEC, VENDOR_SPEC, VENUE_SPEC, compile_serializer
+from src.models.user import Booking, BusinessProfile, Event, User, Vendor, Venue
+
+_Organizer = aliased(User, name='organizer')
+
+EVENT_COLUMNS = (
+    Event.id,
+    Event.event_id,
+    _Organizer.user_id.label('organizer_user_id'),
+    Event.title,
+    Event.description,
+    Event.event_type,
+    Event.category,
+    Event.start_date,
+    Event.end_date,
+    Event.timezone,
+    Event.expected_attendees,
+    Event.max_capacity,
+    Event.total_budget,
+    Event.currency,
+    Event.status,
+    Event.visibility,
+    Event.created_at,
+    Event.updated_at
+)
+
+VENDOR_COLUMNS = (
+    Vendor.id,
+    Vendor.vendor_id,
+    Vendor.business_name,
+    Vendor.description,
+    Vendor.category,
+    Vendor.service_areas,
+    Vendor.average_rating,
+    Vendor.total_reviews,
+    Vendor.starting_price,
+    Vendor.currency,
+    Vendor.response_time_hours,
+    Vendor.is_verified,
+    Vendor.is_active,
+    Vendor.created_at
+)
+
+# Vendor plus the owner's business profile contact fields, for the detail view
+VENDOR_DETAIL_COLUMNS = VENDOR_COLUMNS + (
+    BusinessProfile.id.label('profile_id'),
+    BusinessProfile.website.label('profile_website'),
+    BusinessProfile.phone.label('profile_phone'),
+    BusinessProfile.address.label('profile_address')
+)
+
+VENUE_COLUMNS = (
+    Venue.id,
+    Venue.venue_id,
+    Venue.name,
+    Venue.description,
+    Venue.venue_type,
+    Venue.address,
+    Venue.city,
+    Venue.country,
+    Venue.latitude,
+    Venue.longitude,
+    Venue.capacity_min,
+    Venue.capacity_max,
+    Venue.hourly_rate,
+    Venue.daily_rate,
+    Venue.currency,
+    Venue.amenities,
+    Venue.average_rating,
+    Venue.total_reviews,
+    Venue.is_active
+)
+
+BOOKING_COLUMNS = (
+    Booking.id,
+    Booking.booking_id,
+    Event.event_id.label('event_public_id'),
+    Vendor.vendor_id.label('vendor_public_id'),
+    Venue.venue_id.label('venue_public_id'),
+    Booking.service_name,
+    Booking.service_details,
+    Booking.service_date,
+    Booking.start_time,
+    Booking.end_time,
+    Booking.quoted_price,
+    Booking.final_price,
+    Booking.currency,
+    Booking.status,
+    Booking.message,
+    Booking.created_at,
+    Booking.updated_at
+)
+
+def event_rows(query):
+    """Narrow an Event query to the columns event_row_to_dict needs"""
+    return query.outerjoin(_Organizer, Event.organizer_id == _Organizer.id).with_entities(*EVENT_COLUMNS)
+
+def vendor_rows(query):
+    """Narrow a Vendor query to the columns vendor_row_to_dict needs"""
+    return query.with_entities(*VENDOR_COLUMNS)
+
+def vendor_detail_rows(query):
+    """Vendor, owning user and business profile in one query (outer joins, like the lazy loads they replace)"""
+    return query.outerjoin(User, Vendor.user_id == User.id) \
+        .outerjoin(BusinessProfile, BusinessProfile.user_id == User.id) \
+        .with_entities(*VENDOR_DETAIL_COLUMNS)
+
+def venue_rows(query):
+    """Narrow a Venue query to the columns venue_row_to_dict needs"""
+    return query.with_entities(*VENUE_COLUMNS)
+
+def booking_rows(query):
+    """Narrow a Booking query that already joins Event to plain columns"""
+    return query.outerjoin(Vendor, Booking.vendor_id == Vendor.id) \
+        .outerjoin(Venue, Booking.venue_id == Venue.id) \
+        .with_entities(*BOOKING_COLUMNS)
+
+# Datetimes are left for FastJSONProvider to format, which it does natively;
+# the encoded output matches to_dict()'s isoformat() strings.
+event_row_to_dict = compile_serializer(
+    'event_row_to_dict', EVENT_SPEC,
+    overrides={'organizerId': 'organizer_user_id'},
+    native_datetimes=True
+)
+
+vendor_row_to_dict = compile_serializer('vendor_row_to_dict', VENDOR_SPEC, native_datetimes=True)
+
+venue_row_to_dict = compile_serializer('venue_row_to_dict', VENUE_SPEC)
+
+booking_row_to_dict = compile_serializer(
+    'booking_row_to_dict', BOOKING_SPEC,
+    overrides={'eventId': 'event_public_id', 'vendorId': 'vendor_public_id', 'venueId': 'venue_public_id'},
+    native_datetimes=True
+)
+
+def vendor_detail_row_to_dict(row):
+    """get_vendor_details' shape: to_dict() plus the profile's website, phone and address"""
+    data = vendor_row_to_dict(row)
+    if row.profile_id is not None:
+        data['businessProfile'].update({
+            'website': row.profile_website,
+            'phone': row.profile_phone,
+            'address': row.profile_address
+        })
+    return data
@@ -0,0 +1,221 @@
+"""Serializers generated once at import time from declarative specs.
+
+A spec is a nested dict whose leaves describe where each value comes from.
+compile_serializer() turns it into the source of a single function returning
+one dict literal, so serializing a row costs a handful of attribute reads and
+no per-call dispatch. The same spec serves ORM instances and the column rows
+from src.models.rows, since both expose values as attributes.
+
+Leaves:
+    'column'                  obj.column
+    Iso('column')             obj.column.isoformat() if obj.column else None
+    Default('column', [])     obj.column or []
+    Ref('relation', 'column') obj.relation.column if obj.relation else None
+    When(('a', 'b'), {...})   {...} if obj.a and obj.b else None
+"""
+
+class Iso:
+    __slots__ = ('attr',)
+
+    def __init__(self, attr):
+        self.attr = attr
+
+class Default:
+    __slots__ = ('attr', 'default')
+
+    def __init__(self, attr, default):
+        self.attr = attr
+        self.default = default
+
+class Ref:
+    __slots__ = ('relation', 'attr')
+
+    def __init__(self, relation, attr):
+        self.relation = relation
+        self.attr = attr
+
+class When:
+    __slots__ = ('attrs', 'spec')
+
+    def __init__(self, attrs, spec):
+        self.attrs = attrs
+        self.spec = spec
+
+def _expression(leaf, native_datetimes):
+    if isinstance(leaf, dict):
+        items = ', '.join(f'{key!r}: {_expression(value, native_datetimes)}' for key, value in leaf.items())
+        return '{' + items + '}'
+    if isinstance(leaf, str):
+        return f'obj.{leaf}'
+    if isinstance(leaf, Iso):
+        if native_datetimes:
+            # Left as datetime for the JSON provider to format natively
+            return f'obj.{leaf.attr}'
+        return f'(_v.isoformat() if (_v := obj.{leaf.attr}) else None)'
+    if isinstance(leaf, Default):
+        return f'(obj.{leaf.attr} or {leaf.default!r})'
+    if isinstance(leaf, Ref):
+        return f'(_r.{leaf.attr} if (_r := obj.{leaf.relation}) else None)'
+    if isinstance(leaf, When):
+        condition = ' and '.join(f'obj.{attr}' for attr in leaf.attrs)
+        return f'({_expression(leaf.spec, native_datetimes)} if {condition} else None)'
+    raise TypeError(f'Unsupported serializer leaf: {leaf!r}')
+
+def compile_serializer(name, spec, overrides=None, native_datetimes=False):
+    """Generate a function mapping an object with attributes to spec's dict shape
+
+    overrides replaces top-level spec entries, e.g. to read a labelled column
+    instead of following a relationship. With native_datetimes the datetime
+    values are returned as-is, which is only correct when the response goes
+    through src.utils.json_provider.FastJSONProvider.
+    """
+    if overrides:
+        spec = {key: overrides.get(key, value) for key, value in spec.items()}
+    source = f'def {name}(obj):\n    return {_expression(spec, native_datetimes)}\n'
+    namespace = {}
+    exec(compile(source, f'<serializer {name}>', 'exec'), namespace)
+    function = namespace[name]
+    function.__doc__ = f'Generated serializer for {name}'
+    function.source = source
+    return function
+
+USER_SPEC = {
+    'userId': 'user_id',
+    'email': 'email',
+    'profile': {
+        'firstName': 'first_name',
+        'lastName': 'last_name',
+        'avatar': 'avatar'
+    },
+    'role': 'role',
+    'isVerified': 'is_verified',
+    'isActive': 'is_active',
+    'createdAt': Iso('created_at'),
+    'updatedAt': Iso('updated_at')
+}
+
+BUSINESS_PROFILE_SPEC = {
+    'businessName': 'business_name',
+    'businessType': 'business_type',
+    'description': 'description',
+    'website': 'website',
+    'phone': 'phone',
+    'address': 'address',
+    'city': 'city',
+    'country': 'country'
+}
+
+USER_PREFERENCES_SPEC = {
+    'language': 'language',
+    'currency': 'currency',
+    'timezone': 'timezone',
+    'notifications': {
+        'email': 'notifications_email',
+        'sms': 'notifications_sms'
+    }
+}
+
+EVENT_SPEC = {
+    'eventId': 'event_id',
+    'organizerId': Ref('organizer', 'user_id'),
+    'basicInfo': {
+        'title': 'title',
+        'description': 'description',
+        'type': 'event_type',
+        'category': 'category'
+    },
+    'schedule': {
+        'startDate': Iso('start_date'),
+        'endDate': Iso('end_date'),
+        'timezone': 'timezone'
+    },
+    'attendees': {
+        'expectedCount': 'expected_attendees',
+        'capacity': 'max_capacity'
+    },
+    'budget': {
+        'totalBudget': 'total_budget',
+        'currency': 'currency'
+    },
+    'status': 'status',
+    'visibility': 'visibility',
+    'createdAt': Iso('created_at'),
+    'updatedAt': Iso('updated_at')
+}
+
+VENDOR_SPEC = {
+    'vendorId': 'vendor_id',
+    'businessProfile': {
+        'businessName': 'business_name',
+        'description': 'description',
+        'category': 'category',
+        'serviceAreas': Default('service_areas', [])
+    },
+    'ratings': {
+        'averageRating': 'average_rating',
+        'totalReviews': 'total_reviews'
+    },
+    'pricing': {
+        'startingPrice': 'starting_price',
+        'currency': 'currency'
+    },
+    'responseTime': 'response_time_hours',
+    'isVerified': 'is_verified',
+    'isActive': 'is_active'
+}
+
+VENUE_SPEC = {
+    'venueId': 'venue_id',
+    'name': 'name',
+    'description': 'description',
+    'type': 'venue_type',
+    'location': {
+        'address': 'address',
+        'city': 'city',
+        'country': 'country',
+        'coordinates': When(('latitude', 'longitude'), {
+            'latitude': 'latitude',
+            'longitude': 'longitude'
+        })
+    },
+    'capacity': {
+        'min': 'capacity_min',
+        'max': 'capacity_max'
+    },
+    'pricing': {
+        'hourlyRate': 'hourly_rate',
+        'dailyRate': 'daily_rate',
+        'currency': 'currency'
+    },
+    'amenities': Default('amenities', []),
+    'ratings': {
+        'averageRating': 'average_rating',
+        'totalReviews': 'total_reviews'
+    },
+    'isActive': 'is_active'
+}
+
+BOOKING_SPEC = {
+    'bookingId': 'booking_id',
+    'eventId': Ref('event', 'event_id'),
+    'vendorId': Ref('vendor', 'vendor_id'),
+    'venueId': Ref('venue', 'venue_id'),
+    'serviceDetails': {
+        'serviceName': 'service_name',
+        'specifications': Default('service_details', {})
+    },
+    'schedule': {
+        'serviceDate': Iso('service_date'),
+        'startTime': Iso('start_time'),
+        'endTime': Iso('end_time')
+    },
+    'pricing': {
+        'quotedPrice': 'quoted_price',
+        'finalPrice': 'final_price',
+        'currency': 'currency'
+    },
+    'status': 'status',
+    'message': 'message',
+    'createdAt': Iso('created_at'),
+    'updatedAt': Iso('updated_at')
+}
@@ -1,8 +1,28 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
+from src.models.serializers import (BOOKING_SPEC, BUSINESS_PROFILE_SPEC, EVENT_SPEC, USER_PREFERENCES_SPEC,
+                                    USER_SPEC, VENDOR_SPEC, VENUE_SPEC, compile_serializer)
+from src.utils.amenities import amenity_mask
+from src.utils.locations import normalize_areas
+from src.utils.read_replica import RoutingSession
 import hashlib
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# JSON text on SQLite; JSONB on PostgreSQL
+JSONList = db.JSON().with_variant(JSONB(), 'postgresql')
+
+# Trigram operator classes for the ILIKE search indexes
+event.listen(db.metadata, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
+
+def postgresql_index(name, *columns, **kwargs):
+    """Index created only on PostgreSQL (GIN, trigram); SQLite skips it"""
+    return db.Index(name, *columns, **kwargs).ddl_if(dialect='postgresql')
+
+def trigram_index(name, column_name):
+    return postgresql_index(name, column_name, postgresql_using='gin', postgresql_ops={column_name: 'gin_trgm_ops'})
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -33,21 +53,7 @@ class User(db.Model):
         """Check if the provided password matches the stored hash"""
         return hashlib.sha256(password.encode('utf-8')).hexdigest() == self.password_hash
     
-    def to_dict(self):
-        return {
-            'userId': self.user_id,
-            'email': self.email,
-            'profile': {
-                'firstName': self.first_name,
-                'lastName': self.last_name,
-                'avatar': self.avatar
-            },
-            'role': self.role,
-            'isVerified': self.is_verified,
-            'isActive': self.is_active,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    to_dict = compile_serializer('user_to_dict', USER_SPEC)
 
 class BusinessProfile(db.Model):
     __tablename__ = 'business_profiles'
@@ -64,17 +70,11 @@ class BusinessProfile(db.Model):
     country = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'businessName': self.business_name,
-            'businessType': self.business_type,
-            'description': self.description,
-            'website': self.website,
-            'phone': self.phone,
-            'address': self.address,
-            'city': self.city,
-            'country': self.country
-        }
+    __table_args__ = (
+        db.Index('ix_business_profiles_user_id', user_id),
+    )
+
+    to_dict = compile_serializer('business_profile_to_dict', BUSINESS_PROFILE_SPEC)
 
 class UserPreferences(db.Model):
     __tablename__ = 'user_preferences'
@@ -88,16 +88,11 @@ class UserPreferences(db.Model):
     notifications_sms = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'language': self.language,
-            'currency': self.currency,
-            'timezone': self.timezone,
-            'notifications': {
-                'email': self.notifications_email,
-                'sms': self.notifications_sms
-            }
-        }
+    __table_args__ = (
+        db.Index('ix_user_preferences_user_id', user_id),
+    )
+
+    to_dict = compile_serializer('user_preferences_to_dict', USER_PREFERENCES_SPEC)
 
 class Event(db.Model):
     __tablename__ = 'events'
@@ -121,34 +116,13 @@ class Event(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'eventId': self.event_id,
-            'organizerId': self.organizer.user_id if self.organizer else None,
-            'basicInfo': {
-                'title': self.title,
-                'description': self.description,
-                'type': self.event_type,
-                'category': self.category
-            },
-            'schedule': {
-                'startDate': self.start_date.isoformat() if self.start_date else None,
-                'endDate': self.end_date.isoformat() if self.end_date else None,
-                'timezone': self.timezone
-            },
-            'attendees': {
-                'expectedCount': self.expected_attendees,
-                'capacity': self.max_capacity
-            },
-            'budget': {
-                'totalBudget': self.total_budget,
-                'currency': self.currency
-            },
-            'status': self.status,
-            'visibility': self.visibility,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    __table_args__ = (
+        # get_events: organizer's events newest first, optionally by status
+        db.Index('ix_events_organizer_start', organizer_id, start_date.desc()),
+        db.Index('ix_events_organizer_status_start', organizer_id, status, start_date.desc()),
+    )
+
+    to_dict = compile_serializer('event_to_dict', EVENT_SPEC)
 
 class Vendor(db.Model):
     __tablename__ = 'vendors'
@@ -159,7 +133,7 @@ class Vendor(db.Model):
     business_name = db.Column(db.String(100), nullable=False)
     category = db.Column(db.String(50), nullable=False)  # photography, catering, music, etc.
     description = db.Column(db.Text, nullable=True)
-    service_areas = db.Column(db.JSON, nullable=True)  # List of cities/regions served
+    service_areas = db.Column(JSONList, nullable=True)  # List of cities/regions served
     starting_price = db.Column(db.Float, nullable=True)
     currency = db.Column(db.String(10), default='USD')
     average_rating = db.Column(db.Float, default=0.0)
@@ -169,27 +143,78 @@ class Vendor(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'vendorId': self.vendor_id,
-            'businessProfile': {
-                'businessName': self.business_name,
-                'description': self.description,
-                'category': self.category,
-                'serviceAreas': self.service_areas or []
-            },
-            'ratings': {
-                'averageRating': self.average_rating,
-                'totalReviews': self.total_reviews
-            },
-            'pricing': {
-                'startingPrice': self.starting_price,
-                'currency': self.currency
-            },
-            'responseTime': self.response_time_hours,
-            'isVerified': self.is_verified,
-            'isActive': self.is_active
-        }
+    __table_args__ = (
+        # search_vendors with a category filter, sorted by rating
+        db.Index('ix_vendors_active_category_rating', is_active, category, average_rating),
+        # search_vendors without a category and get_featured_vendors
+        db.Index('ix_vendors_active_rating_reviews', is_active, average_rating, total_reviews),
+        db.Index('ix_vendors_user_id', user_id),
+        # PostgreSQL: the name/description/category ILIKE search
+        trigram_index('ix_vendors_business_name_trgm', 'business_name'),
+        trigram_index('ix_vendors_description_trgm', 'description'),
+        trigram_index('ix_vendors_category_trgm', 'category'),
+    )
+
+    to_dict = compile_serializer('vendor_to_dict', VENDOR_SPEC)
+
+class VendorServiceArea(db.Model):
+    """One row per canonical service area of a vendor (see src.utils.locations)
+
+    Vendor.service_areas stays the source of truth and what the API returns;
+    this table is derived from it on every ORM insert or update of a vendor,
+    and rebuilt by `flask backfill-service-areas`.
+    """
+    __tablename__ = 'vendor_service_areas'
+
+    vendor_id = db.Column(db.Integer, db.ForeignKey('vendors.id', ondelete='CASCADE'), primary_key=True)
+    area_normalized = db.Column(db.String(100), primary_key=True)
+
+    __table_args__ = (
+        # search_vendors location filter: area -> vendor ids without touching vendors
+        db.Index('ix_vendor_service_areas_area', area_normalized, vendor_id),
+    )
+
+def service_area_rows(vendor_id, areas):
+    return [{'vendor_id': vendor_id, 'area_normalized': area} for area in normalize_areas(areas)]
+
+@event.listens_for(Vendor, 'after_insert')
+@event.listens_for(Vendor, 'after_update')
+def _sync_service_areas(mapper, connection, target):
+    """Rewrite the vendor's vendor_service_areas rows in the flush that changes service_areas"""
+    if not db.inspect(target).attrs.service_areas.history.has_changes():
+        return
+    table = VendorServiceArea.__table__
+    connection.execute(table.delete().where(table.c.vendor_id == target.id))
+    rows = service_area_rows(target.id, target.service_areas)
+    if rows:
+        connection.execute(table.insert(), rows)
+
+@event.listens_for(Vendor, 'after_delete')
+def _delete_service_areas(mapper, connection, target):
+    # SQLite only enforces ON DELETE CASCADE with PRAGMA foreign_keys=ON
+    table = VendorServiceArea.__table__
+    connection.execute(table.delete().where(table.c.vendor_id == target.id))
+
+class VendorLeaderboardEntry(db.Model):
+    """A vendor on a featured leaderboard (see src.utils.leaderboard)
+
+    Each scope ('all', 'category:<name>', 'area:<canonical area>') holds its
+    best LEADERBOARD_SIZE featured vendors, with the sort key copied from
+    vendors so a read is one index range scan.
+    """
+    __tablename__ = 'vendor_leaderboard'
+
+    scope = db.Column(db.String(120), primary_key=True)
+    vendor_id = db.Column(db.Integer, db.ForeignKey('vendors.id', ondelete='CASCADE'), primary_key=True)
+    average_rating = db.Column(db.Float, nullable=False)
+    total_reviews = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        # get_featured_vendors: top k of one scope in leaderboard order
+        db.Index('ix_vendor_leaderboard_scope_rank', scope, average_rating.desc(), total_reviews.desc(), vendor_id),
+        # a vendor's scopes, when its rating, reviews, category or areas change
+        db.Index('ix_vendor_leaderboard_vendor_id', vendor_id),
+    )
 
 class Venue(db.Model):
     __tablename__ = 'venues'
@@ -210,43 +235,28 @@ class Venue(db.Model):
     hourly_rate = db.Column(db.Float, nullable=True)
     daily_rate = db.Column(db.Float, nullable=True)
     currency = db.Column(db.String(10), default='USD')
-    amenities = db.Column(db.JSON, nullable=True)  # List of amenities
+    amenities = db.Column(JSONList, nullable=True)  # List of amenities
+    # One bit per canonical amenity (see src.utils.amenities), derived from amenities
+    amenity_mask = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
     average_rating = db.Column(db.Float, default=0.0)
     total_reviews = db.Column(db.Integer, default=0)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'venueId': self.venue_id,
-            'name': self.name,
-            'description': self.description,
-            'type': self.venue_type,
-            'location': {
-                'address': self.address,
-                'city': self.city,
-                'country': self.country,
-                'coordinates': {
-                    'latitude': self.latitude,
-                    'longitude': self.longitude
-                } if self.latitude and self.longitude else None
-            },
-            'capacity': {
-                'min': self.capacity_min,
-                'max': self.capacity_max
-            },
-            'pricing': {
-                'hourlyRate': self.hourly_rate,
-                'dailyRate': self.daily_rate,
-                'currency': self.currency
-            },
-            'amenities': self.amenities or [],
-            'ratings': {
-                'averageRating': self.average_rating,
-                'totalReviews': self.total_reviews
-            },
-            'isActive': self.is_active
-        }
+    __table_args__ = (
+        db.Index('ix_venues_owner_id', owner_id),
+        # Venue filters: a capacity-led and a price-led range scan; the trailing
+        # columns let the other range and the amenity check run on the index
+        db.Index('ix_venues_active_capacity', is_active, capacity_max, capacity_min, daily_rate, amenity_mask),
+        db.Index('ix_venues_active_daily_rate', is_active, daily_rate, capacity_max, capacity_min, amenity_mask),
+    )
+
+    to_dict = compile_serializer('venue_to_dict', VENUE_SPEC)
+
+@event.listens_for(Venue, 'before_insert')
+@event.listens_for(Venue, 'before_update')
+def _sync_amenity_mask(mapper, connection, target):
+    target.amenity_mask = amenity_mask(target.amenities)
 
 class Booking(db.Model):
     __tablename__ = 'bookings'
@@ -269,34 +279,17 @@ class Booking(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # get_bookings and get_payment_history: bookings of the organizer's events
+        db.Index('ix_bookings_event_created', event_id, created_at),
+        db.Index('ix_bookings_vendor_id', vendor_id),
+        db.Index('ix_bookings_venue_id', venue_id),
+    )
+
     # Relationships
     event = db.relationship('Event', backref='bookings')
     vendor = db.relationship('Vendor', backref='bookings')
     venue = db.relationship('Venue', backref='bookings')
 
-    def to_dict(self):
-        return {
-            'bookingId': self.booking_id,
-            'eventId': self.event.event_id if self.event else None,
-            'vendorId': self.vendor.vendor_id if self.vendor else None,
-            'venueId': self.venue.venue_id if self.venue else None,
-            'serviceDetails': {
-                'serviceName': self.service_name,
-                'specifications': self.service_details or {}
-            },
-            'schedule': {
-                'serviceDate': self.service_date.isoformat() if self.service_date else None,
-                'startTime': self.start_time.isoformat() if self.start_time else None,
-                'endTime': self.end_time.isoformat() if self.end_time else None
-            },
-            'pricing': {
-                'quotedPrice': self.quoted_price,
-                'finalPrice': self.final_price,
-                'currency': self.currency
-            },
-            'status': self.status,
-            'message': self.message,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    to_dict = compile_serializer('booking_to_dict', BOOKING_SPEC)
 
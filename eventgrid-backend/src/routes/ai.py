@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.user import User, Event, db
+from flask_jwt_extended import jwt_required
+from src.models.user import Event, db
+from src.utils.current_user import load_current_user
 import json
 from datetime import datetime
 
@@ -13,8 +14,7 @@ ai_bp = Blueprint('ai', __name__)
 def ai_event_designer():
     """AI-powered event design suggestions"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -156,8 +156,7 @@ def ai_event_designer():
 def ai_vendor_recommendations():
     """AI-powered vendor recommendations based on event requirements"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -200,8 +199,7 @@ def ai_vendor_recommendations():
 def ai_schedule_optimizer():
     """AI-powered event schedule optimization"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required
 from src.models.user import User, BusinessProfile, UserPreferences, db
+from src.utils.current_user import load_current_user
 import uuid
 from datetime import timedelta
 
@@ -164,8 +165,7 @@ def login():
 @jwt_required()
 def get_current_user():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
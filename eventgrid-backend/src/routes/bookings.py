@@ -1,17 +1,31 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.user import Booking, Event, Vendor, Venue, User, db
+from flask_jwt_extended import jwt_required
+from src.models.user import Booking, Event, Vendor, Venue, db
+from src.models.rows import booking_row_to_dict, booking_rows
+from src.utils.conditional import conditional_response, is_conditional_request, make_etag, not_modified
+from src.utils.current_user import load_current_user
+from src.utils.database import commit_with_retry
+from src.utils.pagination import InvalidCursorError, cursor_pagination, keyset_paginate
+from sqlalchemy.orm import contains_eager, joinedload
 import uuid
 from datetime import datetime
 
 bookings_bp = Blueprint('bookings', __name__)
 
+def organizer_bookings_query(organizer_id, status=None, event_pk=None):
+    """Base query for GET /bookings (also EXPLAINed by src.utils.migrations.route_query_plans)"""
+    query = Booking.query.join(Event).filter(Event.organizer_id == organizer_id)
+    if status:
+        query = query.filter(Booking.status == status)
+    if event_pk:
+        query = query.filter(Booking.event_id == event_pk)
+    return query
+
 @bookings_bp.route('/bookings', methods=['GET'])
 @jwt_required()
 def get_bookings():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -26,27 +40,42 @@ def get_bookings():
         status = request.args.get('status')
         event_id = request.args.get('eventId')
         page = request.args.get('page', 1, type=int)
-        limit = min(request.args.get('limit', 20, type=int), 100)
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('includeTotal', 'false').lower() == 'true'
         
         # Build query - get bookings for user's events
-        query = Booking.query.join(Event).filter(Event.organizer_id == user.id)
-        
-        if status:
-            query = query.filter(Booking.status == status)
+        event_pk = None
         if event_id:
             event = Event.query.filter_by(event_id=event_id, organizer_id=user.id).first()
             if event:
-                query = query.filter(Booking.event_id == event.id)
+                event_pk = event.id
+        query = organizer_bookings_query(user.id, status, event_pk)
+        
+        # Cursor mode: seek on (created_at, id) instead of OFFSET
+        if cursor is not None:
+            bookings, next_cursor = keyset_paginate(
+                booking_rows(query), [(Booking.created_at, 'desc'), (Booking.id, 'desc')], limit, cursor,
+                sort_key='created_at_desc'
+            )
+            return jsonify({
+                'success': True,
+                'data': {
+                    'bookings': [booking_row_to_dict(row) for row in bookings],
+                    'pagination': cursor_pagination(query, limit, next_cursor, include_total)
+                }
+            }), 200
         
         # Paginate
-        bookings = query.order_by(Booking.created_at.desc()).paginate(
+        # Event, vendor and venue ids come from joins in the same statement
+        bookings = booking_rows(query).order_by(Booking.created_at.desc()).paginate(
             page=page, per_page=limit, error_out=False
         )
         
         return jsonify({
             'success': True,
             'data': {
-                'bookings': [booking.to_dict() for booking in bookings.items],
+                'bookings': [booking_row_to_dict(row) for row in bookings.items],
                 'pagination': {
                     'page': page,
                     'limit': limit,
@@ -56,6 +85,14 @@ def get_bookings():
             }
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'VALIDATION_ERROR',
+                'message': str(e)
+            }
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -69,8 +106,7 @@ def get_bookings():
 @jwt_required()
 def create_booking():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -192,7 +228,7 @@ def create_booking():
         )
         
         db.session.add(booking)
-        db.session.commit()
+        commit_with_retry()
         
         return jsonify({
             'success': True,
@@ -213,8 +249,7 @@ def create_booking():
 @jwt_required()
 def get_booking(booking_id):
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -225,10 +260,24 @@ def get_booking(booking_id):
                 }
             }), 404
         
-        # Get booking for user's events
-        booking = Booking.query.join(Event).filter(
+        query = Booking.query.join(Event).filter(
             Booking.booking_id == booking_id,
             Event.organizer_id == user.id
+        )
+        
+        # Revalidation only needs updated_at, so answer it before loading the row
+        if is_conditional_request():
+            validator = query.with_entities(Booking.updated_at).first()
+            if validator:
+                not_modified_response = not_modified(make_etag('booking', booking_id, validator.updated_at), validator.updated_at)
+                if not_modified_response:
+                    return not_modified_response
+        
+        # Get booking for user's events in a single joined query
+        booking = query.options(
+            contains_eager(Booking.event),
+            joinedload(Booking.vendor),
+            joinedload(Booking.venue)
         ).first()
         
         if not booking:
@@ -240,10 +289,10 @@ def get_booking(booking_id):
                 }
             }), 404
         
-        return jsonify({
+        return conditional_response(jsonify({
             'success': True,
             'data': booking.to_dict()
-        }), 200
+        }), make_etag('booking', booking.booking_id, booking.updated_at), booking.updated_at)
         
     except Exception as e:
         return jsonify({
@@ -258,8 +307,7 @@ def get_booking(booking_id):
 @jwt_required()
 def update_booking_status(booking_id):
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -316,7 +364,7 @@ def update_booking_status(booking_id):
         if 'finalPrice' in data:
             booking.final_price = data['finalPrice']
         
-        db.session.commit()
+        commit_with_retry()
         
         return jsonify({
             'success': True,
@@ -1,17 +1,30 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.user import Event, User, db
+from flask_jwt_extended import jwt_required
+from src.models.user import Event, db
+from src.models.rows import event_row_to_dict, event_rows
+from src.utils.conditional import conditional_response, is_conditional_request, make_etag, not_modified
+from src.utils.current_user import load_current_user
+from src.utils.database import commit_with_retry
+from src.utils.pagination import InvalidCursorError, cursor_pagination, keyset_paginate
 import uuid
 from datetime import datetime
 
 events_bp = Blueprint('events', __name__)
 
+def organizer_events_query(organizer_id, status=None, event_type=None):
+    """Base query for GET /events (also EXPLAINed by src.utils.migrations.route_query_plans)"""
+    query = Event.query.filter_by(organizer_id=organizer_id)
+    if status:
+        query = query.filter_by(status=status)
+    if event_type:
+        query = query.filter_by(event_type=event_type)
+    return query
+
 @events_bp.route('/events', methods=['GET'])
 @jwt_required()
 def get_events():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -24,27 +37,38 @@ def get_events():
         
         # Get query parameters
         page = request.args.get('page', 1, type=int)
-        limit = min(request.args.get('limit', 20, type=int), 100)
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('includeTotal', 'false').lower() == 'true'
         status = request.args.get('status')
         event_type = request.args.get('type')
         
         # Build query
-        query = Event.query.filter_by(organizer_id=user.id)
-        
-        if status:
-            query = query.filter_by(status=status)
-        if event_type:
-            query = query.filter_by(event_type=event_type)
+        query = organizer_events_query(user.id, status, event_type)
+        
+        # Cursor mode: seek on (start_date, id) instead of OFFSET
+        if cursor is not None:
+            events, next_cursor = keyset_paginate(
+                event_rows(query), [(Event.start_date, 'desc'), (Event.id, 'desc')], limit, cursor,
+                sort_key='start_date_desc'
+            )
+            return jsonify({
+                'success': True,
+                'data': {
+                    'events': [event_row_to_dict(row) for row in events],
+                    'pagination': cursor_pagination(query, limit, next_cursor, include_total)
+                }
+            }), 200
         
         # Paginate
-        events = query.order_by(Event.start_date.desc()).paginate(
+        events = event_rows(query).order_by(Event.start_date.desc()).paginate(
             page=page, per_page=limit, error_out=False
         )
         
         return jsonify({
             'success': True,
             'data': {
-                'events': [event.to_dict() for event in events.items],
+                'events': [event_row_to_dict(row) for row in events.items],
                 'pagination': {
                     'page': page,
                     'limit': limit,
@@ -54,6 +78,14 @@ def get_events():
             }
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'VALIDATION_ERROR',
+                'message': str(e)
+            }
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -67,8 +99,7 @@ def get_events():
 @jwt_required()
 def create_event():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -139,7 +170,7 @@ def create_event():
         )
         
         db.session.add(event)
-        db.session.commit()
+        commit_with_retry()
         
         return jsonify({
             'success': True,
@@ -160,8 +191,7 @@ def create_event():
 @jwt_required()
 def get_event(event_id):
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -172,7 +202,17 @@ def get_event(event_id):
                 }
             }), 404
         
-        event = Event.query.filter_by(event_id=event_id, organizer_id=user.id).first()
+        query = Event.query.filter_by(event_id=event_id, organizer_id=user.id)
+        
+        # Revalidation only needs updated_at, so answer it before loading the row
+        if is_conditional_request():
+            validator = query.with_entities(Event.updated_at).first()
+            if validator:
+                not_modified_response = not_modified(make_etag('event', event_id, validator.updated_at), validator.updated_at)
+                if not_modified_response:
+                    return not_modified_response
+        
+        event = query.first()
         
         if not event:
             return jsonify({
@@ -183,10 +223,10 @@ def get_event(event_id):
                 }
             }), 404
         
-        return jsonify({
+        return conditional_response(jsonify({
             'success': True,
             'data': event.to_dict()
-        }), 200
+        }), make_etag('event', event.event_id, event.updated_at), event.updated_at)
         
     except Exception as e:
         return jsonify({
@@ -201,8 +241,7 @@ def get_event(event_id):
 @jwt_required()
 def update_event(event_id):
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -273,7 +312,7 @@ def update_event(event_id):
             event.status = data['status']
         
         event.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_with_retry()
         
         return jsonify({
             'success': True,
@@ -294,8 +333,7 @@ def update_event(event_id):
 @jwt_required()
 def delete_event(event_id):
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -318,7 +356,7 @@ def delete_event(event_id):
             }), 404
         
         db.session.delete(event)
-        db.session.commit()
+        commit_with_retry()
         
         return jsonify({
             'success': True,
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.user import User, Event, db
+from flask_jwt_extended import jwt_required
+from src.models.user import Event, db
+from src.utils.current_user import load_current_user
 import json
 from datetime import datetime
 import random
@@ -12,8 +13,7 @@ live_bp = Blueprint('live', __name__)
 def get_live_dashboard(event_id):
     """Get real-time dashboard data for live event"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -61,8 +61,7 @@ def get_live_dashboard(event_id):
 def process_checkin(event_id):
     """Process guest check-in"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -118,8 +117,7 @@ def process_checkin(event_id):
 def get_vendor_status(event_id):
     """Get real-time vendor arrival and setup status"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -167,8 +165,7 @@ def get_vendor_status(event_id):
 def create_alert(event_id):
     """Create emergency alert or notification"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -214,8 +211,7 @@ def create_alert(event_id):
 def control_smart_devices(event_id):
     """Control IoT/Smart devices at the event"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
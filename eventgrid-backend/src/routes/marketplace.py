@@ -1,105 +1,200 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.user import Vendor, User, db
-from sqlalchemy import or_, and_
+from flask_jwt_extended import jwt_required
+from src.models.user import Vendor, VendorLeaderboardEntry, VendorServiceArea, db
+from src.models.rows import vendor_row_to_dict, vendor_rows
+from src.utils.conditional import conditional_response
+from src.utils.dialect import dialect_name
+from src.utils.facets import category_counts, vendor_facets
+from src.utils.fulltext import VENDOR_FTS, match_expression, match_vendors, trigram_similarity, vendor_fts_ready
+from src.utils.leaderboard import LEADERBOARD_SIZE, leaderboard_order, leaderboard_scope
+from src.utils.locations import parse_locations
+from src.utils.pagination import InvalidCursorError, cursor_pagination, keyset_paginate
+from src.utils.vendor_details import load_vendor_detail, load_vendor_details
+from sqlalchemy import or_
 
 marketplace_bp = Blueprint('marketplace', __name__)
 
+# Keyset sort orders for cursor pagination; the primary key breaks ties
+VENDOR_SORT_KEYS = {
+    'rating_desc': [(Vendor.average_rating, 'desc'), (Vendor.id, 'desc')],
+    'rating_asc': [(Vendor.average_rating, 'asc'), (Vendor.id, 'asc')],
+    'price_asc': [(Vendor.starting_price, 'asc'), (Vendor.id, 'asc')],
+    'price_desc': [(Vendor.starting_price, 'desc'), (Vendor.id, 'desc')],
+    'name_asc': [(Vendor.business_name, 'asc'), (Vendor.id, 'asc')],
+    'newest': [(Vendor.created_at, 'desc'), (Vendor.id, 'desc')]
+}
+
+# Most vendors one ?ids= batch lookup may ask for
+MAX_BATCH_VENDOR_IDS = 50
+
+# BM25 rank from vendors_fts (lower is better); only valid on the FTS path
+RELEVANCE_SORT_KEY = [(VENDOR_FTS.c.rank, 'asc'), (Vendor.id, 'asc')]
+
+def vendor_search_query(query_text='', category=None, areas=(), min_rating=None):
+    """Filtered query for GET /marketplace/vendors and its FTS match expression (None off the FTS path)
+
+    Also EXPLAINed by src.utils.migrations.route_query_plans.
+    """
+    query = Vendor.query.filter_by(is_active=True)
+    
+    # Text search: the FTS5 index on SQLite, ILIKE (trigram-indexed on PostgreSQL) otherwise,
+    # and for queries without a word for FTS5 to match, such as '!!!'
+    fts_match = None
+    if query_text:
+        if vendor_fts_ready():
+            fts_match = match_expression(query_text)
+        if fts_match:
+            query = match_vendors(query, fts_match)
+        else:
+            query = query.filter(
+                or_(
+                    Vendor.business_name.ilike(f'%{query_text}%'),
+                    Vendor.description.ilike(f'%{query_text}%'),
+                    Vendor.category.ilike(f'%{query_text}%')
+                )
+            )
+    
+    # Category filter
+    if category:
+        query = query.filter(Vendor.category == category)
+    
+    # Location filter: vendors with any of the canonical areas in vendor_service_areas
+    if areas:
+        serving = db.session.query(VendorServiceArea.vendor_id) \
+            .filter(VendorServiceArea.area_normalized.in_(areas))
+        query = query.filter(Vendor.id.in_(serving))
+    
+    # Rating filter
+    if min_rating:
+        query = query.filter(Vendor.average_rating >= min_rating)
+    
+    return query, fts_match
+
+def sort_vendors(query, sort_by, query_text='', fts_match=None):
+    """ORDER BY for a page-mode vendor search"""
+    if sort_by == 'relevance' and fts_match:
+        return query.order_by(VENDOR_FTS.c.rank, Vendor.id)
+    if sort_by == 'relevance' and query_text and dialect_name() == 'postgresql':
+        return query.order_by(trigram_similarity(query_text), Vendor.id)
+    if sort_by in ('rating_desc', 'relevance'):
+        return query.order_by(Vendor.average_rating.desc())
+    if sort_by == 'rating_asc':
+        return query.order_by(Vendor.average_rating.asc())
+    if sort_by == 'price_asc':
+        return query.order_by(Vendor.starting_price.asc())
+    if sort_by == 'price_desc':
+        return query.order_by(Vendor.starting_price.desc())
+    if sort_by == 'name_asc':
+        return query.order_by(Vendor.business_name.asc())
+    return query.order_by(Vendor.created_at.desc())
+
+def featured_vendors_query(scope):
+    """Vendor rows on one leaderboard, best first (also EXPLAINed by route_query_plans)"""
+    return vendor_rows(
+        Vendor.query.join(VendorLeaderboardEntry, VendorLeaderboardEntry.vendor_id == Vendor.id)
+    ).filter(VendorLeaderboardEntry.scope == scope).order_by(*leaderboard_order())
+
 @marketplace_bp.route('/marketplace/vendors', methods=['GET'])
 @jwt_required()
 def search_vendors():
+    # ?ids=a,b,c: fetch those vendors (the comparison view) instead of searching
+    if 'ids' in request.args:
+        return get_vendors_by_ids()
     try:
         # Get query parameters
         query_text = request.args.get('query', '')
         category = request.args.get('category')
         location = request.args.get('location')
+        # ?location=SF&location=Oakland or ?location=SF,Oakland: vendors serving any of them
+        areas = parse_locations(request.args.getlist('location'))
         min_rating = request.args.get('rating', type=float)
         page = request.args.get('page', 1, type=int)
-        limit = min(request.args.get('limit', 20, type=int), 100)
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('includeTotal', 'false').lower() == 'true'
+        include_facets = request.args.get('includeFacets', 'false').lower() == 'true'
         sort_by = request.args.get('sort', 'rating_desc')
         
         # Build query
-        query = Vendor.query.filter_by(is_active=True)
-        
-        # Text search
-        if query_text:
-            query = query.filter(
-                or_(
-                    Vendor.business_name.ilike(f'%{query_text}%'),
-                    Vendor.description.ilike(f'%{query_text}%'),
-                    Vendor.category.ilike(f'%{query_text}%')
-                )
-            )
-        
-        # Category filter
-        if category:
-            query = query.filter_by(category=category)
+        query, fts_match = vendor_search_query(query_text, category, areas, min_rating)
         
-        # Location filter (simplified - search in service areas)
-        if location:
-            query = query.filter(
-                Vendor.service_areas.contains([location])
-            )
+        # Sidebar counts scoped to the filters above, before sorting and paging
+        facets = vendor_facets(query) if include_facets else None
         
-        # Rating filter
-        if min_rating:
-            query = query.filter(Vendor.average_rating >= min_rating)
-        
-        # Sorting
-        if sort_by == 'rating_desc':
-            query = query.order_by(Vendor.average_rating.desc())
-        elif sort_by == 'rating_asc':
-            query = query.order_by(Vendor.average_rating.asc())
-        elif sort_by == 'price_asc':
-            query = query.order_by(Vendor.starting_price.asc())
-        elif sort_by == 'price_desc':
-            query = query.order_by(Vendor.starting_price.desc())
-        elif sort_by == 'name_asc':
-            query = query.order_by(Vendor.business_name.asc())
+        if cursor is not None:
+            # Cursor mode: seek on the sort key plus primary key instead of OFFSET
+            if sort_by == 'relevance' and fts_match:
+                sort_key, order = 'relevance', RELEVANCE_SORT_KEY
+                rows = vendor_rows(query).add_columns(VENDOR_FTS.c.rank)
+            else:
+                if sort_by == 'relevance':
+                    sort_key = 'rating_desc'
+                else:
+                    sort_key = sort_by if sort_by in VENDOR_SORT_KEYS else 'newest'
+                order = VENDOR_SORT_KEYS[sort_key]
+                rows = vendor_rows(query)
+            vendor_items, next_cursor = keyset_paginate(rows, order, limit, cursor, sort_key=sort_key)
+            pagination = cursor_pagination(query, limit, next_cursor, include_total)
         else:
-            query = query.order_by(Vendor.created_at.desc())
-        
-        # Paginate
-        vendors = query.paginate(
-            page=page, per_page=limit, error_out=False
-        )
+            # Sorting
+            query = sort_vendors(query, sort_by, query_text, fts_match)
+            
+            # Paginate
+            vendors = vendor_rows(query).paginate(
+                page=page, per_page=limit, error_out=False
+            )
+            vendor_items = vendors.items
+            pagination = {
+                'page': page,
+                'limit': limit,
+                'total': vendors.total,
+                'totalPages': vendors.pages
+            }
         
-        # Get available categories for filters
-        available_categories = db.session.query(Vendor.category.distinct()).filter_by(is_active=True).all()
-        categories = [cat[0] for cat in available_categories if cat[0]]
+        # Get available categories for filters (cached counts, not a DISTINCT per search)
+        categories = sorted(item['name'] for item in category_counts())
         
-        return jsonify({
-            'success': True,
-            'data': {
-                'vendors': [vendor.to_dict() for vendor in vendors.items],
-                'pagination': {
-                    'page': page,
-                    'limit': limit,
-                    'total': vendors.total,
-                    'totalPages': vendors.pages
+        data = {
+            'vendors': [vendor_row_to_dict(row) for row in vendor_items],
+            'pagination': pagination,
+            'filters': {
+                'appliedFilters': {
+                    'query': query_text,
+                    'category': category,
+                    'location': location,
+                    'locations': areas,
+                    'minRating': min_rating
                 },
-                'filters': {
-                    'appliedFilters': {
-                        'query': query_text,
-                        'category': category,
-                        'location': location,
-                        'minRating': min_rating
-                    },
-                    'availableFilters': {
-                        'categories': categories,
-                        'sortOptions': [
-                            {'value': 'rating_desc', 'label': 'Highest Rated'},
-                            {'value': 'rating_asc', 'label': 'Lowest Rated'},
-                            {'value': 'price_asc', 'label': 'Price: Low to High'},
-                            {'value': 'price_desc', 'label': 'Price: High to Low'},
-                            {'value': 'name_asc', 'label': 'Name: A to Z'},
-                            {'value': 'newest', 'label': 'Newest First'}
-                        ]
-                    }
+                'availableFilters': {
+                    'categories': categories,
+                    'sortOptions': [
+                        {'value': 'relevance', 'label': 'Best Match'},
+                        {'value': 'rating_desc', 'label': 'Highest Rated'},
+                        {'value': 'rating_asc', 'label': 'Lowest Rated'},
+                        {'value': 'price_asc', 'label': 'Price: Low to High'},
+                        {'value': 'price_desc', 'label': 'Price: High to Low'},
+                        {'value': 'name_asc', 'label': 'Name: A to Z'},
+                        {'value': 'newest', 'label': 'Newest First'}
+                    ]
                 }
             }
+        }
+        if facets is not None:
+            data['facets'] = facets
+        
+        return jsonify({
+            'success': True,
+            'data': data
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'VALIDATION_ERROR',
+                'message': str(e)
+            }
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -113,9 +208,10 @@ def search_vendors():
 @jwt_required()
 def get_vendor_details(vendor_id):
     try:
-        vendor = Vendor.query.filter_by(vendor_id=vendor_id, is_active=True).first()
+        # Vendor, user and business profile in one joined query, behind a read-through cache
+        vendor_data = load_vendor_detail(vendor_id)
         
-        if not vendor:
+        if not vendor_data:
             return jsonify({
                 'success': False,
                 'error': {
@@ -124,23 +220,13 @@ def get_vendor_details(vendor_id):
                 }
             }), 404
         
-        # Get vendor's user profile for additional details
-        user = User.query.get(vendor.user_id)
-        vendor_data = vendor.to_dict()
-        
-        if user and user.business_profile:
-            vendor_data['businessProfile'].update({
-                'website': user.business_profile.website,
-                'phone': user.business_profile.phone,
-                'address': user.business_profile.address
-            })
-        
-        return jsonify({
+        # Vendors carry no modification time, so the ETag is a hash of the body
+        return conditional_response(jsonify({
             'success': True,
             'data': {
                 'vendor': vendor_data
             }
-        }), 200
+        }))
         
     except Exception as e:
         return jsonify({
@@ -151,33 +237,56 @@ def get_vendor_details(vendor_id):
             }
         }), 500
 
+def get_vendors_by_ids():
+    try:
+        vendor_ids = []
+        for vendor_id in request.args.get('ids', '').split(','):
+            vendor_id = vendor_id.strip()
+            if vendor_id and vendor_id not in vendor_ids:
+                vendor_ids.append(vendor_id)
+        
+        if not vendor_ids or len(vendor_ids) > MAX_BATCH_VENDOR_IDS:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'ids must list between 1 and {MAX_BATCH_VENDOR_IDS} vendor IDs'
+                }
+            }), 400
+        
+        # Cached vendors plus one joined query for the rest, returned in the order asked for
+        details = load_vendor_details(vendor_ids)
+        
+        return conditional_response(jsonify({
+            'success': True,
+            'data': {
+                'vendors': [details[vendor_id] for vendor_id in vendor_ids if vendor_id in details],
+                'notFound': [vendor_id for vendor_id in vendor_ids if vendor_id not in details]
+            }
+        }))
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': 'An error occurred while fetching vendors'
+            }
+        }), 500
+
 @marketplace_bp.route('/marketplace/categories', methods=['GET'])
 @jwt_required()
 def get_categories():
     try:
-        # Get all unique categories from active vendors
-        categories = db.session.query(Vendor.category.distinct()).filter_by(is_active=True).all()
-        category_list = [cat[0] for cat in categories if cat[0]]
-        
-        # Get vendor count for each category
-        category_data = []
-        for category in category_list:
-            count = Vendor.query.filter_by(category=category, is_active=True).count()
-            category_data.append({
-                'name': category,
-                'count': count,
-                'slug': category.lower().replace(' ', '_')
-            })
-        
-        # Sort by count descending
-        category_data.sort(key=lambda x: x['count'], reverse=True)
+        # Vendor count per category in one GROUP BY, cached until a vendor is written
+        category_data = category_counts()
         
-        return jsonify({
+        return conditional_response(jsonify({
             'success': True,
             'data': {
                 'categories': category_data
             }
-        }), 200
+        }))
         
     except Exception as e:
         return jsonify({
@@ -192,24 +301,30 @@ def get_categories():
 @jwt_required()
 def get_featured_vendors():
     try:
-        # Get top-rated vendors with at least 5 reviews
-        featured_vendors = Vendor.query.filter(
-            and_(
-                Vendor.is_active == True,
-                Vendor.total_reviews >= 5,
-                Vendor.average_rating >= 4.5
-            )
-        ).order_by(
-            Vendor.average_rating.desc(),
-            Vendor.total_reviews.desc()
-        ).limit(12).all()
+        category = request.args.get('category')
+        location = request.args.get('location')
+        limit = max(1, min(request.args.get('limit', 12, type=int), LEADERBOARD_SIZE))
+        if category and location:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': 'Featured vendors can be filtered by category or location, not both'
+                }
+            }), 400
         
-        return jsonify({
+        # Top-rated vendors with at least 5 reviews, read from the precomputed leaderboard
+        scope = leaderboard_scope(category, location)
+        featured_vendors = []
+        if scope:
+            featured_vendors = featured_vendors_query(scope).limit(limit).all()
+        
+        return conditional_response(jsonify({
             'success': True,
             'data': {
-                'vendors': [vendor.to_dict() for vendor in featured_vendors]
+                'vendors': [vendor_row_to_dict(row) for row in featured_vendors]
             }
-        }), 200
+        }))
         
     except Exception as e:
         return jsonify({
@@ -1,19 +1,38 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.user import User, Event, db
+from flask_jwt_extended import jwt_required
+from src.models.user import Booking, Event, db
+from src.utils.current_user import load_current_user
+from src.utils.database import commit_with_retry
+from sqlalchemy.orm import contains_eager, selectinload
 import json
+import os
 from datetime import datetime
 
 payments_bp = Blueprint('payments', __name__)
 
+def payment_history_query(organizer_id):
+    """Query for GET /payments/history (also EXPLAINed by src.utils.migrations.route_query_plans)
+
+    Event titles come from the join, vendor and venue names from one batched
+    IN query each.
+    """
+    return Booking.query.join(Event).filter(
+        Event.organizer_id == organizer_id,
+        Booking.status.in_(['confirmed', 'completed']),
+        Booking.final_price.isnot(None)
+    ).options(
+        contains_eager(Booking.event),
+        selectinload(Booking.vendor),
+        selectinload(Booking.venue)
+    ).order_by(Booking.updated_at.desc())
+
 # Mock payment service for deployment (replace with actual Stripe integration in production)
 
 @payments_bp.route('/payments/create-payment-intent', methods=['POST'])
 @jwt_required()
 def create_payment_intent():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -99,8 +118,7 @@ def create_payment_intent():
 @jwt_required()
 def confirm_payment():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -140,7 +158,7 @@ def confirm_payment():
                         booking.status = 'confirmed'
                         booking.final_price = intent.amount / 100  # Convert from cents
                         booking.updated_at = datetime.utcnow()
-                        db.session.commit()
+                        commit_with_retry()
                 
                 return jsonify({
                     'success': True,
@@ -207,7 +225,7 @@ def stripe_webhook():
                 booking.status = 'confirmed'
                 booking.final_price = payment_intent['amount'] / 100
                 booking.updated_at = datetime.utcnow()
-                db.session.commit()
+                commit_with_retry()
     
     elif event['type'] == 'payment_intent.payment_failed':
         payment_intent = event['data']['object']
@@ -219,7 +237,7 @@ def stripe_webhook():
             if booking:
                 booking.status = 'cancelled'
                 booking.updated_at = datetime.utcnow()
-                db.session.commit()
+                commit_with_retry()
     
     return jsonify({'status': 'success'}), 200
 
@@ -227,8 +245,7 @@ def stripe_webhook():
 @jwt_required()
 def get_payment_history():
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.filter_by(user_id=current_user_id).first()
+        user = load_current_user()
         
         if not user:
             return jsonify({
@@ -240,11 +257,7 @@ def get_payment_history():
             }), 404
         
         # Get confirmed bookings with payments
-        bookings = Booking.query.join(Event).filter(
-            Event.organizer_id == user.id,
-            Booking.status.in_(['confirmed', 'completed']),
-            Booking.final_price.isnot(None)
-        ).order_by(Booking.updated_at.desc()).all()
+        bookings = payment_history_query(user.id).all()
         
         payment_history = []
         for booking in bookings:
@@ -0,0 +1,212 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+from src.models.user import Venue
+from src.models.rows import venue_row_to_dict, venue_rows
+from src.utils.amenities import AMENITIES, parse_amenities
+from src.utils.facets import venue_facets
+from src.utils.geo import VenueFilters, box_center, box_width, radius_boxes, search_venues_near, split_box
+from src.utils.pagination import InvalidCursorError, cursor_pagination, keyset_paginate
+
+venues_bp = Blueprint('venues', __name__)
+
+DEFAULT_RADIUS_KM = 25.0
+MAX_RADIUS_KM = 500.0
+# about the 1000 km across of the widest radius search
+MAX_BOX_DEGREES = 10.0
+
+BOUNDS_ARGS = ('minLat', 'minLng', 'maxLat', 'maxLng')
+
+# Keyset sort orders for the venue filter's cursor pagination, each led by a column
+# of one of the filter indexes; the primary key breaks ties
+VENUE_SORT_KEYS = {
+    'price_asc': [(Venue.daily_rate, 'asc'), (Venue.id, 'asc')],
+    'price_desc': [(Venue.daily_rate, 'desc'), (Venue.id, 'desc')],
+    'capacity_asc': [(Venue.capacity_max, 'asc'), (Venue.id, 'asc')],
+    'capacity_desc': [(Venue.capacity_max, 'desc'), (Venue.id, 'desc')]
+}
+
+def _validation_error(message):
+    return jsonify({
+        'success': False,
+        'error': {
+            'code': 'VALIDATION_ERROR',
+            'message': message
+        }
+    }), 400
+
+def _venue_filters():
+    """VenueFilters from ?capacity, ?minPrice, ?maxPrice and ?amenities; (None, message) if invalid"""
+    amenities, unknown = parse_amenities(request.args.getlist('amenities'))
+    if unknown:
+        return None, f"Unknown amenities: {', '.join(unknown)} (known: {', '.join(AMENITIES)})"
+    filters = VenueFilters(
+        capacity=request.args.get('capacity', type=int),
+        min_price=request.args.get('minPrice', type=float),
+        max_price=request.args.get('maxPrice', type=float),
+        amenities=amenities
+    )
+    return filters, None
+
+def filtered_venues_query(filters):
+    """Base query for GET /venues (also EXPLAINed by src.utils.migrations.route_query_plans)"""
+    return Venue.query.filter(*filters.clauses())
+
+def _applied_filters(filters):
+    return {
+        'capacity': filters.capacity,
+        'minPrice': filters.min_price,
+        'maxPrice': filters.max_price,
+        'amenities': filters.amenities
+    }
+
+@venues_bp.route('/venues', methods=['GET'])
+@jwt_required()
+def filter_venues():
+    try:
+        # ?capacity=250&maxPrice=5000&amenities=av,parking: fits 250 guests, under 5k/day, has AV and parking
+        filters, error = _venue_filters()
+        if error:
+            return _validation_error(error)
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('includeTotal', 'false').lower() == 'true'
+        include_facets = request.args.get('includeFacets', 'false').lower() == 'true'
+        sort_by = request.args.get('sort', 'price_asc')
+        if sort_by not in VENUE_SORT_KEYS:
+            sort_by = 'price_asc'
+
+        # Range filters on the composite capacity / daily rate indexes, amenities as one bitwise check
+        query = filtered_venues_query(filters)
+
+        # Sidebar counts scoped to the filters above
+        facets = venue_facets(query) if include_facets else None
+
+        # Cursor pagination: seek on the sort key plus primary key instead of OFFSET
+        order = VENUE_SORT_KEYS[sort_by]
+        rows, next_cursor = keyset_paginate(venue_rows(query), order, limit, cursor, sort_key=sort_by)
+
+        data = {
+            'venues': [venue_row_to_dict(row) for row in rows],
+            'pagination': cursor_pagination(query, limit, next_cursor, include_total),
+            'filters': {
+                'appliedFilters': _applied_filters(filters),
+                'availableFilters': {
+                    'amenities': AMENITIES,
+                    'sortOptions': [
+                        {'value': 'price_asc', 'label': 'Price: Low to High'},
+                        {'value': 'price_desc', 'label': 'Price: High to Low'},
+                        {'value': 'capacity_asc', 'label': 'Capacity: Small to Large'},
+                        {'value': 'capacity_desc', 'label': 'Capacity: Large to Small'}
+                    ]
+                }
+            }
+        }
+        if facets is not None:
+            data['facets'] = facets
+
+        return jsonify({
+            'success': True,
+            'data': data
+        }), 200
+
+    except InvalidCursorError as e:
+        return _validation_error(str(e))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': 'An error occurred while filtering venues'
+            }
+        }), 500
+
+@venues_bp.route('/venues/search', methods=['GET'])
+@jwt_required()
+def search_venues():
+    try:
+        # Get query parameters
+        lat = request.args.get('lat', type=float)
+        lng = request.args.get('lng', type=float)
+        radius = request.args.get('radius', DEFAULT_RADIUS_KM, type=float)
+        bounds = [request.args.get(name, type=float) for name in BOUNDS_ARGS]
+        filters, error = _venue_filters()
+        if error:
+            return _validation_error(error)
+        page = max(request.args.get('page', 1, type=int), 1)
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+        # ?minLat=&minLng=&maxLat=&maxLng=: a bounding box (the map viewport); otherwise a circle around lat/lng
+        use_bounds = any(name in request.args for name in BOUNDS_ARGS)
+        if use_bounds:
+            if None in bounds:
+                return _validation_error('minLat, minLng, maxLat and maxLng are all required for a bounding box')
+            south, west, north, east = bounds
+            if not (-90 <= south <= north <= 90) or not (-180 <= west <= 180 and -180 <= east <= 180):
+                return _validation_error('Invalid bounding box')
+            if north - south > MAX_BOX_DEGREES or box_width(west, east) > MAX_BOX_DEGREES:
+                return _validation_error(f'A bounding box can span at most {MAX_BOX_DEGREES:g} degrees each way')
+            # west > east: the box crosses the antimeridian
+            boxes = split_box(south, west, north, east)
+            if lat is None or lng is None:
+                lat, lng = box_center(south, west, north, east)
+            radius_km = None
+        else:
+            if lat is None or lng is None:
+                return _validation_error('lat and lng, or a bounding box, are required')
+            if not (0 < radius <= MAX_RADIUS_KM):
+                return _validation_error(f'radius must be between 0 and {MAX_RADIUS_KM:g} km')
+            boxes = radius_boxes(lat, lng, radius)
+            radius_km = radius
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return _validation_error('Invalid coordinates')
+
+        # Spatial index for the candidates, exact haversine distance for the order
+        ranked, index = search_venues_near(lat, lng, boxes, filters, radius_km=radius_km)
+
+        # Paginate the ranked ids, then load only that page
+        total = len(ranked)
+        page_items = ranked[(page - 1) * limit:page * limit]
+        rows = {}
+        if page_items:
+            page_ids = [venue_id for venue_id, _ in page_items]
+            rows = {row.id: row for row in venue_rows(Venue.query.filter(Venue.id.in_(page_ids)))}
+        venues = []
+        for venue_id, distance in page_items:
+            row = rows.get(venue_id)
+            if row is None:
+                continue
+            venue = venue_row_to_dict(row)
+            venue['distanceKm'] = round(distance, 3)
+            venues.append(venue)
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'venues': venues,
+                'pagination': {
+                    'page': page,
+                    'limit': limit,
+                    'total': total,
+                    'totalPages': (total + limit - 1) // limit
+                },
+                'search': {
+                    'center': {'latitude': lat, 'longitude': lng},
+                    'radiusKm': radius_km,
+                    'bounds': [
+                        {'minLat': south, 'minLng': west, 'maxLat': north, 'maxLng': east}
+                        for south, west, north, east in boxes
+                    ],
+                    **_applied_filters(filters),
+                    'index': index
+                }
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': 'An error occurred while searching venues'
+            }
+        }), 500
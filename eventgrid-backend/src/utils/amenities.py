@@ -0,0 +1,80 @@
+"""Canonical venue amenities and the amenity bitmask.
+
+Venues list amenities as free text ("AV", "A/V equipment", "Wi-Fi").
+normalize_amenity() maps a name to one of AMENITIES, and each of those owns
+one bit of Venue.amenity_mask, which is recomputed from Venue.amenities on
+every ORM insert or update. "Has AV and parking" is then the single check
+amenity_mask & mask = mask, evaluated on the venue filter indexes.
+
+Bits are positions in AMENITIES: append new amenities, never reorder or
+remove them (`flask backfill-amenity-masks` recomputes every mask). Names
+outside the vocabulary stay in the amenities list but cannot be filtered on.
+"""
+import re
+import unicodedata
+
+AMENITIES = [
+    'wifi', 'parking', 'av_equipment', 'catering_kitchen', 'wheelchair_access', 'stage', 'dance_floor',
+    'outdoor_space', 'bar', 'bridal_suite', 'projector', 'climate_control'
+]
+
+AMENITY_BITS = {name: 1 << index for index, name in enumerate(AMENITIES)}
+
+# Abbreviations and alternative names -> canonical amenity
+AMENITY_ALIASES = {
+    'wi fi': 'wifi',
+    'wireless': 'wifi',
+    'internet': 'wifi',
+    'av': 'av_equipment',
+    'a v': 'av_equipment',
+    'a v equipment': 'av_equipment',
+    'audio visual': 'av_equipment',
+    'audiovisual': 'av_equipment',
+    'sound system': 'av_equipment',
+    'kitchen': 'catering_kitchen',
+    'accessible': 'wheelchair_access',
+    'wheelchair accessible': 'wheelchair_access',
+    'ada': 'wheelchair_access',
+    'outdoor': 'outdoor_space',
+    'dancefloor': 'dance_floor',
+    'bridal room': 'bridal_suite',
+    'ac': 'climate_control',
+    'air conditioning': 'climate_control'
+}
+
+def normalize_amenity(name):
+    """Canonical amenity for a name; None if it is not in AMENITIES"""
+    if not isinstance(name, str):
+        return None
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+    # "A/V", "Wi-Fi", "av_equipment" -> "a v", "wi fi", "av equipment"
+    text = ' '.join(re.findall(r'[^\W_]+', text))
+    key = text.replace(' ', '_')
+    if key in AMENITY_BITS:
+        return key
+    return AMENITY_ALIASES.get(text)
+
+def amenity_mask(names):
+    """Bitmask of the canonical amenities among names"""
+    mask = 0
+    for name in names or ():
+        key = normalize_amenity(name)
+        if key:
+            mask |= AMENITY_BITS[key]
+    return mask
+
+def parse_amenities(values):
+    """(canonical amenities, unrecognized names) from ?amenities= values, each repeated or comma-separated"""
+    amenities = []
+    unknown = []
+    for value in values:
+        for part in value.split(','):
+            if not part.strip():
+                continue
+            key = normalize_amenity(part)
+            if key is None:
+                unknown.append(part.strip())
+            elif key not in amenities:
+                amenities.append(key)
+    return amenities, unknown
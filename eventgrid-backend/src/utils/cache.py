@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# session.info key: (cache, key) pairs to drop again once the transaction commits
+_PENDING_INVALIDATIONS = 'pending_cache_invalidations'
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full"""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop a single key from the cache"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def after_fork(self):
+        """Start empty with a new lock in a forked worker; the parent's lock may have been held"""
+        self._lock = threading.Lock()
+        self.clear()
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxSize': self.maxsize,
+                'ttlSeconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _drop(cache, key):
+    if key is None:
+        cache.clear()
+    else:
+        cache.invalidate(key)
+
+def invalidate_on_commit(session, cache, key=None):
+    """Drop key (every entry if None) from cache now, and again when session commits
+
+    Until the commit, other requests still read the old row and may cache it
+    again; the second pass removes that copy.
+    """
+    _drop(cache, key)
+    if session is not None:
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).add((cache, key))
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    for cache, key in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        _drop(cache, key)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(_PENDING_INVALIDATIONS, None)
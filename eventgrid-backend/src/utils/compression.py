@@ -0,0 +1,153 @@
+"""Content-negotiated response compression.
+
+API responses larger than COMPRESS_MIN_SIZE are compressed with brotli (when
+the brotli package is installed and the client accepts it) or gzip. Levels
+come from app config and can be overridden per route:
+
+    @ar_bp.route('/ar/venues/<venue_id>/layout-preview', methods=['POST'])
+    @jwt_required()
+    @compression(brotli_quality=5)
+    def generate_layout_preview(venue_id):
+
+File responses (send_file / send_from_directory) are left alone; static
+files are served from .br / .gz siblings built by `flask compress-static`
+(see src.utils.static_files).
+"""
+import gzip
+import mimetypes
+import os
+from functools import wraps
+from flask import g, request
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is used when it is missing
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/css',
+    'text/html',
+    'text/javascript',
+    'text/plain',
+    'image/svg+xml'
+}
+
+# Encodings in order of preference with the sibling suffix used for static files
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+def available_encodings():
+    return [(name, suffix) for name, suffix in ENCODINGS if name != 'br' or brotli is not None]
+
+def compression(gzip_level=None, brotli_quality=None, min_size=None, enabled=True):
+    """Override the compression settings for one view"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g._compression = {
+                'enabled': enabled,
+                'gzip_level': gzip_level,
+                'brotli_quality': brotli_quality,
+                'min_size': min_size
+            }
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def negotiate_encoding(encodings=None):
+    """Pick the preferred encoding the client accepts, or None"""
+    accept = request.accept_encodings
+    for name, suffix in encodings or available_encodings():
+        if accept[name] > 0:
+            return name, suffix
+    return None
+
+def compress_bytes(data, encoding, gzip_level=6, brotli_quality=4):
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 keeps the output, and so any hash of it, deterministic
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+def _settings(config):
+    settings = {
+        'enabled': True,
+        'gzip_level': config['COMPRESS_GZIP_LEVEL'],
+        'brotli_quality': config['COMPRESS_BROTLI_QUALITY'],
+        'min_size': config['COMPRESS_MIN_SIZE']
+    }
+    overrides = g.get('_compression')
+    if overrides:
+        settings.update((key, value) for key, value in overrides.items() if value is not None)
+    return settings
+
+def init_compression(app):
+    """Compress eligible responses after each request"""
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config['COMPRESS_ENABLED']:
+            return response
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return response
+        if response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        settings = _settings(app.config)
+        if not settings['enabled'] or request.method == 'HEAD':
+            return response
+        data = response.get_data()
+        if len(data) < settings['min_size']:
+            return response
+        negotiated = negotiate_encoding()
+        if negotiated is None:
+            return response
+
+        encoding = negotiated[0]
+        response.set_data(compress_bytes(data, encoding, settings['gzip_level'], settings['brotli_quality']))
+        response.headers['Content-Encoding'] = encoding
+        # The encoded bytes differ from the identity body, so a strong ETag
+        # becomes weak; If-None-Match still matches it (weak comparison).
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+def precompress_static(folder, min_size=1024, gzip_level=9, brotli_quality=11):
+    """Write .gz (and .br) siblings for compressible files in folder
+
+    Files are skipped when an up-to-date sibling already exists or when the
+    compressed copy would not be smaller. Returns the paths written.
+    """
+    written = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.endswith(('.gz', '.br')):
+                continue
+            path = os.path.join(root, name)
+            if not _is_compressible(name) or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as source:
+                data = source.read()
+            for encoding, suffix in available_encodings():
+                target = path + suffix
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                compressed = compress_bytes(data, encoding, gzip_level, brotli_quality)
+                if len(compressed) >= len(data):
+                    continue
+                with open(target, 'wb') as output:
+                    output.write(compressed)
+                written.append(target)
+    return written
+
+def _is_compressible(name):
+    mimetype, _ = mimetypes.guess_type(name)
+    return mimetype in COMPRESSIBLE_MIMETYPES
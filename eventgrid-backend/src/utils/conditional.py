@@ -0,0 +1,60 @@
+"""Conditional GET support (ETag / Last-Modified / 304 Not Modified).
+
+Detail endpoints derive a strong ETag from the row's updated_at, so a client
+revalidating an unchanged resource can be answered from a one-column lookup
+without loading or serializing the row:
+
+    if is_conditional_request():
+        validator = query.with_entities(Event.updated_at).first()
+        if validator:
+            response = not_modified(make_etag('event', event_id, validator.updated_at), validator.updated_at)
+            if response:
+                return response
+
+Endpoints without a modification time hash the response body instead, which
+still saves the transfer and client-side parsing.
+"""
+import hashlib
+from datetime import datetime
+from flask import current_app, request
+from werkzeug.http import http_date, is_resource_modified
+
+# Authenticated responses may be cached by the client only, and must be
+# revalidated each time they are used.
+CACHE_CONTROL = 'private, no-cache'
+
+def make_etag(*parts):
+    """Strong ETag value for the parts that determine a representation"""
+    text = '\x1f'.join(part.isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def is_conditional_request():
+    """True if the request carries validators worth checking before a load"""
+    environ = request.environ
+    return 'HTTP_IF_NONE_MATCH' in environ or 'HTTP_IF_MODIFIED_SINCE' in environ
+
+def _set_validators(response, etag, last_modified):
+    if etag:
+        response.set_etag(etag)
+    if last_modified:
+        response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    response.vary.add('Authorization')
+
+def not_modified(etag, last_modified=None):
+    """A 304 response if the request's validators still match, else None"""
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    response = current_app.response_class(status=304)
+    _set_validators(response, etag, last_modified)
+    return response
+
+def conditional_response(response, etag=None, last_modified=None):
+    """Attach validators to a full response, turning it into a 304 on a match
+
+    Without an etag one is computed from the response body.
+    """
+    _set_validators(response, etag, last_modified)
+    if not etag:
+        response.add_etag()
+    return response.make_conditional(request)
@@ -0,0 +1,63 @@
+from contextlib import nullcontext
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached, object_session
+from src.models.user import User, db
+from src.utils.cache import TTLCache, invalidate_on_commit
+from src.utils.read_replica import may_fill_caches, pinned_to_primary, use_primary
+
+# Process-level cache of user rows keyed by the public user_id. Values are
+# plain column snapshots so they never hold on to a session. With a read
+# replica, only primary reads are cached (see src.utils.read_replica).
+user_cache = TTLCache(maxsize=2048, ttl=60.0)
+
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+def init_user_cache(app):
+    """Size the user cache from app config"""
+    app.config.setdefault('USER_CACHE_SIZE', 2048)
+    app.config.setdefault('USER_CACHE_TTL', 60.0)
+    user_cache.maxsize = app.config['USER_CACHE_SIZE']
+    user_cache.ttl = app.config['USER_CACHE_TTL']
+    user_cache.clear()
+
+def _snapshot(user):
+    return {key: getattr(user, key) for key in _USER_COLUMNS}
+
+def _attach(snapshot):
+    """Rebuild a persistent User in the current session without a SELECT"""
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+def load_user(user_id):
+    """Load a user by public user_id, going through the process-level cache"""
+    if not user_id:
+        return None
+
+    pinned = pinned_to_primary()
+    snapshot = None if pinned else user_cache.get(user_id)
+    if snapshot is not None:
+        return _attach(snapshot)
+
+    with use_primary() if pinned else nullcontext():
+        user = User.query.filter_by(user_id=user_id).first()
+    if user and may_fill_caches():
+        user_cache.set(user_id, _snapshot(user))
+    return user
+
+def load_current_user():
+    """Resolve the authenticated user once per request"""
+    if '_current_user' not in g:
+        g._current_user = load_user(get_jwt_identity())
+    return g._current_user
+
+def invalidate_user(user_id):
+    """Forget a cached user, e.g. after it was updated or deactivated"""
+    user_cache.invalidate(user_id)
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_on_write(mapper, connection, target):
+    invalidate_on_commit(object_session(target), user_cache, target.user_id)
@@ -0,0 +1,152 @@
+import random
+import time
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import OperationalError
+from src.models.user import db
+
+# Engine profiles. 'development' keeps SQLite's stock behaviour; 'production'
+# is tuned for several gunicorn workers sharing one database file.
+ENGINE_PROFILES = {
+    'development': {
+        'SQLITE_JOURNAL_MODE': None,
+        'SQLITE_SYNCHRONOUS': None,
+        'SQLITE_BUSY_TIMEOUT_MS': 5000,
+        'SQLITE_MMAP_SIZE': None,
+        'SQLITE_CACHE_SIZE_KB': None,
+        'DB_POOL_SIZE': 5,
+        'DB_MAX_OVERFLOW': 10,
+        'DB_POOL_TIMEOUT': 30,
+        'DB_COMMIT_RETRIES': 3,
+        'DB_COMMIT_RETRY_DELAY': 0.05,
+        'DB_COMMIT_RETRY_MAX_DELAY': 1.0
+    },
+    'production': {
+        'SQLITE_JOURNAL_MODE': 'WAL',
+        'SQLITE_SYNCHRONOUS': 'NORMAL',
+        'SQLITE_BUSY_TIMEOUT_MS': 5000,
+        'SQLITE_MMAP_SIZE': 256 * 1024 * 1024,
+        'SQLITE_CACHE_SIZE_KB': 64 * 1024,
+        'DB_POOL_SIZE': 10,
+        'DB_MAX_OVERFLOW': 20,
+        'DB_POOL_TIMEOUT': 30,
+        'DB_COMMIT_RETRIES': 5,
+        'DB_COMMIT_RETRY_DELAY': 0.05,
+        'DB_COMMIT_RETRY_MAX_DELAY': 1.0
+    }
+}
+
+_LOCK_MESSAGES = ('database is locked', 'database is busy', 'database table is locked')
+
+def configure_database(app, profile=None):
+    """Apply an engine profile to app config and initialise Flask-SQLAlchemy"""
+    profile = profile or app.config.get('DB_PROFILE', 'development')
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f'Unknown DB_PROFILE: {profile}')
+    app.config['DB_PROFILE'] = profile
+    for key, value in ENGINE_PROFILES[profile].items():
+        app.config.setdefault(key, value)
+
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    is_sqlite = uri.startswith('sqlite')
+    is_memory = is_sqlite and (uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in uri)
+
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    if is_sqlite:
+        connect_args = dict(options.get('connect_args', {}))
+        connect_args.setdefault('timeout', app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000.0)
+        connect_args.setdefault('check_same_thread', False)
+        options['connect_args'] = connect_args
+    if not is_memory:
+        options.setdefault('pool_size', app.config['DB_POOL_SIZE'])
+        options.setdefault('max_overflow', app.config['DB_MAX_OVERFLOW'])
+        options.setdefault('pool_timeout', app.config['DB_POOL_TIMEOUT'])
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    db.init_app(app)
+
+    with app.app_context():
+        engines = db.engines
+    set_pragmas = _sqlite_pragma_listener(app.config, is_memory)
+    for engine in engines.values():
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', set_pragmas)
+
+def _sqlite_pragma_listener(config, is_memory):
+    pragmas = [('busy_timeout', config['SQLITE_BUSY_TIMEOUT_MS'])]
+    if config['SQLITE_JOURNAL_MODE'] and not is_memory:
+        pragmas.append(('journal_mode', config['SQLITE_JOURNAL_MODE']))
+    if config['SQLITE_SYNCHRONOUS']:
+        pragmas.append(('synchronous', config['SQLITE_SYNCHRONOUS']))
+    if config['SQLITE_MMAP_SIZE'] is not None and not is_memory:
+        pragmas.append(('mmap_size', config['SQLITE_MMAP_SIZE']))
+    if config['SQLITE_CACHE_SIZE_KB'] is not None:
+        # Negative cache_size is interpreted by SQLite as KiB rather than pages
+        pragmas.append(('cache_size', -int(config['SQLITE_CACHE_SIZE_KB'])))
+    if config['DB_PROFILE'] == 'production':
+        pragmas.append(('temp_store', 'MEMORY'))
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+    return set_pragmas
+
+def is_lock_error(exc):
+    """Return True if exc is SQLite lock contention rather than a real failure"""
+    if not isinstance(exc, OperationalError):
+        return False
+    message = str(exc.orig).lower()
+    return any(text in message for text in _LOCK_MESSAGES)
+
+def _capture_changes(session):
+    """Record the unflushed unit of work so it can be replayed after a rollback"""
+    dirty = []
+    for obj in session.dirty:
+        state = inspect(obj)
+        changes = {attr.key: attr.value for attr in state.attrs if attr.history.has_changes()}
+        if changes:
+            dirty.append((obj, changes))
+    return list(session.new), dirty, list(session.deleted)
+
+def _replay_changes(session, changes):
+    new, dirty, deleted = changes
+    for obj in new:
+        session.add(obj)
+    for obj, values in dirty:
+        for key, value in values.items():
+            setattr(obj, key, value)
+    for obj in deleted:
+        session.delete(obj)
+
+def commit_with_retry(session=None, retries=None, base_delay=None, max_delay=None):
+    """Commit, retrying with jittered exponential backoff on lock contention
+
+    Pending changes are captured before each attempt and replayed after the
+    rollback, so this is safe for units of work that have not been flushed
+    yet. Returns the number of retries that were needed.
+    """
+    session = session or db.session
+    config = current_app.config
+    retries = config.get('DB_COMMIT_RETRIES', 3) if retries is None else retries
+    base_delay = config.get('DB_COMMIT_RETRY_DELAY', 0.05) if base_delay is None else base_delay
+    max_delay = config.get('DB_COMMIT_RETRY_MAX_DELAY', 1.0) if max_delay is None else max_delay
+
+    attempt = 0
+    while True:
+        changes = _capture_changes(session)
+        try:
+            session.commit()
+            return attempt
+        except OperationalError as e:
+            if not is_lock_error(e) or attempt >= retries:
+                raise
+            session.rollback()
+            _replay_changes(session, changes)
+            delay = min(max_delay, base_delay * (2 ** attempt))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+            attempt += 1
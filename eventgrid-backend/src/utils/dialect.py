@@ -0,0 +1,10 @@
+"""Helpers for query paths that differ between SQLite and PostgreSQL.
+
+SQLite stays the development default. On PostgreSQL the text search columns
+have trigram indexes (see src.models.user), which the vendor search's ILIKE
+path and relevance ordering rely on.
+"""
+from src.models.user import db
+
+def dialect_name():
+    return db.engine.dialect.name
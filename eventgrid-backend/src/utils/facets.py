@@ -0,0 +1,203 @@
+"""Marketplace facet counts for the search filter sidebar.
+
+vendor_facets() counts the vendors matched by a search query per category,
+rating bucket, price band and service area in a single statement: the
+filtered vendors are a CTE, grouped once by (category, rating bucket, price
+band) and once, joined to vendor_service_areas, by area. category_counts() is
+the cheap category-only GROUP BY behind /marketplace/categories.
+
+venue_facets() does the same for the venue filters in one GROUP BY venue_type
+pass: capacity, price and amenity counts are conditional sums in the same
+row, the amenities read off amenity_mask one bit at a time.
+
+Results are cached per statement (SQL plus parameters, so per filter
+signature). An ORM insert, update or delete of a Vendor or Venue clears the
+cache of the process that made it; other workers pick the change up when
+their entries expire after FACET_CACHE_TTL seconds. With a read replica,
+only primary reads fill the cache (see src.utils.read_replica).
+"""
+from sqlalchemy import case, event, func, literal, null, select, union_all
+from sqlalchemy.orm import object_session
+from src.models.user import Vendor, VendorServiceArea, Venue, db
+from src.utils.amenities import AMENITIES, AMENITY_BITS
+from src.utils.cache import TTLCache, invalidate_on_commit
+from src.utils.pagination import statement_key
+from src.utils.read_replica import read_through
+
+facet_cache = TTLCache(maxsize=256, ttl=300.0)
+
+# (minimum rating, label); counts are cumulative, matching ?rating=<min>
+RATING_BUCKETS = [(4.5, '4.5 & up'), (4.0, '4.0 & up'), (3.5, '3.5 & up'), (3.0, '3.0 & up')]
+
+# (minimum, maximum, label) on starting_price; minimum inclusive, maximum exclusive
+PRICE_BANDS = [
+    (None, 500, 'Under 500'),
+    (500, 1000, '500 - 1,000'),
+    (1000, 2500, '1,000 - 2,500'),
+    (2500, 5000, '2,500 - 5,000'),
+    (5000, None, '5,000+')
+]
+
+# (minimum guests, label) on capacity_max; counts are cumulative, matching ?capacity=<guests>
+CAPACITY_BUCKETS = [(50, '50+ guests'), (100, '100+ guests'), (250, '250+ guests'), (500, '500+ guests'),
+                    (1000, '1,000+ guests')]
+
+# (minimum, maximum, label) on daily_rate; minimum inclusive, maximum exclusive
+VENUE_PRICE_BANDS = [
+    (None, 2500, 'Under 2,500'),
+    (2500, 5000, '2,500 - 5,000'),
+    (5000, 10000, '5,000 - 10,000'),
+    (10000, None, '10,000+')
+]
+
+def init_facet_cache(app):
+    """Size the facet cache from app config"""
+    app.config.setdefault('FACET_CACHE_SIZE', 256)
+    app.config.setdefault('FACET_CACHE_TTL', 300.0)
+    facet_cache.maxsize = app.config['FACET_CACHE_SIZE']
+    facet_cache.ttl = app.config['FACET_CACHE_TTL']
+    facet_cache.clear()
+
+def _rating_bucket():
+    """Index into RATING_BUCKETS of the highest bucket a vendor reaches; NULL below all of them"""
+    return case(*[(Vendor.average_rating >= minimum, index) for index, (minimum, _) in enumerate(RATING_BUCKETS)])
+
+def _price_band():
+    """Index into PRICE_BANDS; NULL when the vendor has no starting price"""
+    whens = [(Vendor.starting_price < maximum, index) for index, (_, maximum, _) in enumerate(PRICE_BANDS) if maximum]
+    return case((Vendor.starting_price.is_(None), null()), *whens, else_=len(PRICE_BANDS) - 1)
+
+def _slug(name):
+    return name.lower().replace(' ', '_')
+
+def _facet_statement(query):
+    matched = query.order_by(None).with_entities(
+        Vendor.id.label('id'),
+        Vendor.category.label('category'),
+        _rating_bucket().label('rating'),
+        _price_band().label('price')
+    ).cte('facet_vendors')
+    by_vendor = select(
+        literal('vendor').label('facet'), matched.c.category.label('value'), matched.c.rating, matched.c.price,
+        func.count().label('count')
+    ).group_by(matched.c.category, matched.c.rating, matched.c.price)
+    by_area = select(
+        literal('area'), VendorServiceArea.area_normalized, null(), null(), func.count()
+    ).join_from(matched, VendorServiceArea, VendorServiceArea.vendor_id == matched.c.id) \
+        .group_by(VendorServiceArea.area_normalized)
+    return union_all(by_vendor, by_area)
+
+def _build_facets(rows):
+    total = 0
+    categories = {}
+    ratings = [0] * len(RATING_BUCKETS)
+    prices = [0] * len(PRICE_BANDS)
+    areas = []
+    for facet, value, rating, price, count in rows:
+        if facet == 'area':
+            areas.append({'name': value, 'label': value.title(), 'count': count})
+            continue
+        total += count
+        if value:
+            categories[value] = categories.get(value, 0) + count
+        if rating is not None:
+            # A vendor in the 4.5 bucket also counts towards 4.0 & up, 3.5 & up, ...
+            for index in range(int(rating), len(RATING_BUCKETS)):
+                ratings[index] += count
+        if price is not None:
+            prices[int(price)] += count
+    return {
+        'total': total,
+        'categories': sorted(
+            ({'name': name, 'count': count, 'slug': _slug(name)} for name, count in categories.items()),
+            key=lambda item: (-item['count'], item['name'])
+        ),
+        'ratings': [
+            {'min': minimum, 'label': label, 'count': count}
+            for (minimum, label), count in zip(RATING_BUCKETS, ratings)
+        ],
+        'priceBands': [
+            {'min': minimum, 'max': maximum, 'label': label, 'count': count}
+            for (minimum, maximum, label), count in zip(PRICE_BANDS, prices)
+        ],
+        'serviceAreas': sorted(areas, key=lambda item: (-item['count'], item['name']))
+    }
+
+def vendor_facets(query):
+    """Facet counts for the vendors a (filtered, unpaginated) Vendor query matches"""
+    key = ('facets',) + statement_key(query)
+    return read_through(facet_cache, key, lambda: _build_facets(db.session.execute(_facet_statement(query)).all()))
+
+def _build_category_counts():
+    rows = db.session.query(Vendor.category, func.count()) \
+        .filter(Vendor.is_active == True) \
+        .group_by(Vendor.category).all()
+    return sorted(
+        ({'name': name, 'count': count, 'slug': _slug(name)} for name, count in rows if name),
+        key=lambda item: (-item['count'], item['name'])
+    )
+
+def category_counts():
+    """Active vendors per category, most populated first"""
+    return read_through(facet_cache, ('categories',), _build_category_counts)
+
+def _count_where(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+def _venue_facet_query(query):
+    capacity = [_count_where(Venue.capacity_max >= minimum) for minimum, _ in CAPACITY_BUCKETS]
+    prices = []
+    for minimum, maximum, _ in VENUE_PRICE_BANDS:
+        bounds = [Venue.daily_rate >= minimum] if minimum is not None else [Venue.daily_rate.isnot(None)]
+        if maximum is not None:
+            bounds.append(Venue.daily_rate < maximum)
+        prices.append(_count_where(db.and_(*bounds)))
+    amenities = [_count_where(Venue.amenity_mask.op('&')(AMENITY_BITS[name]) != 0) for name in AMENITIES]
+    return query.order_by(None) \
+        .with_entities(Venue.venue_type, func.count(), *capacity, *prices, *amenities) \
+        .group_by(Venue.venue_type)
+
+def _build_venue_facets(rows):
+    total = 0
+    types = []
+    # capacity buckets, then price bands, then amenities, as in _venue_facet_query
+    sums = [0] * (len(CAPACITY_BUCKETS) + len(VENUE_PRICE_BANDS) + len(AMENITIES))
+    for venue_type, count, *counts in rows:
+        total += count
+        if venue_type:
+            types.append({'name': venue_type, 'count': count})
+        for index, value in enumerate(counts):
+            sums[index] += value
+    capacity = sums[:len(CAPACITY_BUCKETS)]
+    prices = sums[len(CAPACITY_BUCKETS):len(CAPACITY_BUCKETS) + len(VENUE_PRICE_BANDS)]
+    amenities = sums[len(CAPACITY_BUCKETS) + len(VENUE_PRICE_BANDS):]
+    return {
+        'total': total,
+        'types': sorted(types, key=lambda item: (-item['count'], item['name'])),
+        'capacity': [
+            {'min': minimum, 'label': label, 'count': count}
+            for (minimum, label), count in zip(CAPACITY_BUCKETS, capacity)
+        ],
+        'priceBands': [
+            {'min': minimum, 'max': maximum, 'label': label, 'count': count}
+            for (minimum, maximum, label), count in zip(VENUE_PRICE_BANDS, prices)
+        ],
+        'amenities': sorted(
+            ({'name': name, 'count': count} for name, count in zip(AMENITIES, amenities)),
+            key=lambda item: (-item['count'], item['name'])
+        )
+    }
+
+def venue_facets(query):
+    """Facet counts for the venues a (filtered, unpaginated) Venue query matches"""
+    key = ('venue_facets',) + statement_key(query)
+    return read_through(facet_cache, key, lambda: _build_venue_facets(_venue_facet_query(query).all()))
+
+@event.listens_for(Vendor, 'after_insert')
+@event.listens_for(Vendor, 'after_update')
+@event.listens_for(Vendor, 'after_delete')
+@event.listens_for(Venue, 'after_insert')
+@event.listens_for(Venue, 'after_update')
+@event.listens_for(Venue, 'after_delete')
+def _invalidate_on_write(mapper, connection, target):
+    invalidate_on_commit(object_session(target), facet_cache)
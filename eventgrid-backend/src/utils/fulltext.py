@@ -0,0 +1,122 @@
+"""Full-text vendor search: an SQLite FTS5 index with BM25 ranking.
+
+vendors_fts is an external-content FTS5 table over vendors.business_name,
+description and category. Triggers on vendors keep it in sync, so the text is
+stored only once. ensure_vendor_fts() creates it, plus the triggers, and fills
+it from existing rows; ensure_indexes() calls it, so `flask init-db` and the
+migrations CLI pick it up. Hits are ranked by BM25 with the business name
+weighted highest.
+
+Every word of the query must match a whole word, except the last, which
+also matches words it starts (search-as-you-type): 'studio phot' finds
+'Studio Photography'. Exact terms are read straight from the index, prefixes
+scan a range of it. Unlike the old ILIKE '%photo%', nothing matches in the
+middle of a word. On PostgreSQL, or on an SQLite
+build without FTS5, search_vendors keeps the ILIKE path, which PostgreSQL
+serves from the trigram indexes; so does a query with no words at all ('!!!').
+"""
+import re
+import time
+from flask import current_app
+from sqlalchemy import column, func, literal_column, table, text
+from sqlalchemy.exc import OperationalError
+from src.models.user import Vendor, db
+
+VENDOR_FTS = table('vendors_fts', column('rowid'), column('rank'))
+
+# BM25 weights for business_name, description, category; FTS5 sorts best first on ORDER BY rank
+RANK_FUNCTION = 'bm25(10.0, 1.0, 4.0)'
+
+_COLUMNS = 'business_name, description, category'
+
+_CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS vendors_fts USING fts5({_COLUMNS}, "
+    "content='vendors', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+
+_TRIGGERS = {
+    'vendors_fts_insert': (
+        f'CREATE TRIGGER vendors_fts_insert AFTER INSERT ON vendors BEGIN '
+        f'INSERT INTO vendors_fts(rowid, {_COLUMNS}) VALUES (new.id, new.business_name, new.description, new.category); '
+        f'END'
+    ),
+    'vendors_fts_delete': (
+        f'CREATE TRIGGER vendors_fts_delete AFTER DELETE ON vendors BEGIN '
+        f"INSERT INTO vendors_fts(vendors_fts, rowid, {_COLUMNS}) "
+        f"VALUES ('delete', old.id, old.business_name, old.description, old.category); "
+        f'END'
+    ),
+    'vendors_fts_update': (
+        f'CREATE TRIGGER vendors_fts_update AFTER UPDATE OF {_COLUMNS} ON vendors BEGIN '
+        f"INSERT INTO vendors_fts(vendors_fts, rowid, {_COLUMNS}) "
+        f"VALUES ('delete', old.id, old.business_name, old.description, old.category); "
+        f'INSERT INTO vendors_fts(rowid, {_COLUMNS}) VALUES (new.id, new.business_name, new.description, new.category); '
+        f'END'
+    )
+}
+
+# engine url -> (available, checked at); a missing index is looked for again after a minute
+_ready = {}
+_RECHECK_SECONDS = 60.0
+
+def ensure_vendor_fts(connection):
+    """Create and fill vendors_fts if its triggers are missing; returns True if it was (re)built
+
+    A fresh vendors table (create_all, or drop_all in the load-test generator)
+    has no triggers, so the index is rebuilt from the current rows.
+    """
+    if connection.dialect.name != 'sqlite':
+        return False
+    existing = set(connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'vendors'"
+    )).scalars())
+    if set(_TRIGGERS) <= existing:
+        return False
+    try:
+        connection.execute(text(_CREATE_TABLE))
+    except OperationalError:
+        # SQLite compiled without FTS5
+        return False
+    for name, statement in _TRIGGERS.items():
+        if name not in existing:
+            connection.execute(text(statement))
+    connection.execute(text("INSERT INTO vendors_fts(vendors_fts) VALUES ('rebuild')"))
+    connection.execute(text("INSERT INTO vendors_fts(vendors_fts, rank) VALUES ('rank', :rank)"),
+                       {'rank': RANK_FUNCTION})
+    connection.execute(text("INSERT INTO vendors_fts(vendors_fts) VALUES ('optimize')"))
+    _ready.clear()
+    return True
+
+def vendor_fts_ready():
+    """True if the engine serving vendor reads has a synced vendors_fts"""
+    if not current_app.config.get('VENDOR_SEARCH_FTS', True):
+        return False
+    engine = db.session.get_bind(mapper=Vendor)
+    if engine.dialect.name != 'sqlite':
+        return False
+    key = str(engine.url)
+    cached = _ready.get(key)
+    now = time.monotonic()
+    if cached is None or (not cached[0] and now - cached[1] > _RECHECK_SECONDS):
+        names = set(db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE name = 'vendors_fts' OR (type = 'trigger' AND tbl_name = 'vendors')"
+        )).scalars())
+        cached = _ready[key] = ({'vendors_fts', *_TRIGGERS} <= names, now)
+    return cached[0]
+
+def match_expression(query_text):
+    """FTS5 query requiring every word of query_text, the last one as a prefix; None without words"""
+    terms = [f'"{term}"' for term in re.findall(r'\w+', query_text.lower())]
+    if not terms:
+        return None
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+def match_vendors(query, expression):
+    """Restrict a Vendor query to rows matching the FTS5 expression; VENDOR_FTS.c.rank orders them"""
+    return query.join(VENDOR_FTS, VENDOR_FTS.c.rowid == Vendor.id) \
+        .filter(literal_column('vendors_fts').op('MATCH')(expression))
+
+def trigram_similarity(query_text):
+    """PostgreSQL relevance for the ILIKE path: closest business name first"""
+    return func.similarity(Vendor.business_name, query_text).desc()
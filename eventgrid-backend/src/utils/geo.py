@@ -0,0 +1,341 @@
+"""Geospatial venue search: a spatial index for candidates, haversine for ranking.
+
+On SQLite, venues_rtree is an R*Tree virtual table holding each venue's
+coordinates as a degenerate box, kept in sync by triggers on venues like
+vendors_fts. ensure_venue_rtree() creates and fills it; ensure_indexes() calls
+it. Where R*Tree is unavailable (PostgreSQL, SQLite built without it, or
+VENUE_SEARCH_RTREE=false) venue_grid, an in-process grid of the active venues'
+coordinates, capacities, daily rates and amenity masks, serves the same
+queries. It is built on first use, dropped when a venue is written through
+the ORM in this process and rebuilt after VENUE_GRID_TTL seconds otherwise.
+
+Either index only narrows the search to the bounding box of the query. The
+exact great-circle distance is then computed for every candidate at once
+(with numpy when it is installed) and the results are sorted by it.
+"""
+import math
+import threading
+import time
+from array import array
+from flask import current_app
+from sqlalchemy import and_, column, event, table, text
+from sqlalchemy.exc import OperationalError
+from src.models.user import Venue, db
+from src.utils.amenities import AMENITY_BITS
+
+try:
+    import numpy
+except ImportError:  # optional, distances are computed in a Python loop when it is missing
+    numpy = None
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+VENUE_RTREE = table('venues_rtree', column('id'), column('min_lat'), column('max_lat'),
+                    column('min_lng'), column('max_lng'))
+
+_CREATE_TABLE = 'CREATE VIRTUAL TABLE IF NOT EXISTS venues_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)'
+
+_POINT = 'new.id, new.latitude, new.latitude, new.longitude, new.longitude'
+
+_TRIGGERS = {
+    'venues_rtree_insert': (
+        'CREATE TRIGGER venues_rtree_insert AFTER INSERT ON venues '
+        'WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL BEGIN '
+        f'INSERT INTO venues_rtree VALUES ({_POINT}); '
+        'END'
+    ),
+    'venues_rtree_delete': (
+        'CREATE TRIGGER venues_rtree_delete AFTER DELETE ON venues BEGIN '
+        'DELETE FROM venues_rtree WHERE id = old.id; '
+        'END'
+    ),
+    'venues_rtree_update': (
+        'CREATE TRIGGER venues_rtree_update AFTER UPDATE OF latitude, longitude ON venues BEGIN '
+        'DELETE FROM venues_rtree WHERE id = old.id; '
+        f'INSERT INTO venues_rtree SELECT {_POINT} WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL; '
+        'END'
+    )
+}
+
+# engine url -> (available, checked at); a missing index is looked for again after a minute
+_ready = {}
+_RECHECK_SECONDS = 60.0
+
+def ensure_venue_rtree(connection):
+    """Create and fill venues_rtree if its triggers are missing; returns True if it was (re)built"""
+    if connection.dialect.name != 'sqlite':
+        return False
+    existing = set(connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'venues'"
+    )).scalars())
+    if set(_TRIGGERS) <= existing:
+        return False
+    try:
+        connection.execute(text(_CREATE_TABLE))
+    except OperationalError:
+        # SQLite compiled without R*Tree
+        return False
+    for name, statement in _TRIGGERS.items():
+        if name not in existing:
+            connection.execute(text(statement))
+    connection.execute(text('DELETE FROM venues_rtree'))
+    connection.execute(text(
+        'INSERT INTO venues_rtree SELECT id, latitude, latitude, longitude, longitude FROM venues '
+        'WHERE latitude IS NOT NULL AND longitude IS NOT NULL'
+    ))
+    _ready.clear()
+    return True
+
+def venue_rtree_ready():
+    """True if the engine serving venue reads has a synced venues_rtree"""
+    if not current_app.config.get('VENUE_SEARCH_RTREE', True):
+        return False
+    engine = db.session.get_bind(mapper=Venue)
+    if engine.dialect.name != 'sqlite':
+        return False
+    key = str(engine.url)
+    cached = _ready.get(key)
+    now = time.monotonic()
+    if cached is None or (not cached[0] and now - cached[1] > _RECHECK_SECONDS):
+        names = set(db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE name = 'venues_rtree' OR (type = 'trigger' AND tbl_name = 'venues')"
+        )).scalars())
+        cached = _ready[key] = ({'venues_rtree', *_TRIGGERS} <= names, now)
+    return cached[0]
+
+def split_box(south, west, north, east):
+    """(south, west, north, east) boxes covering the area; two when it crosses the antimeridian"""
+    if west <= east:
+        return [(south, west, north, east)]
+    return [(south, west, north, 180.0), (south, -180.0, north, east)]
+
+def box_width(west, east):
+    """Degrees of longitude from west eastwards to east, across the antimeridian if need be"""
+    return 360.0 if east - west == 360 else (east - west) % 360
+
+def box_center(south, west, north, east):
+    """(lat, lng) in the middle of the box"""
+    return (south + north) / 2, (west + box_width(west, east) / 2 + 180) % 360 - 180
+
+def radius_boxes(lat, lng, radius_km):
+    """Bounding boxes of the circle of radius_km around (lat, lng)"""
+    delta_lat = radius_km / KM_PER_DEGREE
+    south, north = max(-90.0, lat - delta_lat), min(90.0, lat + delta_lat)
+    angular = radius_km / EARTH_RADIUS_KM
+    if south <= -90.0 or north >= 90.0 or math.sin(angular) >= math.cos(math.radians(lat)):
+        # The circle reaches a pole: every longitude is within range
+        return [(south, -180.0, north, 180.0)]
+    delta_lng = math.degrees(math.asin(math.sin(angular) / math.cos(math.radians(lat))))
+    if delta_lng >= 180.0:
+        return [(south, -180.0, north, 180.0)]
+    west = (lng - delta_lng + 540.0) % 360.0 - 180.0
+    east = (lng + delta_lng + 540.0) % 360.0 - 180.0
+    return split_box(south, west, north, east)
+
+def haversine_km(lat, lng, lats, lngs):
+    """Great-circle distance in km from (lat, lng) to each point of lats/lngs"""
+    lat1 = math.radians(lat)
+    lng1 = math.radians(lng)
+    if numpy is not None:
+        lat2 = numpy.radians(numpy.asarray(lats, dtype=numpy.float64))
+        lng2 = numpy.radians(numpy.asarray(lngs, dtype=numpy.float64))
+        a = numpy.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * numpy.cos(lat2) * numpy.sin((lng2 - lng1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))
+    cos_lat1 = math.cos(lat1)
+    distances = []
+    for point_lat, point_lng in zip(lats, lngs):
+        lat2 = math.radians(point_lat)
+        a = math.sin((lat2 - lat1) / 2) ** 2 + \
+            cos_lat1 * math.cos(lat2) * math.sin((math.radians(point_lng) - lng1) / 2) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0))))
+    return distances
+
+def rank_by_distance(lat, lng, ids, lats, lngs, radius_km=None):
+    """[(venue id, distance km)] nearest first, dropping points beyond radius_km"""
+    if not ids:
+        return []
+    distances = haversine_km(lat, lng, lats, lngs)
+    if numpy is not None:
+        ids = numpy.asarray(ids)
+        if radius_km is not None:
+            inside = distances <= radius_km
+            ids, distances = ids[inside], distances[inside]
+        order = numpy.lexsort((ids, distances))
+        return list(zip(ids[order].tolist(), distances[order].tolist()))
+    ranked = sorted(zip(distances, ids))
+    if radius_km is not None:
+        ranked = [item for item in ranked if item[0] <= radius_km]
+    return [(venue_id, distance) for distance, venue_id in ranked]
+
+class VenueFilters:
+    """Capacity, daily-rate and amenity constraints shared by the venue queries and the grid"""
+
+    def __init__(self, capacity=None, min_price=None, max_price=None, amenities=()):
+        self.capacity = capacity
+        self.min_price = min_price
+        self.max_price = max_price
+        # canonical names (see src.utils.amenities); a venue must have all of them
+        self.amenities = list(amenities)
+        self.amenity_mask = 0
+        for name in self.amenities:
+            self.amenity_mask |= AMENITY_BITS[name]
+
+    def clauses(self):
+        clauses = [Venue.is_active == True]
+        if self.capacity is not None:
+            clauses.append(Venue.capacity_max >= self.capacity)
+            clauses.append(db.or_(Venue.capacity_min.is_(None), Venue.capacity_min <= self.capacity))
+        if self.min_price is not None:
+            clauses.append(Venue.daily_rate >= self.min_price)
+        if self.max_price is not None:
+            clauses.append(Venue.daily_rate <= self.max_price)
+        if self.amenity_mask:
+            # every requested amenity in one bitwise check
+            clauses.append(Venue.amenity_mask.op('&')(self.amenity_mask) == self.amenity_mask)
+        return clauses
+
+    def accepts(self, capacity_min, capacity_max, daily_rate, amenity_mask):
+        if self.capacity is not None:
+            if capacity_max < 0 or capacity_max < self.capacity:
+                return False
+            if capacity_min >= 0 and capacity_min > self.capacity:
+                return False
+        if self.min_price is not None and not (daily_rate == daily_rate and daily_rate >= self.min_price):
+            return False
+        if self.max_price is not None and not (daily_rate == daily_rate and daily_rate <= self.max_price):
+            return False
+        return amenity_mask & self.amenity_mask == self.amenity_mask
+
+def rtree_query(box, filters):
+    """Query for id, latitude and longitude of the matching venues inside one box, driven by venues_rtree"""
+    south, west, north, east = box
+    return db.session.query(Venue.id, Venue.latitude, Venue.longitude) \
+        .join(VENUE_RTREE, VENUE_RTREE.c.id == Venue.id) \
+        .filter(
+            # R*Tree coordinates are 32-bit floats rounded outwards: test overlap, then the exact values
+            VENUE_RTREE.c.max_lat >= south, VENUE_RTREE.c.min_lat <= north,
+            VENUE_RTREE.c.max_lng >= west, VENUE_RTREE.c.min_lng <= east,
+            and_(Venue.latitude.between(south, north), Venue.longitude.between(west, east)),
+            *filters.clauses()
+        )
+
+def rtree_candidates(boxes, filters):
+    """ids, latitudes and longitudes of the matching venues inside boxes, from venues_rtree"""
+    ids, lats, lngs = [], [], []
+    for box in boxes:
+        for venue_id, lat, lng in rtree_query(box, filters):
+            ids.append(venue_id)
+            lats.append(lat)
+            lngs.append(lng)
+    return ids, lats, lngs
+
+class VenueGrid:
+    """Active venues bucketed into CELL_DEGREES cells, for databases without R*Tree
+
+    Each cell holds parallel arrays of id, latitude, longitude, capacity_min,
+    capacity_max, daily_rate and amenity_mask (-1 and NaN stand for missing
+    values).
+    """
+
+    CELL_DEGREES = 0.25
+
+    def __init__(self, ttl=300.0):
+        self.ttl = ttl
+        self._cells = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def _cell(self, lat, lng):
+        return math.floor(lat / self.CELL_DEGREES), math.floor(lng / self.CELL_DEGREES)
+
+    def _build(self):
+        cells = {}
+        rows = db.session.query(
+            Venue.id, Venue.latitude, Venue.longitude, Venue.capacity_min, Venue.capacity_max, Venue.daily_rate,
+            Venue.amenity_mask
+        ).filter(Venue.is_active == True, Venue.latitude.isnot(None), Venue.longitude.isnot(None)) \
+            .execution_options(yield_per=10000)
+        for venue_id, lat, lng, capacity_min, capacity_max, daily_rate, mask in rows:
+            cell = cells.get(self._cell(lat, lng))
+            if cell is None:
+                cell = cells[self._cell(lat, lng)] = (
+                    array('q'), array('d'), array('d'), array('q'), array('q'), array('d'), array('q')
+                )
+            cell[0].append(venue_id)
+            cell[1].append(lat)
+            cell[2].append(lng)
+            cell[3].append(-1 if capacity_min is None else capacity_min)
+            cell[4].append(-1 if capacity_max is None else capacity_max)
+            cell[5].append(math.nan if daily_rate is None else daily_rate)
+            cell[6].append(mask)
+        return cells
+
+    def cells(self):
+        now = time.monotonic()
+        cells = self._cells
+        if cells is None or now - self._built_at > self.ttl:
+            with self._lock:
+                if self._cells is None or now - self._built_at > self.ttl:
+                    self._cells = self._build()
+                    self._built_at = time.monotonic()
+                cells = self._cells
+        return cells
+
+    def candidates(self, boxes, filters):
+        """ids, latitudes and longitudes of the matching venues inside boxes"""
+        cells = self.cells()
+        ids, lats, lngs = [], [], []
+        for south, west, north, east in boxes:
+            first_row, first_column = self._cell(south, west)
+            last_row, last_column = self._cell(north, east)
+            if (last_row - first_row + 1) * (last_column - first_column + 1) > len(cells):
+                # more cells in the box than occupied ones: walk the occupied cells instead
+                covered = [cell for (row, col), cell in cells.items()
+                           if first_row <= row <= last_row and first_column <= col <= last_column]
+            else:
+                covered = [cells[row, col] for row in range(first_row, last_row + 1)
+                           for col in range(first_column, last_column + 1) if (row, col) in cells]
+            for cell in covered:
+                for index, lat in enumerate(cell[1]):
+                    lng = cell[2][index]
+                    if south <= lat <= north and west <= lng <= east and \
+                            filters.accepts(cell[3][index], cell[4][index], cell[5][index], cell[6][index]):
+                        ids.append(cell[0][index])
+                        lats.append(lat)
+                        lngs.append(lng)
+        return ids, lats, lngs
+
+    def invalidate(self):
+        self._cells = None
+
+    def after_fork(self):
+        """Rebuild lazily in a forked worker, with a new lock"""
+        self._lock = threading.Lock()
+        self._cells = None
+
+venue_grid = VenueGrid()
+
+def init_venue_search(app):
+    """Configure the grid fallback from app config"""
+    app.config.setdefault('VENUE_SEARCH_RTREE', True)
+    app.config.setdefault('VENUE_GRID_TTL', 300.0)
+    venue_grid.ttl = app.config['VENUE_GRID_TTL']
+    venue_grid.invalidate()
+
+def search_venues_near(lat, lng, boxes, filters, radius_km=None):
+    """Matching venues inside boxes (and radius_km), nearest to (lat, lng) first
+
+    Returns ([(venue id, distance km)], name of the index used).
+    """
+    if venue_rtree_ready():
+        source, candidates = 'rtree', rtree_candidates(boxes, filters)
+    else:
+        source, candidates = 'grid', venue_grid.candidates(boxes, filters)
+    return rank_by_distance(lat, lng, *candidates, radius_km=radius_km), source
+
+@event.listens_for(Venue, 'after_insert')
+@event.listens_for(Venue, 'after_update')
+@event.listens_for(Venue, 'after_delete')
+def _invalidate_grid(mapper, connection, target):
+    venue_grid.invalidate()
@@ -0,0 +1,82 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used when it is missing
+    orjson = None
+
+def _default(obj):
+    """Encode types the stdlib encoder does not know about
+
+    Dates are written as ISO 8601, the same format orjson uses.
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson when available and stdlib json otherwise
+
+    With JSON_COMPACT (the default) responses are written without indentation
+    or key sorting. Setting JSON_COMPACT = False restores Flask's behaviour of
+    sorting keys and pretty-printing in debug mode.
+
+    The two encoders agree on dates and write non-ASCII text unescaped (the
+    stdlib path sets ensure_ascii=False unless a caller asks otherwise), but
+    not on non-finite floats: orjson writes NaN and Infinity as null, the
+    stdlib encoder as the bare tokens NaN and Infinity, which are not JSON.
+    """
+
+    default = staticmethod(_default)
+
+    def _compact(self):
+        return self._app.config.get('JSON_COMPACT', True)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return self._encode(obj).decode('utf-8')
+        return self._encode_text(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def _encode_text(self, obj, indent=None, **kwargs):
+        compact = self._compact()
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('sort_keys', False if compact else self.sort_keys)
+        kwargs.setdefault('separators', (',', ':') if indent is None else None)
+        return json.dumps(obj, indent=indent, **kwargs)
+
+    def _encode(self, obj, indent=None, **kwargs):
+        """Encode to UTF-8 bytes, preferring orjson"""
+        if orjson is not None and not kwargs:
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            if not self._compact() and self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=self.default, option=option)
+            except TypeError:
+                # e.g. integers beyond 64 bits; fall back to the stdlib encoder
+                pass
+        return self._encode_text(obj, indent=indent, **kwargs).encode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None
+        if not self._compact() and (self.compact is False or (self.compact is None and self._app.debug)):
+            indent = 2
+        body = self._encode(obj, indent=indent)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,33 @@
+"""Lazily imported views for rarely used route modules.
+
+Follows Flask's "lazily loading views" pattern: the URL rules are registered
+up front under the same endpoint names the blueprints use, and the module
+holding the view function is only imported on its first request.
+"""
+from threading import Lock
+from werkzeug.utils import import_string
+
+class LazyView:
+    """View that imports 'module:function' the first time it is called"""
+
+    def __init__(self, import_name):
+        self.__module__, self.__name__ = import_name.rsplit(':', 1)
+        self.import_name = import_name.replace(':', '.')
+        self._view = None
+        self._lock = Lock()
+
+    @property
+    def view(self):
+        if self._view is None:
+            with self._lock:
+                if self._view is None:
+                    self._view = import_string(self.import_name)
+        return self._view
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+def register_lazy_routes(app, routes, url_prefix=''):
+    """Register (rule, 'module:function', endpoint, methods) tuples on app"""
+    for rule, import_name, endpoint, methods in routes:
+        app.add_url_rule(url_prefix + rule, endpoint=endpoint, view_func=LazyView(import_name), methods=methods)
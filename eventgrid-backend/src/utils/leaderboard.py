@@ -0,0 +1,171 @@
+"""Featured-vendor leaderboards, maintained incrementally.
+
+A featured vendor is active, has at least FEATURED_MIN_REVIEWS reviews and an
+average rating of at least FEATURED_MIN_RATING. vendor_leaderboard keeps the
+best LEADERBOARD_SIZE of them per scope: all vendors, each category and each
+canonical service area. Ordering is rating, then review count, then id.
+
+Reads are a range scan of ix_vendor_leaderboard_scope_rank. Writes keep each
+board exact: when an ORM flush changes a vendor's rating, review count, active
+flag, category or service areas, it is removed from the boards it was on and
+those boards are topped up from vendors (which re-adds it if it still ranks);
+on boards it newly qualifies for it is inserted and the board trimmed back to
+LEADERBOARD_SIZE. Only changes to a vendor already on a board touch vendors.
+rebuild_leaderboard() recomputes every board, for bulk loads that bypass the
+ORM (`flask rebuild-leaderboard`, ensure_indexes()).
+"""
+from sqlalchemy import event, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.user import Vendor, VendorLeaderboardEntry, VendorServiceArea, db
+from src.utils.locations import normalize_area, normalize_areas
+
+LEADERBOARD_SIZE = 50
+FEATURED_MIN_RATING = 4.5
+FEATURED_MIN_REVIEWS = 5
+
+GLOBAL_SCOPE = 'all'
+
+# Columns whose change can move a vendor on or off a board
+RANKING_ATTRIBUTES = ('average_rating', 'total_reviews', 'is_active', 'category', 'service_areas')
+
+_board = VendorLeaderboardEntry.__table__
+_vendors = Vendor.__table__
+_areas = VendorServiceArea.__table__
+
+def category_scope(category):
+    return f'category:{category}'
+
+def area_scope(area):
+    return f'area:{area}'
+
+def leaderboard_scope(category=None, location=None):
+    """Scope for an optional category or location filter; None if the location has no canonical name"""
+    if category:
+        return category_scope(category)
+    if location:
+        area = normalize_area(location)
+        return area_scope(area) if area else None
+    return GLOBAL_SCOPE
+
+def leaderboard_order(entry=VendorLeaderboardEntry):
+    return [entry.average_rating.desc(), entry.total_reviews.desc(), entry.vendor_id]
+
+def is_featured(vendor):
+    return bool(vendor.is_active) and (vendor.total_reviews or 0) >= FEATURED_MIN_REVIEWS \
+        and (vendor.average_rating or 0) >= FEATURED_MIN_RATING
+
+def vendor_scopes(vendor):
+    """Boards a featured vendor belongs on"""
+    scopes = [GLOBAL_SCOPE, category_scope(vendor.category)]
+    scopes.extend(area_scope(area) for area in normalize_areas(vendor.service_areas))
+    return scopes
+
+def _featured_conditions():
+    return [
+        _vendors.c.is_active == True,
+        _vendors.c.total_reviews >= FEATURED_MIN_REVIEWS,
+        _vendors.c.average_rating >= FEATURED_MIN_RATING
+    ]
+
+def _candidates(scope):
+    """Featured vendors of a scope, best first, as leaderboard rows"""
+    query = select(literal(scope), _vendors.c.id, _vendors.c.average_rating, _vendors.c.total_reviews) \
+        .where(*_featured_conditions())
+    kind, _, value = scope.partition(':')
+    if kind == 'category':
+        query = query.where(_vendors.c.category == value)
+    elif kind == 'area':
+        query = query.where(_vendors.c.id.in_(
+            select(_areas.c.vendor_id).where(_areas.c.area_normalized == value)
+        ))
+    return query.order_by(_vendors.c.average_rating.desc(), _vendors.c.total_reviews.desc(), _vendors.c.id)
+
+def _board_insert(connection):
+    """INSERT into the boards that skips entries already there
+
+    Two transactions refilling the same board both pick the vendors missing from
+    it; the second must not fail on the (scope, vendor_id) key.
+    """
+    if connection.dialect.name == 'postgresql':
+        return postgresql.insert(_board).on_conflict_do_nothing()
+    if connection.dialect.name == 'sqlite':
+        return sqlite.insert(_board).on_conflict_do_nothing()
+    return _board.insert()
+
+def _insert_candidates(connection, candidates):
+    columns = ['scope', 'vendor_id', 'average_rating', 'total_reviews']
+    return connection.execute(_board_insert(connection).from_select(columns, candidates)).rowcount
+
+def _fill(connection, scope):
+    """Top a board up to LEADERBOARD_SIZE with the best vendors not on it"""
+    count = connection.execute(select(func.count()).where(_board.c.scope == scope)).scalar()
+    if count >= LEADERBOARD_SIZE:
+        return 0
+    on_board = select(_board.c.vendor_id).where(_board.c.scope == scope)
+    candidates = _candidates(scope).where(_vendors.c.id.not_in(on_board)).limit(LEADERBOARD_SIZE - count)
+    return _insert_candidates(connection, candidates)
+
+def _trim(connection, scope):
+    """Drop the entries ranked below LEADERBOARD_SIZE"""
+    overflow = select(_board.c.vendor_id).where(_board.c.scope == scope) \
+        .order_by(*leaderboard_order(_board.c)).offset(LEADERBOARD_SIZE)
+    connection.execute(_board.delete().where(_board.c.scope == scope, _board.c.vendor_id.in_(overflow)))
+
+def update_vendor(connection, vendor):
+    """Re-rank one vendor on every board it was on or now belongs on"""
+    current = set(connection.execute(select(_board.c.scope).where(_board.c.vendor_id == vendor.id)).scalars())
+    if current:
+        connection.execute(_board.delete().where(_board.c.vendor_id == vendor.id))
+        for scope in current:
+            _fill(connection, scope)
+    if not is_featured(vendor):
+        return
+    for scope in vendor_scopes(vendor):
+        if scope in current:
+            continue
+        connection.execute(_board_insert(connection).values(
+            scope=scope, vendor_id=vendor.id,
+            average_rating=vendor.average_rating, total_reviews=vendor.total_reviews
+        ))
+        _trim(connection, scope)
+
+def remove_vendor(connection, vendor_id):
+    """Take a deleted vendor off its boards and promote the next vendors"""
+    current = set(connection.execute(select(_board.c.scope).where(_board.c.vendor_id == vendor_id)).scalars())
+    connection.execute(_board.delete().where(_board.c.vendor_id == vendor_id))
+    for scope in current:
+        _fill(connection, scope)
+
+def rebuild_leaderboard(connection):
+    """Recompute every board from vendors; returns the entries written"""
+    connection.execute(_board.delete())
+    categories = connection.execute(
+        select(_vendors.c.category).where(*_featured_conditions()).distinct()
+    ).scalars().all()
+    areas = connection.execute(
+        select(_areas.c.area_normalized).join(_vendors, _vendors.c.id == _areas.c.vendor_id)
+        .where(*_featured_conditions()).distinct()
+    ).scalars().all()
+    scopes = [GLOBAL_SCOPE] + [category_scope(name) for name in categories if name] + [area_scope(name) for name in areas]
+    return sum(_fill(connection, scope) for scope in scopes)
+
+def needs_rebuild(connection):
+    """True if the boards are empty although featured vendors exist (a new table, or a bulk load)"""
+    if connection.execute(select(_board.c.vendor_id).limit(1)).first() is not None:
+        return False
+    return connection.execute(_candidates(GLOBAL_SCOPE).limit(1)).first() is not None
+
+@event.listens_for(Vendor, 'after_insert')
+def _rank_new_vendor(mapper, connection, target):
+    if is_featured(target):
+        update_vendor(connection, target)
+
+@event.listens_for(Vendor, 'after_update')
+def _rerank_vendor(mapper, connection, target):
+    state = db.inspect(target)
+    if any(state.attrs[key].history.has_changes() for key in RANKING_ATTRIBUTES):
+        update_vendor(connection, target)
+
+@event.listens_for(Vendor, 'after_delete')
+def _unrank_vendor(mapper, connection, target):
+    remove_vendor(connection, target.id)
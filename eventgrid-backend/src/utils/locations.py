@@ -0,0 +1,64 @@
+"""Canonical service-area names for location filtering.
+
+Vendors list the cities they serve as free text ("SF", "San Francisco",
+"san francisco"). normalize_area() reduces a name to the key stored in
+vendor_service_areas and used by the marketplace location filter, so all the
+spellings of one place match each other: case, accents, punctuation and
+spacing are dropped and common abbreviations are expanded.
+"""
+import re
+import unicodedata
+
+# Abbreviations and alternative names -> canonical key
+AREA_ALIASES = {
+    'sf': 'san francisco',
+    'san fran': 'san francisco',
+    'san francisco ca': 'san francisco',
+    'sfo': 'san francisco',
+    'la': 'los angeles',
+    'los angeles ca': 'los angeles',
+    'nyc': 'new york',
+    'ny': 'new york',
+    'new york city': 'new york',
+    'new york ny': 'new york',
+    'dc': 'washington',
+    'washington dc': 'washington',
+    'chi': 'chicago',
+    'atx': 'austin',
+    'austin tx': 'austin',
+    'sd': 'san diego',
+    'lv': 'las vegas',
+    'vegas': 'las vegas',
+    'atl': 'atlanta',
+    'pdx': 'portland',
+    'napa': 'napa valley',
+    'the bay': 'bay area',
+    'sf bay area': 'bay area',
+    'san francisco bay area': 'bay area'
+}
+
+def normalize_area(name):
+    """Canonical key for a city or region name; None if nothing is left of it"""
+    if not isinstance(name, str):
+        return None
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+    # "S.F." -> "sf", "St. Louis" -> "st louis"
+    text = re.sub(r"[.']", '', text)
+    text = ' '.join(re.findall(r'\w+', text))
+    if not text:
+        return None
+    return AREA_ALIASES.get(text, text)
+
+def normalize_areas(names):
+    """Distinct canonical keys for a list of names, in their original order"""
+    keys = []
+    for name in names or ():
+        key = normalize_area(name)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+def parse_locations(values):
+    """Canonical keys from ?location= values, each repeated or comma-separated"""
+    return normalize_areas(part for value in values for part in value.split(','))
@@ -0,0 +1,203 @@
+"""Request and SQL instrumentation exposed as Prometheus text at /api/metrics.
+
+Every request records its latency in a per-endpoint histogram, a count per
+status code, and the number and total time of the SQL statements it ran.
+Each thread aggregates into its own tables, so the hot path takes no lock.
+A scrape merges the per-thread tables. Each response also carries a
+Server-Timing header (app and db time) that browser dev tools display.
+
+Counters are per process; with several workers scrape each one or
+aggregate in Prometheus.
+
+The endpoint exposes route names and traffic, so it is only registered when
+METRICS_TOKEN is set, and scrapes must send it as a bearer token
+(`authorization: {credentials: ...}` in the Prometheus scrape config).
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request
+from sqlalchemy import event
+from src.models.user import db
+
+# Upper bounds in seconds, Prometheus' default buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _ThreadStats:
+    __slots__ = ('latency', 'statuses', 'sql')
+
+    def __init__(self):
+        # (endpoint, method) -> [bucket counts..., +Inf count, sum]
+        self.latency = {}
+        # (endpoint, method, status) -> count
+        self.statuses = {}
+        # (endpoint, method) -> [statement count, seconds]
+        self.sql = {}
+
+class RequestMetrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._local = threading.local()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def after_fork(self):
+        """Forget what the parent process recorded; each worker reports its own requests"""
+        self.started_at = time.time()
+        self._local = threading.local()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _stats(self):
+        stats = getattr(self._local, 'stats', None)
+        if stats is None:
+            stats = self._local.stats = _ThreadStats()
+            with self._lock:
+                self._threads.append(stats)
+        return stats
+
+    def observe(self, endpoint, method, status, seconds, sql_count, sql_seconds):
+        """Record one finished request in the calling thread's tables"""
+        stats = self._stats()
+        key = (endpoint, method)
+        histogram = stats.latency.get(key)
+        if histogram is None:
+            histogram = stats.latency[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+
+        status_key = (endpoint, method, status)
+        stats.statuses[status_key] = stats.statuses.get(status_key, 0) + 1
+
+        sql = stats.sql.get(key)
+        if sql is None:
+            sql = stats.sql[key] = [0, 0.0]
+        sql[0] += sql_count
+        sql[1] += sql_seconds
+
+    def snapshot(self):
+        """Merge the per-thread tables into (latency, statuses, sql)"""
+        latency, statuses, sql = {}, {}, {}
+        with self._lock:
+            threads = list(self._threads)
+        for stats in threads:
+            for key, values in list(stats.latency.items()):
+                merged = latency.setdefault(key, [0] * len(values))
+                for idx, value in enumerate(values):
+                    merged[idx] += value
+            for key, count in list(stats.statuses.items()):
+                statuses[key] = statuses.get(key, 0) + count
+            for key, (count, seconds) in list(stats.sql.items()):
+                merged = sql.setdefault(key, [0, 0.0])
+                merged[0] += count
+                merged[1] += seconds
+        return latency, statuses, sql
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        latency, statuses, sql = self.snapshot()
+        lines = [
+            '# HELP eventgrid_request_duration_seconds Request latency by endpoint.',
+            '# TYPE eventgrid_request_duration_seconds histogram'
+        ]
+        for (endpoint, method), values in sorted(latency.items()):
+            labels = f'endpoint="{endpoint}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'eventgrid_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += values[len(self.buckets)]
+            lines.append(f'eventgrid_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'eventgrid_request_duration_seconds_sum{{{labels}}} {values[-1]:.6f}')
+            lines.append(f'eventgrid_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+        lines += [
+            '# HELP eventgrid_requests_total Requests by endpoint and status code.',
+            '# TYPE eventgrid_requests_total counter'
+        ]
+        for (endpoint, method, status), count in sorted(statuses.items()):
+            lines.append(f'eventgrid_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+
+        lines += [
+            '# HELP eventgrid_sql_statements_total SQL statements executed by endpoint.',
+            '# TYPE eventgrid_sql_statements_total counter'
+        ]
+        for (endpoint, method), (count, _) in sorted(sql.items()):
+            lines.append(f'eventgrid_sql_statements_total{{endpoint="{endpoint}",method="{method}"}} {count}')
+
+        lines += [
+            '# HELP eventgrid_sql_duration_seconds_total Time spent executing SQL by endpoint.',
+            '# TYPE eventgrid_sql_duration_seconds_total counter'
+        ]
+        for (endpoint, method), (_, seconds) in sorted(sql.items()):
+            lines.append(f'eventgrid_sql_duration_seconds_total{{endpoint="{endpoint}",method="{method}"}} {seconds:.6f}')
+
+        lines += [
+            '# HELP eventgrid_process_start_time_seconds Start time of the process since the epoch.',
+            '# TYPE eventgrid_process_start_time_seconds gauge'
+        ]
+        lines.append(f'eventgrid_process_start_time_seconds {self.started_at:.3f}')
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+# SQL time of the request running on this thread; None outside requests
+_sql = threading.local()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _sql.started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counters = getattr(_sql, 'counters', None)
+    if counters is not None:
+        counters[0] += 1
+        counters[1] += time.perf_counter() - _sql.started
+
+def init_metrics(app):
+    """Instrument requests and SQL, and serve the results at /api/metrics when METRICS_TOKEN is set"""
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.config.setdefault('METRICS_SERVER_TIMING', True)
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_timer():
+        g._request_started = time.perf_counter()
+        _sql.counters = [0, 0.0]
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('_request_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        sql_count, sql_seconds = getattr(_sql, 'counters', None) or (0, 0.0)
+        _sql.counters = None
+        request_metrics.observe(request.endpoint or 'unmatched', request.method, response.status_code,
+                                elapsed, sql_count, sql_seconds)
+        if app.config['METRICS_SERVER_TIMING']:
+            response.headers['Server-Timing'] = (
+                f'app;dur={elapsed * 1000:.1f}, db;dur={sql_seconds * 1000:.1f};desc="{sql_count} queries"'
+            )
+        return response
+
+    token = app.config.get('METRICS_TOKEN')
+    if not token:
+        return
+    expected = f'Bearer {token}'.encode()
+
+    def metrics():
+        if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected):
+            return app.response_class('Unauthorized\n', status=401, content_type='text/plain; charset=utf-8',
+                                      headers={'WWW-Authenticate': 'Bearer realm="metrics"'})
+        return app.response_class(request_metrics.render_prometheus(),
+                                  content_type='text/plain; version=0.0.4; charset=utf-8')
+
+    app.add_url_rule('/api/metrics', 'metrics', metrics, methods=['GET'])
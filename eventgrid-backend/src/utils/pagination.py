@@ -0,0 +1,157 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, event, or_
+from sqlalchemy.orm import object_session
+from src.models.user import Booking, Event, Vendor, Venue
+from src.utils.cache import TTLCache, invalidate_on_commit
+from src.utils.read_replica import read_through
+
+# Totals are only computed on request in cursor mode and are cached briefly,
+# since COUNT(*) over a large result set costs as much as the page itself.
+# An ORM write to a counted model clears them in this process once it
+# commits; other workers recount after the TTL.
+count_cache = TTLCache(maxsize=1024, ttl=30.0)
+
+class InvalidCursorError(ValueError):
+    pass
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    return value
+
+def _decode_value(value):
+    if isinstance(value, dict) and '$dt' in value:
+        return datetime.fromisoformat(value['$dt'])
+    return value
+
+def encode_cursor(sort_key, values):
+    """Encode the sort key values of the last row into an opaque cursor"""
+    payload = json.dumps({'s': sort_key, 'v': [_encode_value(v) for v in values]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token, sort_key, size):
+    """Decode a cursor produced by encode_cursor for the same sort order"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = [_decode_value(v) for v in payload['v']]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError('Invalid cursor')
+    if payload.get('s') != sort_key or len(values) != size:
+        raise InvalidCursorError('Cursor does not match the requested sort order')
+    return values
+
+def _order_clause(column, direction):
+    # Spell out NULL placement (SQLite's default: NULLs sort lowest) so the
+    # seek predicate below means the same thing on every backend.
+    if direction == 'desc':
+        return column.desc().nulls_last()
+    return column.asc().nulls_first()
+
+def _after(column, direction, value):
+    """Rows strictly after value in the given direction"""
+    if direction == 'desc':
+        if value is None:
+            return None
+        return or_(column < value, column.is_(None))
+    if value is None:
+        return column.isnot(None)
+    return column > value
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+def _seek_condition(order, values):
+    """Lexicographic "comes after" predicate over (col1, col2, ..., pk)"""
+    branches = []
+    for idx, ((column, direction), value) in enumerate(zip(order, values)):
+        after = _after(column, direction, value)
+        if after is None:
+            continue
+        prefix = [_equal(col, val) for (col, _), val in zip(order[:idx], values[:idx])]
+        branches.append(and_(*prefix, after) if prefix else after)
+    if not branches:
+        return None
+
+    condition = or_(*branches)
+    # Redundant bound on the leading column so the planner can seek an index
+    # range instead of filtering every row before the cursor. It excludes
+    # NULLs, which keyset_paginate fetches separately for DESC orders.
+    column, direction = order[0]
+    if values[0] is not None:
+        bound = column <= values[0] if direction == 'desc' else column >= values[0]
+        condition = and_(bound, condition)
+    return condition
+
+def keyset_paginate(query, order, limit, cursor=None, sort_key='default'):
+    """Fetch one page by seeking past the cursor instead of using OFFSET
+
+    order is a list of (column, 'asc' | 'desc') whose last entry must be
+    unique (normally the primary key). Returns (items, next_cursor).
+    """
+    order_by = [_order_clause(c, d) for c, d in order]
+    null_tail = False
+    if cursor:
+        values = decode_cursor(cursor, sort_key, len(order))
+        condition = _seek_condition(order, values)
+        if condition is None:
+            return [], None
+        leading, direction = order[0]
+        null_tail = direction == 'desc' and values[0] is not None and leading.expression.nullable
+        seek_query = query.filter(condition)
+    else:
+        seek_query = query
+
+    rows = seek_query.order_by(None).order_by(*order_by).limit(limit + 1).all()
+    if null_tail and len(rows) <= limit:
+        # NULLs sort after every value in DESC order but fall outside the
+        # seek range, so continue into them with a second indexed lookup.
+        rows += query.filter(leading.is_(None)).order_by(None).order_by(*order_by[1:]) \
+            .limit(limit + 1 - len(rows)).all()
+    items = rows[:limit]
+    next_cursor = None
+    # items is empty for limit <= 0, which has no last row to continue from
+    if items and len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_key, [getattr(last, column.key) for column, _ in order])
+    return items, next_cursor
+
+def statement_key(query):
+    """Cache key for an ORM query: its SQL and bound parameters, ignoring ORDER BY"""
+    statement = query.order_by(None).statement.compile()
+    return str(statement), tuple(sorted((k, repr(v)) for k, v in statement.params.items()))
+
+def cached_count(query):
+    """COUNT(*) for query, memoised for a short TTL per distinct statement"""
+    return read_through(count_cache, statement_key(query), lambda: query.order_by(None).count())
+
+def cursor_pagination(query, limit, next_cursor, include_total=False):
+    """Build the pagination block returned in cursor mode"""
+    pagination = {
+        'limit': limit,
+        'nextCursor': next_cursor,
+        'hasMore': next_cursor is not None
+    }
+    if include_total:
+        total = cached_count(query)
+        pagination['total'] = total
+        pagination['totalPages'] = (total + limit - 1) // limit if limit else 0
+    return pagination
+
+@event.listens_for(Booking, 'after_insert')
+@event.listens_for(Booking, 'after_update')
+@event.listens_for(Booking, 'after_delete')
+@event.listens_for(Event, 'after_insert')
+@event.listens_for(Event, 'after_update')
+@event.listens_for(Event, 'after_delete')
+@event.listens_for(Vendor, 'after_insert')
+@event.listens_for(Vendor, 'after_update')
+@event.listens_for(Vendor, 'after_delete')
+@event.listens_for(Venue, 'after_insert')
+@event.listens_for(Venue, 'after_update')
+@event.listens_for(Venue, 'after_delete')
+def _invalidate_counts(mapper, connection, target):
+    # updates too: a status or category change moves rows in and out of filtered totals
+    invalidate_on_commit(object_session(target), count_cache)
@@ -0,0 +1,248 @@
+"""Opt-in SQL profiler: N+1 detection, slow query plans and query budgets.
+
+With QUERY_PROFILER_ENABLED every request collects its SQL statements and
+groups them by normalized text (literals and IN-lists folded). A group that
+repeats QUERY_PROFILER_N_PLUS_ONE or more times is reported as an N+1 along
+with the code location that issued it. A statement slower than
+QUERY_PROFILER_SLOW_MS is logged together with its EXPLAIN QUERY PLAN. Each
+profiled request writes one JSON line to a rotating QUERY_PROFILER_LOG file.
+
+The same collector enforces query budgets in tests or scripts:
+
+    with app.app_context(), query_budget(2) as profile:
+        client.get('/api/bookings', headers=headers)
+    print(profile.report())
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from flask import g, request
+from sqlalchemy import event
+from src.models.user import db
+
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|:\w+|NULL)\s*,?)+\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+def normalize_sql(statement):
+    """Fold literals, parameter lists and whitespace so equal shapes compare equal"""
+    text = _STRING.sub('?', statement)
+    text = _NUMBER.sub('?', text)
+    text = _IN_LIST.sub('IN (...)', text)
+    return _SPACE.sub(' ', text).strip()
+
+def _caller():
+    """First application frame outside this module, as 'path:line in function'"""
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(_SRC_DIR) and filename != _THIS_FILE:
+            return f'{os.path.relpath(filename, os.path.dirname(_SRC_DIR))}:{frame.lineno} in {frame.name}'
+    return None
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryProfile:
+    """Statements captured while the profile is active on a thread"""
+
+    def __init__(self, slow_ms=None, explain=True, capture_callers=True):
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self.capture_callers = capture_callers
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    @property
+    def total_ms(self):
+        return sum(item['ms'] for item in self.statements)
+
+    def record(self, statement, parameters, ms, plan, caller):
+        self.statements.append({
+            'sql': statement,
+            'normalized': normalize_sql(statement),
+            'ms': ms,
+            'plan': plan,
+            'caller': caller,
+            'parameters': repr(parameters)[:200]
+        })
+
+    def groups(self):
+        """Statements grouped by normalized text, most frequent first"""
+        grouped = {}
+        for item in self.statements:
+            group = grouped.setdefault(item['normalized'], {'sql': item['normalized'], 'count': 0, 'ms': 0.0, 'callers': []})
+            group['count'] += 1
+            group['ms'] += item['ms']
+            if item['caller'] and item['caller'] not in group['callers']:
+                group['callers'].append(item['caller'])
+        return sorted(grouped.values(), key=lambda group: (-group['count'], -group['ms']))
+
+    def n_plus_one(self, threshold=3):
+        return [group for group in self.groups() if group['count'] >= threshold]
+
+    def slow(self):
+        if self.slow_ms is None:
+            return []
+        return [item for item in self.statements if item['ms'] >= self.slow_ms]
+
+    def report(self, threshold=3):
+        return {
+            'queries': self.count,
+            'sqlMs': round(self.total_ms, 3),
+            'nPlusOne': self.n_plus_one(threshold),
+            'slow': [{key: item[key] for key in ('sql', 'ms', 'plan', 'caller')} for item in self.slow()],
+            'groups': self.groups()
+        }
+
+# Profiles active on the current thread (request profiling, query budgets)
+_active = threading.local()
+
+def _profiles():
+    profiles = getattr(_active, 'profiles', None)
+    if profiles is None:
+        profiles = _active.profiles = []
+    return profiles
+
+def _explain(cursor, dialect, statement, parameters):
+    """Query plan for a SELECT, using a separate cursor on the same connection"""
+    if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    try:
+        plan_cursor = cursor.connection.cursor()
+        try:
+            plan_cursor.execute(prefix + statement, parameters)
+            return [str(row[-1]) if dialect == 'sqlite' else str(row[0]) for row in plan_cursor.fetchall()]
+        finally:
+            plan_cursor.close()
+    except Exception as e:
+        return [f'EXPLAIN failed: {e}']
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_active, 'profiles', None):
+        conn.info.setdefault('query_profiler_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profiles = getattr(_active, 'profiles', None)
+    if not profiles:
+        return
+    starts = conn.info.get('query_profiler_start')
+    if not starts:
+        return
+    ms = (time.perf_counter() - starts.pop()) * 1000
+    caller = _caller() if any(profile.capture_callers for profile in profiles) else None
+    plan = None
+    if not executemany and any(
+        profile.explain and profile.slow_ms is not None and ms >= profile.slow_ms for profile in profiles
+    ):
+        plan = _explain(cursor, conn.dialect.name, statement, parameters)
+    for profile in profiles:
+        profile.record(statement, parameters, ms, plan, caller)
+
+def instrument_engine(engine):
+    """Attach the profiler's listeners to engine once"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+@contextmanager
+def profile_queries(slow_ms=None, explain=True, capture_callers=True, engine=None):
+    """Collect the statements run on this thread inside the block"""
+    for each in [engine] if engine is not None else db.engines.values():
+        instrument_engine(each)
+    profile = QueryProfile(slow_ms=slow_ms, explain=explain, capture_callers=capture_callers)
+    profiles = _profiles()
+    profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        profiles.remove(profile)
+
+@contextmanager
+def query_budget(max_queries, engine=None):
+    """Fail with QueryBudgetExceeded if the block runs more than max_queries statements"""
+    with profile_queries(engine=engine, explain=False) as profile:
+        yield profile
+    if profile.count > max_queries:
+        lines = [f'{group["count"]}x {group["sql"]}' for group in profile.groups()]
+        raise QueryBudgetExceeded(
+            f'{profile.count} queries exceeds the budget of {max_queries}:\n' + '\n'.join(lines)
+        )
+
+def _report_logger(path, max_bytes, backup_count):
+    logger = logging.getLogger('eventgrid.query_profiler')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    return logger
+
+def init_query_profiler(app):
+    """Profile every request's SQL when QUERY_PROFILER_ENABLED is set"""
+    app.config.setdefault('QUERY_PROFILER_ENABLED', False)
+    app.config.setdefault('QUERY_PROFILER_SLOW_MS', 100.0)
+    app.config.setdefault('QUERY_PROFILER_N_PLUS_ONE', 3)
+    app.config.setdefault('QUERY_PROFILER_LOG', os.path.join(_SRC_DIR, 'logs', 'query_profile.log'))
+    app.config.setdefault('QUERY_PROFILER_LOG_BYTES', 5 * 1024 * 1024)
+    app.config.setdefault('QUERY_PROFILER_LOG_BACKUPS', 3)
+    if not app.config['QUERY_PROFILER_ENABLED']:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(engine)
+    report_log = _report_logger(
+        app.config['QUERY_PROFILER_LOG'],
+        app.config['QUERY_PROFILER_LOG_BYTES'],
+        app.config['QUERY_PROFILER_LOG_BACKUPS']
+    )
+    threshold = app.config['QUERY_PROFILER_N_PLUS_ONE']
+
+    @app.before_request
+    def start_query_profile():
+        profile = QueryProfile(slow_ms=app.config['QUERY_PROFILER_SLOW_MS'])
+        _profiles().append(profile)
+        g._query_profile = profile
+
+    @app.teardown_request
+    def finish_query_profile(exc):
+        profile = g.pop('_query_profile', None)
+        if profile is None:
+            return
+        profiles = _profiles()
+        if profile in profiles:
+            profiles.remove(profile)
+
+        report = profile.report(threshold)
+        for group in report['nPlusOne']:
+            app.logger.warning('Possible N+1 in %s %s: %dx %s (%s)', request.method, request.path,
+                               group['count'], group['sql'], ', '.join(group['callers']) or 'unknown caller')
+        for item in report['slow']:
+            app.logger.warning('Slow query (%.1f ms) in %s %s: %s\n  plan: %s', item['ms'], request.method,
+                               request.path, item['sql'], '; '.join(item['plan'] or []))
+        report_log.info(json.dumps({
+            'time': time.time(),
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'error': repr(exc) if exc else None,
+            **report
+        }, default=str))
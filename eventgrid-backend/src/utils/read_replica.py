@@ -0,0 +1,121 @@
+"""Route read-only requests to a replica engine, with read-your-writes.
+
+With DATABASE_REPLICA_URL set, the replica is registered as the 'replica'
+bind. GET and HEAD requests to the blueprints in DB_REPLICA_BLUEPRINTS
+(marketplace, events and bookings by default) run their SELECTs on it.
+Flushes, and everything outside those requests, stay on the primary. Without
+a replica nothing changes.
+
+A replica lags behind the primary, so a client that has just written must not
+read from it. When a request commits, the response pins its caller to the
+primary for DB_READ_YOUR_WRITES_SECONDS: the deadline goes out in a cookie,
+which browsers send back, and in the X-Primary-Until header, which API
+clients that do not keep cookies echo on their next requests. Either reaches
+whichever worker serves the next request, so no server-side state is kept.
+Deadlines further out than the window are ignored.
+
+The process caches (users, vendor details, facets, counts) are only filled
+from the primary: a replica read could put back a row the primary has
+already changed. A pinned client skips them and reads through to the
+primary, as a cache filled before its write may not have been cleared yet in
+this worker. read_through() applies both rules.
+"""
+import time
+from contextlib import contextmanager, nullcontext
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, event
+
+REPLICA_BIND = 'replica'
+STICKY_COOKIE = 'eg_primary_until'
+STICKY_HEADER = 'X-Primary-Until'
+
+def _recently_wrote():
+    now = time.time()
+    window = current_app.config['DB_READ_YOUR_WRITES_SECONDS']
+    for value in (request.cookies.get(STICKY_COOKIE), request.headers.get(STICKY_HEADER)):
+        try:
+            if value and now < float(value) <= now + window:
+                return True
+        except ValueError:
+            pass
+    return False
+
+def _use_replica():
+    """Decided on the request's first SELECT, once the JWT has been verified"""
+    if not has_request_context():
+        return False
+    decision = g.get('_db_use_replica')
+    if decision is None:
+        decision = g._db_use_replica = (
+            request.method in ('GET', 'HEAD')
+            and request.blueprint in current_app.config['DB_REPLICA_BLUEPRINTS']
+            and not _recently_wrote()
+        )
+    return decision
+
+def _replica_configured():
+    return has_request_context() and REPLICA_BIND in current_app.config.get('SQLALCHEMY_BINDS', {})
+
+def pinned_to_primary():
+    """True when the client has just written: skip the process caches and read the primary"""
+    return _replica_configured() and _recently_wrote()
+
+def may_fill_caches():
+    """False while this request reads from the replica, whose rows may be older than the primary's"""
+    return not (_replica_configured() and _use_replica())
+
+def read_through(cache, key, load):
+    """cache[key], or load() run on the right engine and cached when it read the primary"""
+    pinned = pinned_to_primary()
+    if not pinned:
+        value = cache.get(key)
+        if value is not None:
+            return value
+    with use_primary() if pinned else nullcontext():
+        value = load()
+    if value is not None and may_fill_caches():
+        cache.set(key, value)
+    return value
+
+class RoutingSession(Session):
+    """Session sending the SELECTs of replica-routed requests to the replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and (clause is None or isinstance(clause, Select)):
+            engines = self._db.engines
+            if REPLICA_BIND in engines and _use_replica():
+                return engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _remember_write(session):
+    if has_request_context():
+        g._db_wrote = True
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block, e.g. to re-check a row before writing it"""
+    previous = g.get('_db_use_replica')
+    g._db_use_replica = False
+    try:
+        yield
+    finally:
+        g._db_use_replica = previous
+
+def init_read_replica(app):
+    """Pin recent writers to the primary when a replica is configured"""
+    app.config.setdefault('DB_REPLICA_BLUEPRINTS', ('marketplace', 'events', 'bookings'))
+    app.config.setdefault('DB_READ_YOUR_WRITES_SECONDS', 5.0)
+    if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+    window = app.config['DB_READ_YOUR_WRITES_SECONDS']
+
+    @app.after_request
+    def pin_writer_to_primary(response):
+        if g.pop('_db_wrote', False):
+            until = f'{time.time() + window:.3f}'
+            response.headers[STICKY_HEADER] = until
+            response.set_cookie(STICKY_COOKIE, until, max_age=max(1, int(window + 0.999)),
+                                httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,249 @@
+"""In-memory manifest of the frontend build in src/static.
+
+The manifest is built once at startup. It maps every file to its size,
+mtime, content-hash ETag and any precompressed .br / .gz siblings. Serving a
+request is then a dict lookup with no os.path.exists() calls, and SPA deep
+links resolve to the cached index.html without touching the disk at all.
+
+Files under STATIC_IMMUTABLE_DIRS (Vite's content-hashed `assets/` by default)
+are sent with a one-year immutable Cache-Control. Everything else must be
+revalidated, which the ETag makes a 304. Files up to STATIC_MEMORY_LIMIT bytes
+are kept in memory. Larger ones are streamed from disk, and both support
+Range requests.
+
+Each process holds its own manifest, and gunicorn workers forked from a
+preloaded master inherit the master's, so neither a deploy nor a HUP makes
+them rescan. After replacing the build, run `flask static-manifest`: it
+touches the STATIC_RELOAD_STAMP file, and every process rebuilds its manifest
+on the first request after noticing the new mtime (checked at most every
+STATIC_STAMP_INTERVAL seconds). With STATIC_RELOAD_INTERVAL set (seconds
+between checks; handy in development) the folder itself is also watched.
+"""
+import hashlib
+import mimetypes
+import os
+import time
+from threading import Lock
+from flask import current_app, request, send_file
+from src.utils.compression import COMPRESSIBLE_MIMETYPES, ENCODINGS, available_encodings, compress_bytes
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+
+class StaticFile:
+    __slots__ = ('path', 'size', 'mtime', 'etag', 'mimetype', 'data')
+
+    def __init__(self, path, size, mtime, etag, mimetype, data=None):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.etag = etag
+        self.mimetype = mimetype
+        self.data = data
+
+class StaticEntry:
+    __slots__ = ('name', 'file', 'variants', 'immutable')
+
+    def __init__(self, name, file, immutable):
+        self.name = name
+        self.file = file
+        self.variants = {}
+        self.immutable = immutable
+
+def _hash_file(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _load(path, stat, mimetype, memory_limit):
+    data = None
+    if stat.st_size <= memory_limit:
+        with open(path, 'rb') as source:
+            data = source.read()
+        etag = hashlib.sha1(data).hexdigest()
+    else:
+        etag = _hash_file(path)
+    return StaticFile(path, stat.st_size, stat.st_mtime, etag, mimetype, data)
+
+class StaticManifest:
+    def __init__(self, folder, memory_limit=256 * 1024, immutable_dirs=('assets',),
+                 index='index.html', reload_interval=0, stamp_path=None, stamp_interval=2.0):
+        self.folder = folder
+        self.memory_limit = memory_limit
+        self.immutable_dirs = tuple(d.strip('/') + '/' for d in immutable_dirs)
+        self.index = index
+        self.reload_interval = reload_interval
+        self.stamp_path = stamp_path
+        self.stamp_interval = stamp_interval
+        self.entries = {}
+        self._signature = None
+        self._checked_at = 0.0
+        self._stamp = None
+        self._stamp_checked_at = 0.0
+        self._lock = Lock()
+
+    def after_fork(self):
+        """Keep the entries (shared copy-on-write with the parent) but not its lock"""
+        self._lock = Lock()
+
+    def _scan(self):
+        """(relative name, absolute path, stat) for every regular file"""
+        files = []
+        if not self.folder or not os.path.isdir(self.folder):
+            return files
+        for root, _, names in os.walk(self.folder):
+            for filename in names:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.folder).replace(os.sep, '/')
+                files.append((name, path, os.stat(path)))
+        return files
+
+    def _read_stamp(self):
+        if not self.stamp_path:
+            return None
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def touch_stamp(self):
+        """Tell every process serving this folder, this one included, to rebuild its manifest; False without a stamp"""
+        if not self.stamp_path:
+            return False
+        with open(self.stamp_path, 'a'):
+            pass
+        os.utime(self.stamp_path)
+        return True
+
+    def reload(self):
+        """Rebuild the manifest from the folder"""
+        # read before the scan, so a touch during it triggers another reload
+        stamp = self._read_stamp()
+        files = self._scan()
+        suffixes = {suffix: encoding for encoding, suffix in ENCODINGS}
+        names = {name for name, _, _ in files}
+        entries = {}
+        variants = []
+        for name, path, stat in files:
+            base, suffix = os.path.splitext(name)
+            if suffix in suffixes and base in names:
+                variants.append((base, suffixes[suffix], path, stat))
+                continue
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            entries[name] = StaticEntry(
+                name,
+                _load(path, stat, mimetype, self.memory_limit),
+                name.startswith(self.immutable_dirs)
+            )
+        for base, encoding, path, stat in variants:
+            entry = entries[base]
+            variant = _load(path, stat, entry.file.mimetype, self.memory_limit)
+            variant.etag = f'{entry.file.etag}-{encoding}'
+            entry.variants[encoding] = variant
+        for entry in entries.values():
+            self._compress_in_memory(entry)
+
+        self.entries = entries
+        self._signature = self._signature_of(files)
+        self._stamp = stamp
+        self._checked_at = time.monotonic()
+        return entries
+
+    def _compress_in_memory(self, entry):
+        """Build missing encodings for small files so they are never compressed per request"""
+        file = entry.file
+        if file.data is None or file.mimetype not in COMPRESSIBLE_MIMETYPES or file.size < 1024:
+            return
+        for encoding, _ in available_encodings():
+            if encoding in entry.variants:
+                continue
+            data = compress_bytes(file.data, encoding, gzip_level=9, brotli_quality=11)
+            if len(data) < file.size:
+                entry.variants[encoding] = StaticFile(
+                    file.path, len(data), file.mtime, f'{file.etag}-{encoding}', file.mimetype, data
+                )
+
+    def _signature_of(self, files):
+        return frozenset((name, stat.st_size, stat.st_mtime_ns) for name, _, stat in files)
+
+    def refresh(self):
+        """Reload if the stamp was touched or, every reload_interval seconds, if the folder changed"""
+        now = time.monotonic()
+        if self.stamp_path and now - self._stamp_checked_at >= self.stamp_interval:
+            self._stamp_checked_at = now
+            if self._read_stamp() != self._stamp:
+                with self._lock:
+                    if self._read_stamp() != self._stamp:
+                        self.reload()
+                        return True
+        if not self.reload_interval:
+            return False
+        if now - self._checked_at < self.reload_interval:
+            return False
+        with self._lock:
+            if now - self._checked_at < self.reload_interval:
+                return False
+            self._checked_at = now
+            if self._signature_of(self._scan()) == self._signature:
+                return False
+            self.reload()
+            return True
+
+    def lookup(self, path):
+        """Entry for path, falling back to the SPA index for unknown paths"""
+        self.refresh()
+        entry = self.entries.get(path) if path else None
+        if entry is None:
+            entry = self.entries.get(self.index)
+        return entry
+
+    def send(self, entry):
+        """Response for an entry with validators, caching headers and Range support"""
+        file = entry.file
+        encoding = None
+        if entry.variants:
+            accept = request.accept_encodings
+            for name, _ in ENCODINGS:
+                if name in entry.variants and accept[name] > 0:
+                    encoding, file = name, entry.variants[name]
+                    break
+
+        if file.data is not None:
+            response = send_file_data(file)
+        else:
+            response = send_file(file.path, mimetype=file.mimetype, etag=file.etag,
+                                 last_modified=file.mtime, conditional=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if entry.variants:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if entry.immutable else REVALIDATE_CACHE_CONTROL
+        return response
+
+def send_file_data(file):
+    """Serve an in-memory StaticFile, answering 304 and Range requests"""
+    response = current_app.response_class(file.data, mimetype=file.mimetype)
+    response.set_etag(file.etag)
+    response.last_modified = file.mtime
+    return response.make_conditional(request, accept_ranges=True, complete_length=file.size)
+
+def init_static_manifest(app):
+    """Build the manifest for app.static_folder and store it on the app"""
+    app.config.setdefault('STATIC_MEMORY_LIMIT', 256 * 1024)
+    app.config.setdefault('STATIC_IMMUTABLE_DIRS', ('assets',))
+    app.config.setdefault('STATIC_RELOAD_INTERVAL', 0)
+    app.config.setdefault('STATIC_RELOAD_STAMP', os.path.join(os.path.dirname(app.static_folder), '.static-manifest'))
+    app.config.setdefault('STATIC_STAMP_INTERVAL', 2.0)
+    manifest = StaticManifest(
+        app.static_folder,
+        memory_limit=app.config['STATIC_MEMORY_LIMIT'],
+        immutable_dirs=app.config['STATIC_IMMUTABLE_DIRS'],
+        reload_interval=app.config['STATIC_RELOAD_INTERVAL'],
+        stamp_path=app.config['STATIC_RELOAD_STAMP'],
+        stamp_interval=app.config['STATIC_STAMP_INTERVAL']
+    )
+    manifest.reload()
+    app.extensions['static_manifest'] = manifest
+    return manifest
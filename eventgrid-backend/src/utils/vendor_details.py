@@ -0,0 +1,85 @@
+"""Read-through cache of vendor detail payloads.
+
+get_vendor_details and the ?ids= batch lookup return a vendor together with
+its owner's business profile contact fields. load_vendor_details() serves
+them from vendor_detail_cache, keyed by the public vendor_id, and loads every
+miss in one joined query (vendor, user, business profile). Inactive and
+unknown vendors are not cached.
+
+An ORM update or delete of a Vendor, or an insert, update or delete of a
+BusinessProfile, drops the affected entries in this process, at flush and
+again once the transaction commits (a request reading the old row in between
+may have cached it); other workers serve their copy until it expires after
+VENDOR_DETAIL_CACHE_TTL seconds. With a read replica, only primary reads are
+cached and clients pinned to the primary skip the cache (see
+src.utils.read_replica).
+"""
+from contextlib import nullcontext
+from sqlalchemy import event, select
+from sqlalchemy.orm import object_session
+from src.models.rows import vendor_detail_row_to_dict, vendor_detail_rows
+from src.models.user import BusinessProfile, Vendor, db
+from src.utils.cache import TTLCache, invalidate_on_commit
+from src.utils.read_replica import may_fill_caches, pinned_to_primary, use_primary
+
+vendor_detail_cache = TTLCache(maxsize=4096, ttl=60.0)
+
+def init_vendor_detail_cache(app):
+    """Size the vendor detail cache from app config"""
+    app.config.setdefault('VENDOR_DETAIL_CACHE_SIZE', 4096)
+    app.config.setdefault('VENDOR_DETAIL_CACHE_TTL', 60.0)
+    vendor_detail_cache.maxsize = app.config['VENDOR_DETAIL_CACHE_SIZE']
+    vendor_detail_cache.ttl = app.config['VENDOR_DETAIL_CACHE_TTL']
+    vendor_detail_cache.clear()
+
+def load_vendor_details(vendor_ids):
+    """Detail dicts of the active vendors among vendor_ids, keyed by vendor_id
+
+    Callers must not modify the returned dicts; they are shared with the cache.
+    """
+    details = {}
+    missing = []
+    pinned = pinned_to_primary()
+    for vendor_id in vendor_ids:
+        cached = None if pinned else vendor_detail_cache.get(vendor_id)
+        if cached is not None:
+            details[vendor_id] = cached
+        elif vendor_id not in missing:
+            missing.append(vendor_id)
+    if missing:
+        with use_primary() if pinned else nullcontext():
+            rows = vendor_detail_rows(
+                Vendor.query.filter(Vendor.vendor_id.in_(missing), Vendor.is_active == True)
+            ).all()
+        fill = may_fill_caches()
+        for row in rows:
+            # Several profiles for one user: keep the first, as the uselist=False relationship did
+            if row.vendor_id in details:
+                continue
+            data = vendor_detail_row_to_dict(row)
+            if fill:
+                vendor_detail_cache.set(row.vendor_id, data)
+            details[row.vendor_id] = data
+    return details
+
+def load_vendor_detail(vendor_id):
+    """Detail dict of one active vendor, or None"""
+    return load_vendor_details([vendor_id]).get(vendor_id)
+
+def invalidate_vendor(vendor_id):
+    vendor_detail_cache.invalidate(vendor_id)
+
+@event.listens_for(Vendor, 'after_update')
+@event.listens_for(Vendor, 'after_delete')
+def _invalidate_vendor(mapper, connection, target):
+    # the old key too, if vendor_id itself changed
+    for vendor_id in [target.vendor_id, *db.inspect(target).attrs.vendor_id.history.deleted]:
+        invalidate_on_commit(object_session(target), vendor_detail_cache, vendor_id)
+
+@event.listens_for(BusinessProfile, 'after_insert')
+@event.listens_for(BusinessProfile, 'after_update')
+@event.listens_for(BusinessProfile, 'after_delete')
+def _invalidate_profile_vendors(mapper, connection, target):
+    vendors = Vendor.__table__
+    for vendor_id in connection.execute(select(vendors.c.vendor_id).where(vendors.c.user_id == target.user_id)).scalars():
+        invalidate_on_commit(object_session(target), vendor_detail_cache, vendor_id)
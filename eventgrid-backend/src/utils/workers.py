@@ -0,0 +1,59 @@
+"""Process state that must be reset when a pre-forking server forks a worker.
+
+gunicorn with preload_app builds the app once in the master and forks the
+workers from it. The children inherit the master's SQLAlchemy connection pool,
+whose SQLite handles and sockets must never be shared between processes, and
+its locks, which another thread may have been holding at the moment of the
+fork. init_worker_hooks() registers an os.register_at_fork() callback, so
+every fork (gunicorn, uWSGI, multiprocessing) gets a fresh pool, fresh locks,
+empty user, facet, vendor detail and count caches, an unbuilt venue grid and
+its own metrics. The inherited static manifest is kept: its file contents stay shared
+copy-on-write.
+
+shutdown() closes pooled connections when a worker exits after draining its
+in-flight requests (gunicorn's worker_exit hook).
+"""
+import os
+import weakref
+from src.models.user import db
+from src.utils.current_user import user_cache
+from src.utils.facets import facet_cache
+from src.utils.geo import venue_grid
+from src.utils.metrics import request_metrics
+from src.utils.pagination import count_cache
+from src.utils.vendor_details import vendor_detail_cache
+
+_apps = weakref.WeakSet()
+_registered = False
+
+def _dispose_engines(app, close):
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+
+def after_fork_in_child():
+    """Reset inherited process state; runs in every forked child"""
+    for app in list(_apps):
+        # close=False: the connections belong to the parent, which keeps using them
+        _dispose_engines(app, close=False)
+        manifest = app.extensions.get('static_manifest')
+        if manifest is not None:
+            manifest.after_fork()
+    user_cache.after_fork()
+    facet_cache.after_fork()
+    vendor_detail_cache.after_fork()
+    count_cache.after_fork()
+    venue_grid.after_fork()
+    request_metrics.after_fork()
+
+def init_worker_hooks(app):
+    """Make app safe to build before a fork"""
+    global _registered
+    _apps.add(app)
+    if not _registered and hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=after_fork_in_child)
+        _registered = True
+
+def shutdown(app):
+    """Close the pooled database connections of a worker that is exiting"""
+    _dispose_engines(app, close=True)
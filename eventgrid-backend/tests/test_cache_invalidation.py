@@ -0,0 +1,69 @@
+"""Caches are cleared again at commit, after any re-cache of the old row while the write was in flight."""
+from src.models.user import BusinessProfile, User, Vendor, db
+from src.utils.current_user import load_user, user_cache
+from src.utils.facets import facet_cache
+from src.utils.pagination import count_cache
+from src.utils.vendor_details import vendor_detail_cache
+
+def test_user_cache_cleared_after_commit(app, headers):
+    with app.app_context():
+        user = User.query.filter_by(user_id='usr_1').one()
+        user.first_name = 'Sara'
+        db.session.flush()
+        assert user_cache.get('usr_1') is None
+        # another request, still reading the committed row, caches it before this commit
+        user_cache.set('usr_1', {'first_name': 'Sarah'})
+        db.session.commit()
+        assert user_cache.get('usr_1') is None
+        assert load_user('usr_1').first_name == 'Sara'
+
+def test_user_cache_rollback_leaves_no_pending_invalidation(app, headers):
+    with app.app_context():
+        user = User.query.filter_by(user_id='usr_1').one()
+        user.first_name = 'Sara'
+        db.session.flush()
+        db.session.rollback()
+        assert load_user('usr_1').first_name == 'Sarah'
+        db.session.commit()
+        assert user_cache.get('usr_1') is not None
+
+def test_facet_cache_cleared_after_commit(app, client, headers):
+    response = client.get('/api/marketplace/vendors', headers=headers, query_string={'includeFacets': 'true'})
+    assert response.get_json()['data']['facets']['categories']
+    with app.app_context():
+        vendor = Vendor.query.filter_by(vendor_id='vnd_0').one()
+        vendor.category = 'florist'
+        db.session.flush()
+        assert len(facet_cache) == 0
+        client.get('/api/marketplace/vendors', headers=headers, query_string={'includeFacets': 'true'})
+        assert len(facet_cache) > 0
+        db.session.commit()
+        assert len(facet_cache) == 0
+
+def test_vendor_detail_cache_cleared_after_commit(app, client, headers):
+    assert client.get('/api/marketplace/vendors/vnd_0', headers=headers).status_code == 200
+    with app.app_context():
+        profile = BusinessProfile.query.one()
+        profile.phone = '+1 415 555 0100'
+        db.session.flush()
+        assert vendor_detail_cache.get('vnd_0') is None
+        assert client.get('/api/marketplace/vendors/vnd_0', headers=headers).status_code == 200
+        assert vendor_detail_cache.get('vnd_0') is not None
+        db.session.commit()
+        assert vendor_detail_cache.get('vnd_0') is None
+    response = client.get('/api/marketplace/vendors/vnd_0', headers=headers)
+    assert '+1 415 555 0100' in response.get_data(as_text=True)
+
+def test_count_cache_cleared_after_commit(client, headers):
+    def total():
+        response = client.get('/api/events', headers=headers, query_string={'cursor': '', 'includeTotal': 'true'})
+        return response.get_json()['data']['pagination']['total']
+
+    assert total() == 4
+    assert len(count_cache) > 0
+    response = client.post('/api/events', headers=headers, json={
+        'basicInfo': {'title': 'Launch Party', 'type': 'party'},
+        'schedule': {'startDate': '2025-09-01T18:00:00', 'endDate': '2025-09-01T23:00:00'}
+    })
+    assert response.status_code == 201, response.get_json()
+    assert total() == 5
@@ -0,0 +1,101 @@
+"""Dialect-specific schema and search paths, on SQLite and (with TEST_POSTGRES_URL set) PostgreSQL."""
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import inspect, text
+from src.models.user import User, Vendor, Venue, db
+from src.utils.leaderboard import GLOBAL_SCOPE, _board, _candidates, _insert_candidates
+from src.utils.migrations import ensure_indexes
+from tests.conftest import POSTGRES_URL, build_app, clear_caches
+
+TRIGRAM_INDEXES = {'ix_vendors_business_name_trgm', 'ix_vendors_description_trgm', 'ix_vendors_category_trgm'}
+
+@pytest.fixture(params=[
+    'sqlite',
+    pytest.param('postgresql', marks=pytest.mark.skipif(not POSTGRES_URL, reason='TEST_POSTGRES_URL is not set'))
+])
+def dialect_app(request, tmp_path):
+    url = POSTGRES_URL if request.param == 'postgresql' else f"sqlite:///{tmp_path / 'test.db'}"
+    app = build_app(url)
+    with app.app_context():
+        # vendors_fts on SQLite; nothing extra on PostgreSQL
+        ensure_indexes()
+        owner = User(user_id='usr_1', email='owner@example.com', first_name='Ana', last_name='Silva', role='vendor')
+        owner.set_password('password123')
+        db.session.add(owner)
+        db.session.flush()
+        db.session.add_all([
+            Vendor(vendor_id='vnd_lab', user_id=owner.id, business_name='Photo Lab', category='photography',
+                   service_areas=['San Francisco', 'Oakland']),
+            Vendor(vendor_id='vnd_collective', user_id=owner.id, business_name='Lens and Photo Collective of the Bay',
+                   category='photography', service_areas=['Bay Area']),
+            Vendor(vendor_id='vnd_catering', user_id=owner.id, business_name='Seasonal Catering', category='catering',
+                   description='Candid photo corner on request', service_areas=['Napa Valley']),
+            Vendor(vendor_id='vnd_band', user_id=owner.id, business_name='Yes!!! Cover Band', category='music')
+        ])
+        db.session.add(Venue(venue_id='ven_1', owner_id=owner.id, name='Loft', venue_type='loft', address='1 Main St',
+                             city='Oakland', country='USA', amenities=['Wi-Fi', 'Parking']))
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+    clear_caches()
+
+def test_json_list_columns(dialect_app):
+    with dialect_app.app_context():
+        assert Vendor.query.filter_by(vendor_id='vnd_lab').one().service_areas == ['San Francisco', 'Oakland']
+        assert Venue.query.one().amenities == ['Wi-Fi', 'Parking']
+        if db.engine.dialect.name == 'postgresql':
+            types = dict(db.session.execute(text(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_name IN ('vendors', 'venues') AND column_name IN ('service_areas', 'amenities')"
+            )).all())
+            assert types == {'service_areas': 'jsonb', 'amenities': 'jsonb'}
+
+def test_trigram_indexes_follow_dialect(dialect_app):
+    with dialect_app.app_context():
+        names = {index['name'] for index in inspect(db.engine).get_indexes('vendors')}
+        if db.engine.dialect.name == 'postgresql':
+            assert TRIGRAM_INDEXES <= names
+            # an existing database without them gets them from ensure_indexes
+            for name in TRIGRAM_INDEXES:
+                db.session.execute(text(f'DROP INDEX {name}'))
+            db.session.commit()
+            assert TRIGRAM_INDEXES <= set(ensure_indexes())
+        else:
+            assert not TRIGRAM_INDEXES & names
+            assert not TRIGRAM_INDEXES & set(ensure_indexes())
+
+def test_relevance_sort(dialect_app):
+    # BM25 over vendors_fts on SQLite, trigram similarity to the business name on PostgreSQL
+    client = dialect_app.test_client()
+    with dialect_app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='usr_1')}"}
+    response = client.get('/api/marketplace/vendors', headers=headers,
+                          query_string={'query': 'photo', 'sort': 'relevance'})
+    assert response.status_code == 200, response.get_json()
+    vendor_ids = [vendor['vendorId'] for vendor in response.get_json()['data']['vendors']]
+    assert vendor_ids == ['vnd_lab', 'vnd_collective', 'vnd_catering']
+
+@pytest.mark.parametrize('query_text, expected', [('!!!', ['vnd_band']), ('?', [])])
+def test_query_without_words(dialect_app, query_text, expected):
+    # nothing for FTS5 to match: a substring match, never every vendor
+    client = dialect_app.test_client()
+    with dialect_app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='usr_1')}"}
+    response = client.get('/api/marketplace/vendors', headers=headers, query_string={'query': query_text})
+    assert response.status_code == 200, response.get_json()
+    assert [vendor['vendorId'] for vendor in response.get_json()['data']['vendors']] == expected
+
+def test_leaderboard_refilled_twice(dialect_app):
+    with dialect_app.app_context():
+        for vendor in Vendor.query.all():
+            vendor.average_rating, vendor.total_reviews = 4.8, 10
+        db.session.commit()
+        with db.engine.begin() as connection:
+            entries = set(connection.execute(_board.select().where(_board.c.scope == GLOBAL_SCOPE)).all())
+            assert len(entries) == 4
+            # a second refill that read the board before the first one committed picks the same vendors
+            assert _insert_candidates(connection, _candidates(GLOBAL_SCOPE)) == 0
+            assert set(connection.execute(_board.select().where(_board.c.scope == GLOBAL_SCOPE)).all()) == entries
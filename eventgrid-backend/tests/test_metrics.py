@@ -0,0 +1,28 @@
+"""/api/metrics is served only with a scrape token, and only to requests that present it."""
+import pytest
+from src.models.user import db
+from tests.conftest import build_app
+
+@pytest.fixture
+def metrics_app(tmp_path, request):
+    app = build_app(f"sqlite:///{tmp_path / 'test.db'}", METRICS_ENABLED=True, METRICS_TOKEN=request.param)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+@pytest.mark.parametrize('metrics_app', [None], indirect=True)
+def test_not_registered_without_token(metrics_app):
+    assert 'metrics' not in metrics_app.view_functions
+    response = metrics_app.test_client().get('/api/health')
+    assert 'Server-Timing' in response.headers
+
+@pytest.mark.parametrize('metrics_app', ['scrape-secret'], indirect=True)
+@pytest.mark.parametrize('authorization, status', [
+    (None, 401), ('Bearer wrong', 401), ('scrape-secret', 401), ('Bearer scrape-secret', 200)
+])
+def test_requires_bearer_token(metrics_app, authorization, status):
+    headers = {'Authorization': authorization} if authorization else {}
+    response = metrics_app.test_client().get('/api/metrics', headers=headers)
+    assert response.status_code == status
+    if status == 200:
+        assert b'# TYPE eventgrid_requests_total counter' in response.data
@@ -0,0 +1,26 @@
+"""Out-of-range page sizes are clamped rather than failing."""
+import pytest
+from src.models.user import Booking
+from src.utils.pagination import keyset_paginate
+
+# list endpoint -> key of its items in data
+PATHS = {'/api/events': 'events', '/api/bookings': 'bookings', '/api/marketplace/vendors': 'vendors'}
+
+@pytest.mark.parametrize('path', PATHS)
+@pytest.mark.parametrize('params', [{'limit': 0}, {'limit': -5}, {'cursor': '', 'limit': 0}])
+def test_limit_below_one_returns_one_item(client, headers, path, params):
+    response = client.get(path, headers=headers, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    data = response.get_json()['data']
+    assert len(data[PATHS[path]]) == 1
+    assert data['pagination']['limit'] == 1
+
+@pytest.mark.parametrize('path', PATHS)
+def test_limit_capped_at_100(client, headers, path):
+    response = client.get(path, headers=headers, query_string={'cursor': '', 'limit': 500})
+    assert response.get_json()['data']['pagination']['limit'] == 100
+
+def test_keyset_paginate_empty_page(app, headers):
+    with app.app_context():
+        items, next_cursor = keyset_paginate(Booking.query, [(Booking.created_at, 'desc'), (Booking.id, 'desc')], 0)
+    assert items == [] and next_cursor is None
@@ -0,0 +1,57 @@
+"""Statement counts of the booking and payment reads must not grow with the page or the data."""
+from src.models.user import db
+from src.utils.current_user import user_cache
+from src.utils.query_profiler import query_budget
+from tests.conftest import seed_bookings
+
+# user lookup, count, page and the batched vendor / venue loads, with room for a cache miss
+BUDGET = 8
+
+def count_queries(app, client, path, headers, **params):
+    # every measurement starts from a cold user cache, so the user lookup is always counted
+    user_cache.clear()
+    with app.app_context():
+        with query_budget(BUDGET, engine=db.engine) as profile:
+            response = client.get(path, headers=headers, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return profile.count, response.get_json()['data']
+
+def test_bookings_page_size(app, client, headers):
+    counts = {}
+    for limit in (5, 20):
+        counts[limit], data = count_queries(app, client, '/api/bookings', headers, limit=limit)
+        assert len(data['bookings']) == limit
+    assert counts[5] == counts[20]
+
+def test_bookings_cursor_page_size(app, client, headers):
+    # the last page also looks for NULL created_at rows, so keep both second pages short of the end
+    with app.app_context():
+        seed_bookings(20, start=20)
+    counts = {}
+    for limit in (5, 10):
+        counts[limit], data = count_queries(app, client, '/api/bookings', headers, cursor='', limit=limit)
+        assert len(data['bookings']) == limit
+        cursor = data['pagination']['nextCursor']
+        counts[limit, 'next'], _ = count_queries(app, client, '/api/bookings', headers, cursor=cursor, limit=limit)
+    assert counts[5] == counts[10]
+    assert counts[5, 'next'] == counts[10, 'next']
+
+def test_booking_detail(app, client, headers):
+    # bkg_0 has a vendor and the venue, bkg_1 only a vendor
+    counts = {}
+    for booking_id in ('bkg_0', 'bkg_1'):
+        counts[booking_id], data = count_queries(app, client, f'/api/bookings/{booking_id}', headers)
+        assert data['bookingId'] == booking_id
+    with app.app_context():
+        seed_bookings(40, start=20)
+    counts['more'], _ = count_queries(app, client, '/api/bookings/bkg_0', headers)
+    assert counts['bkg_0'] == counts['bkg_1'] == counts['more']
+
+def test_payment_history_size(app, client, headers):
+    few, data = count_queries(app, client, '/api/payments/history', headers)
+    assert data['total'] == 20
+    with app.app_context():
+        seed_bookings(40, start=20)
+    many, data = count_queries(app, client, '/api/payments/history', headers)
+    assert data['total'] == 60
+    assert few == many
@@ -0,0 +1,61 @@
+"""The hot list queries, as the routes build them, use their indexes on a populated, ANALYZEd database."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from src.models.user import Booking, Event, User, Vendor, Venue, db
+from src.utils.migrations import ensure_indexes, route_query_plans
+from tests.conftest import CATEGORIES
+
+AREAS = [['San Francisco', 'Bay Area'], ['Oakland'], ['Napa Valley'], ['San Jose'], ['Los Angeles']]
+
+def populate(organizers=50, events_each=20, bookings_each=5, vendors=2000, venues=2000):
+    owners = []
+    for number in range(organizers):
+        user = User(user_id=f'usr_{number}', email=f'user{number}@example.com', first_name='Test', last_name=str(number),
+                    role='event_manager')
+        user.set_password('password123')
+        owners.append(user)
+    db.session.add_all(owners)
+    db.session.flush()
+
+    db.session.add_all(Vendor(
+        vendor_id=f'vnd_{number}', user_id=owners[number % organizers].id, business_name=f'Vendor {number}',
+        category=CATEGORIES[number % len(CATEGORIES)], service_areas=AREAS[number % len(AREAS)],
+        starting_price=100 + number % 900, average_rating=3.0 + (number % 21) / 10, total_reviews=number % 40
+    ) for number in range(vendors))
+    db.session.add_all(Venue(
+        venue_id=f'ven_{number}', owner_id=owners[number % organizers].id, name=f'Venue {number}', venue_type='hall',
+        address='1 Main St', city='San Francisco', country='USA', latitude=37.0 + (number % 100) / 50,
+        longitude=-123.0 + (number // 100) / 10, capacity_min=10, capacity_max=50 + number % 1000,
+        daily_rate=500 + (number * 37) % 20000, amenities=[['Wi-Fi'], ['Parking', 'AV'], ['Stage']][number % 3]
+    ) for number in range(venues))
+    db.session.flush()
+
+    start = datetime(2025, 1, 1)
+    events = [Event(
+        event_id=f'evt_{owner.id}_{number}', organizer_id=owner.id, title='Conference', event_type='conference',
+        status=['planning', 'confirmed', 'completed'][number % 3], start_date=start + timedelta(days=number),
+        end_date=start + timedelta(days=number + 1), timezone='UTC'
+    ) for owner in owners for number in range(events_each)]
+    db.session.add_all(events)
+    db.session.flush()
+
+    db.session.add_all(Booking(
+        booking_id=f'bkg_{event.id}_{number}', event_id=event.id, vendor_id=event.id % vendors + 1,
+        service_name='Catering', service_date=event.start_date, status=['confirmed', 'inquiry'][number % 2],
+        final_price=1000.0 if number % 2 == 0 else None, created_at=start + timedelta(hours=event.id * 10 + number)
+    ) for event in events for number in range(bookings_each))
+    db.session.commit()
+    return owners[0].id
+
+def test_route_query_plans_use_indexes(app):
+    with app.app_context():
+        organizer_id = populate()
+        # builds the R*Tree, service areas and leaderboard derived tables
+        ensure_indexes()
+        db.session.execute(text('ANALYZE'))
+        results = route_query_plans(organizer_id)
+    assert {'get_events', 'get_bookings', 'get_payment_history', 'search_vendors', 'filter_venues',
+            'get_featured_vendors', 'search_venues'} <= set(results)
+    missing = {name: result['plan'] for name, result in results.items() if not result['usesIndex']}
+    assert not missing, missing
@@ -0,0 +1,98 @@
+"""Read-your-writes across workers: the pin to the primary travels with the client, not the process."""
+import shutil
+import time
+
+import pytest
+from src.models.user import Vendor, db
+from src.utils.facets import facet_cache
+from src.utils.read_replica import STICKY_COOKIE, STICKY_HEADER
+from src.utils.vendor_details import vendor_detail_cache
+from tests.conftest import build_app, clear_caches, seed
+
+NEW_EVENT = {
+    'basicInfo': {'title': 'Launch Party', 'type': 'party'},
+    'schedule': {'startDate': '2025-09-01T18:00:00', 'endDate': '2025-09-01T23:00:00'}
+}
+
+@pytest.fixture
+def replica_app(tmp_path):
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    app = build_app(f'sqlite:///{primary}', SQLALCHEMY_BINDS={'replica': f'sqlite:///{replica}'})
+    headers = seed(app, bookings=0)
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    # a replica frozen before the write below, as if replication lagged behind
+    shutil.copy(primary, replica)
+    yield app, headers
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    # init_app registered a metadata for the bind on the shared db; later apps have no such bind
+    db.metadatas.pop('replica', None)
+    clear_caches()
+
+def event_titles(client, headers):
+    response = client.get('/api/events', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return {event['basicInfo']['title'] for event in response.get_json()['data']['events']}
+
+def test_token_client_reads_its_write_through_header(replica_app):
+    app, headers = replica_app
+    # separate clients stand in for separate workers: no cookies, nothing shared in process
+    writer, reader = app.test_client(use_cookies=False), app.test_client(use_cookies=False)
+    response = writer.post('/api/events', headers=headers, json=NEW_EVENT)
+    assert response.status_code == 201, response.get_json()
+    until = response.headers[STICKY_HEADER]
+
+    assert 'Launch Party' not in event_titles(reader, headers)
+    assert 'Launch Party' in event_titles(reader, {**headers, STICKY_HEADER: until})
+
+def test_browser_reads_its_write_through_cookie(replica_app):
+    app, headers = replica_app
+    client = app.test_client()
+    assert client.post('/api/events', headers=headers, json=NEW_EVENT).status_code == 201
+    assert client.get_cookie(STICKY_COOKIE) is not None
+    assert 'Launch Party' in event_titles(client, headers)
+
+def test_deadline_beyond_window_is_ignored(replica_app):
+    app, headers = replica_app
+    client = app.test_client(use_cookies=False)
+    assert client.post('/api/events', headers=headers, json=NEW_EVENT).status_code == 201
+    far_future = f'{time.time() + 3600:.3f}'
+    assert 'Launch Party' not in event_titles(client, {**headers, STICKY_HEADER: far_future})
+
+def test_replica_reads_stay_out_of_caches(replica_app):
+    app, headers = replica_app
+    # no vendor write route: rename a vendor on the primary, as a write request would
+    with app.app_context():
+        vendor = Vendor.query.filter_by(vendor_id='vnd_0').one()
+        vendor.business_name, vendor.category = 'Renamed Studio', 'florist'
+        db.session.commit()
+    until = f'{time.time() + app.config["DB_READ_YOUR_WRITES_SECONDS"]:.3f}'
+    writer, reader = app.test_client(use_cookies=False), app.test_client(use_cookies=False)
+
+    response = reader.get('/api/marketplace/vendors/vnd_0', headers=headers)
+    assert response.get_json()['data']['vendor']['businessProfile']['businessName'] == 'Vendor 0'
+    categories = reader.get('/api/marketplace/categories', headers=headers).get_json()['data']['categories']
+    assert 'florist' not in {category['name'] for category in categories}
+    assert vendor_detail_cache.get('vnd_0') is None
+    assert facet_cache.get(('categories',)) is None
+
+    pinned = {**headers, STICKY_HEADER: until}
+    response = writer.get('/api/marketplace/vendors/vnd_0', headers=pinned)
+    assert response.get_json()['data']['vendor']['businessProfile']['businessName'] == 'Renamed Studio'
+    categories = writer.get('/api/marketplace/categories', headers=pinned).get_json()['data']['categories']
+    assert 'florist' in {category['name'] for category in categories}
+
+def test_pinned_client_skips_caches(replica_app):
+    app, headers = replica_app
+    with app.app_context():
+        Vendor.query.filter_by(vendor_id='vnd_0').one().business_name = 'Renamed Studio'
+        db.session.commit()
+    # an entry this worker filled before the write and has not dropped yet
+    vendor_detail_cache.set('vnd_0', {'vendorId': 'vnd_0', 'businessProfile': {'businessName': 'Vendor 0'}})
+    until = f'{time.time() + app.config["DB_READ_YOUR_WRITES_SECONDS"]:.3f}'
+    response = app.test_client(use_cookies=False).get('/api/marketplace/vendors/vnd_0',
+                                                      headers={**headers, STICKY_HEADER: until})
+    assert response.get_json()['data']['vendor']['businessProfile']['businessName'] == 'Renamed Studio'
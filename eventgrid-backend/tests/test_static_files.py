@@ -0,0 +1,30 @@
+"""Running processes pick up a rebuilt frontend once the reload stamp is touched."""
+from src.utils.static_files import StaticManifest
+
+def test_stamp_reloads_other_processes(tmp_path):
+    folder, stamp = tmp_path / 'static', tmp_path / '.static-manifest'
+    folder.mkdir()
+    (folder / 'index.html').write_text('<p>v1</p>')
+    # two manifests over one folder stand in for two workers
+    worker, cli = (StaticManifest(str(folder), stamp_path=str(stamp), stamp_interval=0) for _ in range(2))
+    worker.reload()
+    cli.reload()
+
+    (folder / 'index.html').write_text('<p>version 2</p>')
+    (folder / 'app.js').write_text('console.log(2)')
+    assert worker.lookup('index.html').file.data == b'<p>v1</p>'
+    assert worker.lookup('app.js').name == 'index.html'
+
+    assert cli.touch_stamp()
+    assert worker.lookup('index.html').file.data == b'<p>version 2</p>'
+    assert worker.lookup('app.js').name == 'app.js'
+    # nothing changed since: no further rebuild
+    assert not worker.refresh()
+
+def test_without_stamp_nothing_reloads(tmp_path):
+    (tmp_path / 'index.html').write_text('<p>v1</p>')
+    manifest = StaticManifest(str(tmp_path))
+    manifest.reload()
+    (tmp_path / 'index.html').write_text('<p>version 2</p>')
+    assert not manifest.touch_stamp()
+    assert manifest.lookup('index.html').file.data == b'<p>v1</p>'
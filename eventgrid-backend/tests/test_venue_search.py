@@ -0,0 +1,45 @@
+"""Venue search by radius and bounding box, on the R*Tree and the grid fallback."""
+import pytest
+from src.routes.venues import MAX_BOX_DEGREES
+from src.utils.geo import VenueFilters, box_center, venue_grid
+
+@pytest.mark.parametrize('box, center', [
+    ((37.0, -123.0, 38.0, -122.0), (37.5, -122.5)),
+    # crossing the antimeridian, centred on it
+    ((-20.0, 170.0, -10.0, -170.0), (-15.0, -180.0)),
+    # the whole world, not an empty span
+    ((-90.0, -180.0, 90.0, 180.0), (0.0, 0.0))
+])
+def test_box_center(box, center):
+    assert box_center(*box) == pytest.approx(center)
+
+def search(client, headers, **params):
+    return client.get('/api/venues/search', headers=headers, query_string=params)
+
+@pytest.mark.parametrize('bounds', [
+    (-90.0, -180.0, 90.0, 180.0),
+    (30.0, -125.0, 30.0 + MAX_BOX_DEGREES + 1, -120.0),
+    # narrow as drawn, but west > east makes it the rest of the world
+    (37.0, -122.0, 38.0, -123.0)
+])
+def test_box_span_is_capped(client, headers, bounds):
+    response = search(client, headers, **dict(zip(('minLat', 'minLng', 'maxLat', 'maxLng'), bounds)))
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'VALIDATION_ERROR'
+
+def test_grid_box_larger_than_grid(app, client, headers):
+    # ven_1 in San Francisco is the grid's only occupied cell
+    app.config['VENUE_SEARCH_RTREE'] = False
+    response = search(client, headers, minLat=33.0, minLng=-125.0, maxLat=43.0, maxLng=-115.0)
+    assert response.status_code == 200, response.get_json()
+    data = response.get_json()['data']
+    assert data['search']['index'] == 'grid'
+    assert [venue['venueId'] for venue in data['venues']] == ['ven_1']
+
+    with app.app_context():
+        # the walk over occupied cells and the cell-by-cell loop (a box inside ven_1's cell) agree
+        wide = venue_grid.candidates([(-90.0, -180.0, 90.0, 180.0)], VenueFilters())
+        narrow = venue_grid.candidates([(37.76, -122.43, 37.78, -122.41)], VenueFilters())
+        outside = venue_grid.candidates([(-90.0, -180.0, 0.0, 180.0)], VenueFilters())
+    assert wide == narrow and len(wide[0]) == 1
+    assert outside == ([], [], [])